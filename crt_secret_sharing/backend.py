@@ -0,0 +1,134 @@
+import os
+from typing import List
+from Crypto.Util.number import isPrime
+
+try:
+    import gmpy2
+except ImportError:
+    gmpy2 = None
+
+# Environment variable selecting the backend, 'python', 'gmpy2' or 'auto'
+BACKEND_ENV = "CRT_SS_BACKEND"
+
+BACKENDS = ("python", "gmpy2")
+
+class PythonBackend:
+    """
+    Arithmetic on builtin ints.
+    """
+    name = "python"
+
+    @staticmethod
+    def mpz(x : int) -> int:
+        return int(x)
+
+    @staticmethod
+    def powmod(base : int, exponent : int, modulus : int) -> int:
+        return pow(base, exponent, modulus)
+
+    @staticmethod
+    def invert(a : int, m : int) -> int:
+        return pow(a, -1, m)
+
+    @staticmethod
+    def is_prime(n : int) -> bool:
+        return bool(isPrime(n))
+
+class Gmpy2Backend:
+    """
+    Arithmetic on gmpy2 mpz, results are converted back to builtin ints.
+    """
+    name = "gmpy2"
+
+    @staticmethod
+    def mpz(x : int):
+        return gmpy2.mpz(x)
+
+    @staticmethod
+    def powmod(base : int, exponent : int, modulus : int) -> int:
+        return int(gmpy2.powmod(base, exponent, modulus))
+
+    @staticmethod
+    def invert(a : int, m : int) -> int:
+        try:
+            return int(gmpy2.invert(a, m))
+        except ZeroDivisionError as e:
+            raise ValueError(str(e)) from e
+
+    @staticmethod
+    def is_prime(n : int) -> bool:
+        return bool(gmpy2.is_prime(n, 50))
+
+_BACKENDS = {"python": PythonBackend, "gmpy2": Gmpy2Backend}
+
+def available_backends() -> List[str]:
+    """
+    Names of the backends that can be used in this environment.
+    """
+    return [name for name in BACKENDS if name != "gmpy2" or gmpy2 is not None]
+
+def _resolve(name : str):
+    name = name.lower()
+    if name == "auto":
+        name = "gmpy2" if gmpy2 is not None else "python"
+    if name not in _BACKENDS:
+        raise ValueError(f"Unknown arithmetic backend ({name}), expected one of {BACKENDS + ('auto',)}.")
+    if name == "gmpy2" and gmpy2 is None:
+        raise ValueError("The gmpy2 backend was requested, but gmpy2 is not installed.")
+    return _BACKENDS[name]
+
+_active = _resolve(os.environ.get(BACKEND_ENV, "auto"))
+
+def set_backend(name : str) -> str:
+    """
+    Select the arithmetic backend for the whole package.
+
+    Product trees built under the previous backend stay cached, they give
+    the same results with either backend.
+
+    Parameters
+    ----------
+        name : str
+            'python', 'gmpy2' or 'auto' for gmpy2 when it is installed.
+
+    Returns
+    -------
+        previous : str
+            Name of the backend that was active before.
+    """
+    global _active
+    previous = _active.name
+    _active = _resolve(name)
+    return previous
+
+def get_backend() -> str:
+    """
+    Name of the active backend.
+    """
+    return _active.name
+
+def mpz(x : int):
+    """
+    x as the integer type of the active backend, used for long products and divisions.
+    """
+    return _active.mpz(x)
+
+def powmod(base : int, exponent : int, modulus : int) -> int:
+    """
+    base^exponent mod modulus.
+    """
+    return _active.powmod(base, exponent, modulus)
+
+def invert(a : int, m : int) -> int:
+    """
+    Modular multiplicative inverse of a modulo m in [0, m).
+
+    Raises ValueError if a is not invertible modulo m.
+    """
+    return _active.invert(a, m)
+
+def is_prime(n : int) -> bool:
+    """
+    Probabilistic primality test.
+    """
+    return _active.is_prime(n)
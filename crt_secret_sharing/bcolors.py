@@ -1,4 +1,6 @@
 #Credits: https://svn.blender.org/svnroot/bf-blender/trunk/blender/build_files/scons/tools/bcolors.py
+import logging
+
 class bcolors:
     HEADER = '\033[95m'
     OKBLUE = '\033[94m'
@@ -14,3 +16,24 @@ class bcolors:
         self.WARNING = ''
         self.FAIL = ''
         self.ENDC = ''
+
+
+class ColorFormatter(logging.Formatter):
+    """
+    Formatter for terminals, colors every message by its level or by the
+    color passed along as extra={"color": ...}. The log records stay plain.
+    """
+    LEVELS = {logging.INFO: bcolors.OKGREEN, logging.WARNING: bcolors.WARNING, logging.ERROR: bcolors.FAIL}
+
+    def format(self, record):
+        color = getattr(record, "color", self.LEVELS.get(record.levelno, ""))
+        message = super().format(record)
+        return f"{color}{message}{bcolors.ENDC}" if color else message
+
+def color_logging(level : int = logging.INFO):
+    """
+    Log messages in color to stderr, for the examples run as scripts.
+    """
+    handler = logging.StreamHandler()
+    handler.setFormatter(ColorFormatter("%(message)s"))
+    logging.basicConfig(level=level, handlers=[handler])
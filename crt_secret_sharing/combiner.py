@@ -0,0 +1,444 @@
+import asyncio
+import logging
+import struct
+from collections import OrderedDict
+from itertools import count
+from time import monotonic
+from typing import Callable, Dict, List, Sequence, Union
+from crt_secret_sharing.el_gamal_encryption import DecryptionSession, CIPHERTEXT_VERSION
+from crt_secret_sharing.backend import powmod
+from crt_secret_sharing.serialization import Writer, Reader, KIND_REQUEST, KIND_RESPONSE
+
+logger = logging.getLogger(__name__)
+
+# Operations of a request
+OP_READY = 0
+OP_PARTIAL = 1
+OP_PARTIAL_HINT = 2
+
+# Status of a response
+STATUS_OK = 0
+STATUS_REJECTED = 1
+
+# Every message is a record preceded by its 4 byte length
+_FRAME = struct.Struct(">I")
+
+def _encode_request(request_id : int, op : int, c1 : int, shareholders : Sequence[int]) -> bytes:
+    writer = Writer()
+    writer.header(KIND_REQUEST)
+    for x in (request_id, op, c1):
+        writer.int(x)
+    writer.ints(sorted(shareholders))
+    return _FRAME.pack(len(writer.buffer)) + writer.buffer
+
+def _encode_response(request_id : int, index : int, status : int, mu_i : int = 0, hint : int = 0) -> bytes:
+    writer = Writer()
+    writer.header(KIND_RESPONSE)
+    for x in (request_id, index, status, mu_i, hint):
+        writer.int(x)
+    return _FRAME.pack(len(writer.buffer)) + writer.buffer
+
+async def _read_frame(reader : asyncio.StreamReader) -> bytes:
+    length = _FRAME.unpack(await reader.readexactly(_FRAME.size))[0]
+    return await reader.readexactly(length)
+
+def _session(sessions : OrderedDict, maxsize : int, shareholders : frozenset, p_i, q, p_0) -> DecryptionSession:
+    # Bounded LRU of decryption sessions keyed on the shareholder set
+    session = sessions.get(shareholders)
+    if session is None:
+        session = sessions[shareholders] = DecryptionSession(shareholders, p_i, q, p_0)
+        if len(sessions) > maxsize:
+            sessions.popitem(last=False)
+    else:
+        sessions.move_to_end(shareholders)
+    return session
+
+
+class ShareholderServer:
+    """
+    Endpoint of a single shareholder answering partial decryption requests over TCP.
+
+    A request names the ciphertext's c1 and the shareholder set, the answer is
+    the partial decryption for that set. The overflow hint is only sent along
+    if the request asks for it and the server allows hints. Hints for many sets
+    let a client recover the share, see DecryptionSession.overflow_hint, so they
+    are only meant for endpoints that a trusted combiner alone can reach.
+
+    Requests for a set below the weight T, for a set without this shareholder
+    or for a c1 outside the subgroup of order q are rejected with an error response.
+
+    Parameters
+    ----------
+        index : int
+            Index of the shareholder.
+        share : int
+            Share of the shareholder.
+        weights : List[int]
+            Weight of each shareholder.
+        T : int
+            Weight a set must reach before it gets an answer.
+        p_i : List[int]
+            List of distinct coprime integers for each shareholder.
+        q : int
+            Order.
+        p_0 : int
+            Safe prime.
+        delay : float | Callable[[], float]
+            Seconds to wait before answering, to simulate a slow shareholder.
+        sessions : int
+            Amount of shareholder sets whose coefficients are kept.
+        allow_hints : bool
+            Whether requests for the overflow hint are answered, otherwise they are rejected.
+    """
+    def __init__(self, index : int, share : int, weights : List[int], T : int, p_i : List[int], q : int, p_0 : int,
+                 delay : Union[float, Callable[[], float]] = 0.0, sessions : int = 16, allow_hints : bool = False):
+        self.index = index
+        self.share = share
+        self.weights = weights
+        self.T = T
+        self.p_i = p_i
+        self.q = q
+        self.p_0 = p_0
+        self.delay = delay
+        self.maxsize = sessions
+        self.allow_hints = allow_hints
+        self.requests = 0
+        self._sessions = OrderedDict()
+        self._hints = {}
+        self._server = None
+
+    async def start(self, host : str = "127.0.0.1", port : int = 0) -> tuple[str, int]:
+        """
+        Start listening, port 0 picks a free port.
+
+        Returns
+        -------
+            address : tuple[str, int]
+                Host and port of the endpoint.
+        """
+        self._server = await asyncio.start_server(self._handle, host, port)
+        return self._server.sockets[0].getsockname()[:2]
+
+    async def stop(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    def _answer(self, op : int, c1 : int, shareholders : frozenset) -> tuple[int, int]:
+        if op == OP_READY:
+            return 0, 0
+        if op not in (OP_PARTIAL, OP_PARTIAL_HINT):
+            raise ValueError(f"Unknown operation ({op}).")
+        if op == OP_PARTIAL_HINT and not self.allow_hints:
+            raise ValueError("Overflow hints are not allowed by this shareholder.")
+        if self.index not in shareholders:
+            raise ValueError(f"Shareholder ({self.index}) is not part of the set ({sorted(shareholders)}).")
+        if any(i >= len(self.weights) for i in shareholders):
+            raise ValueError(f"Unknown shareholders in the set ({sorted(shareholders)}).")
+        weight = sum(self.weights[i] for i in shareholders)
+        if weight < self.T:
+            raise ValueError(f"Weight of the set ({weight}) is below T ({self.T}).")
+        # Elements outside the subgroup of order q would leak the exponent modulo the cofactor
+        if not 1 < c1 < self.p_0 or powmod(c1, self.q, self.p_0) != 1:
+            raise ValueError(f"c1 ({c1}) is not in the subgroup of order q.")
+
+        session = _session(self._sessions, self.maxsize, shareholders, self.p_i, self.q, self.p_0)
+        mu_i = session.partial_decrypt(self.index, self.share, c1)
+        if op == OP_PARTIAL:
+            return mu_i, 0
+        if shareholders not in self._hints:
+            self._hints[shareholders] = session.overflow_hint(self.index, self.share)
+            if len(self._hints) > self.maxsize:
+                self._hints.pop(next(iter(self._hints)))
+        return mu_i, self._hints[shareholders]
+
+    async def _respond(self, writer : asyncio.StreamWriter, frame : bytes):
+        try:
+            reader = Reader(frame)
+            reader.header(KIND_REQUEST)
+            request_id, op, c1 = reader.int(), reader.int(), reader.int()
+            shareholders = frozenset(reader.ints())
+            reader.end()
+        except ValueError as e:
+            # Without a request id there is nobody to answer
+            logger.warning("Shareholder (%s) dropped a malformed request: %s", self.index, e)
+            return
+        delay = self.delay() if callable(self.delay) else self.delay
+        if delay:
+            await asyncio.sleep(delay)
+        try:
+            mu_i, hint = self._answer(op, c1, shareholders)
+            response = _encode_response(request_id, self.index, STATUS_OK, mu_i, hint)
+        except ValueError as e:
+            logger.warning("Shareholder (%s) rejected request (%s): %s", self.index, request_id, e)
+            response = _encode_response(request_id, self.index, STATUS_REJECTED)
+        try:
+            writer.write(response)
+            await writer.drain()
+        except ConnectionError:
+            # The client went away, the answer is not needed anymore
+            pass
+
+    async def _handle(self, reader : asyncio.StreamReader, writer : asyncio.StreamWriter):
+        # Requests on one connection are answered concurrently, in any order
+        tasks = set()
+        try:
+            while True:
+                frame = await _read_frame(reader)
+                self.requests += 1
+                task = asyncio.ensure_future(self._respond(writer, frame))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+        except (asyncio.IncompleteReadError, ConnectionError, asyncio.CancelledError):
+            # Closed by the client or by the shutdown of the server
+            pass
+        finally:
+            for task in tasks:
+                task.cancel()
+            writer.close()
+
+
+class _Connection:
+    """
+    Persistent connection to one endpoint, responses are matched to requests by id.
+    """
+    def __init__(self, address : tuple[str, int]):
+        self.address = address
+        self._reader = None
+        self._writer = None
+        self._pending = {}
+        self._listener = None
+        self._lock = asyncio.Lock()
+
+    async def _connect(self):
+        async with self._lock:
+            if self._writer is None:
+                self._reader, self._writer = await asyncio.open_connection(*self.address)
+                self._listener = asyncio.ensure_future(self._listen(self._reader))
+
+    async def _listen(self, reader : asyncio.StreamReader):
+        try:
+            while True:
+                record = Reader(await _read_frame(reader))
+                record.header(KIND_RESPONSE)
+                request_id, index, status, mu_i, hint = (record.int() for _ in range(5))
+                future = self._pending.pop(request_id, None)
+                if future is None or future.done():
+                    continue
+                if status == STATUS_OK:
+                    future.set_result((mu_i, hint))
+                else:
+                    future.set_exception(ValueError(f"Shareholder ({index}) rejected the request."))
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError) as e:
+            self._fail(ConnectionError(f"Connection to ({self.address}) lost: {e}"))
+
+    def _fail(self, error : Exception):
+        if self._writer is not None:
+            self._writer.close()
+        self._reader = self._writer = None
+        pending, self._pending = self._pending, {}
+        for future in pending.values():
+            if not future.done():
+                future.set_exception(error)
+
+    async def request(self, request_id : int, op : int, c1 : int, shareholders : Sequence[int]) -> tuple[int, int]:
+        await self._connect()
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        try:
+            self._writer.write(_encode_request(request_id, op, c1, shareholders))
+            return await future
+        finally:
+            self._pending.pop(request_id, None)
+
+    async def close(self):
+        if self._listener is not None:
+            self._listener.cancel()
+        self._fail(ConnectionError("Connection closed."))
+
+
+class Combiner:
+    """
+    Collects partial decryptions from shareholder endpoints concurrently.
+
+    A partial decryption depends on the whole shareholder set, so a decryption
+    takes two rounds. All endpoints are asked whether they are ready and the
+    set is fixed as soon as the weight of the answers reaches T, stragglers
+    are not waited for. The set is trimmed to the weight T, preferring the
+    last set that succeeded. Then the partial decryptions of that set are 
+    requested concurrently. If a member of the set times out or fails, it is excluded
+    and both rounds are repeated with the remaining shareholders.
+
+    Many ciphertexts can be decrypted at once, the requests share one
+    connection per endpoint.
+
+    Overflow hints are only requested with hints=True. Every hint reveals bits
+    of the share under a public multiplier, so they are only meant for a
+    combiner the shareholders trust, see DecryptionSession.overflow_hint.
+    Without hints every overflow candidate is tried.
+
+    Parameters
+    ----------
+        endpoints : Dict[int, tuple[str, int]]
+            Address of every shareholder's endpoint by index.
+        weights : List[int]
+            Weight of each shareholder.
+        T : int
+            Weight an authorized set must reach.
+        p_i : List[int]
+            List of distinct coprime integers for each shareholder.
+        q : int
+            Order.
+        p_0 : int
+            Safe prime.
+        timeout : float
+            Seconds a round may take.
+        retries : int
+            Amount of times a failed round is repeated with other shareholders.
+        sessions : int
+            Amount of shareholder sets whose coefficients are kept.
+        hints : bool
+            Whether the overflow hints are requested along with the partial decryptions,
+            the shareholder servers have to allow them.
+    """
+    def __init__(self, endpoints : Dict[int, tuple[str, int]], weights : List[int], T : int,
+                 p_i : List[int], q : int, p_0 : int, timeout : float = 1.0, retries : int = 2,
+                 sessions : int = 16, hints : bool = False):
+        if sum(weights[i] for i in endpoints) < T:
+            raise ValueError(f"Weight of all endpoints ({sum(weights[i] for i in endpoints)}) is below T ({T}).")
+        self.weights = weights
+        self.T = T
+        self.p_i = p_i
+        self.q = q
+        self.p_0 = p_0
+        self.timeout = timeout
+        self.retries = retries
+        self.maxsize = sessions
+        self.hints = hints
+        self.failures = 0
+        self._connections = {i: _Connection(address) for i, address in endpoints.items()}
+        self._sessions = OrderedDict()
+        self._preferred = frozenset()
+        self._ids = count()
+
+    async def _select(self, excluded : set) -> frozenset:
+        # First round, the set is fixed once the ready shareholders reach T
+        candidates = [i for i in self._connections if i not in excluded]
+        if sum(self.weights[i] for i in candidates) < self.T:
+            raise TimeoutError(f"The shareholders that did not fail ({candidates}) can't reach T ({self.T}).")
+        tasks = {asyncio.ensure_future(self._connections[i].request(next(self._ids), OP_READY, 0, ())): i
+                 for i in candidates}
+        ready = set()
+        weight = 0
+        deadline = monotonic() + self.timeout
+        try:
+            pending = set(tasks)
+            while pending and weight < self.T:
+                done, pending = await asyncio.wait(pending, timeout=max(deadline - monotonic(), 0),
+                                                   return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    break
+                for task in done:
+                    if task.exception() is None:
+                        ready.add(tasks[task])
+                        weight += self.weights[tasks[task]]
+                    else:
+                        excluded.add(tasks[task])
+        finally:
+            for task in tasks:
+                task.cancel()
+        if weight < self.T:
+            raise TimeoutError(f"Ready shareholders ({sorted(ready)}) did not reach T ({self.T}) in time.")
+
+        # Members of the last successful set first, so sets and their sessions repeat
+        chosen = []
+        weight = 0
+        for i in sorted(ready, key=lambda i: (i not in self._preferred, i)):
+            if weight >= self.T:
+                break
+            chosen.append(i)
+            weight += self.weights[i]
+        return frozenset(chosen)
+
+    async def _gather_partials(self, shareholders : frozenset, c1 : int) -> tuple[dict, dict, set]:
+        # Timeouts of the second round only fail the members that did not answer
+        indices = list(shareholders)
+        op = OP_PARTIAL_HINT if self.hints else OP_PARTIAL
+        tasks = [asyncio.ensure_future(self._connections[i].request(next(self._ids), op, c1, shareholders))
+                 for i in indices]
+        done, pending = await asyncio.wait(tasks, timeout=self.timeout)
+        for task in pending:
+            task.cancel()
+        partial_decryptions, hints, failed = {}, {}, set()
+        for i, task in zip(indices, tasks):
+            if task in done and task.exception() is None:
+                partial_decryptions[i], hints[i] = task.result()
+            else:
+                failed.add(i)
+        return partial_decryptions, hints, failed
+
+    async def reconstruct(self, c1 : int, h_k : int, version : int = CIPHERTEXT_VERSION) -> int:
+        """
+        Threshold reconstruction of pk^r for a ciphertext, see DecryptionSession.reconstruct.
+
+        Parameters
+        ----------
+            c1 : int
+                g^r of the ciphertext.
+            h_k : int
+                h_k(pk^r) of the ciphertext.
+            version : int
+                Version of the ciphertext.
+
+        Returns
+        -------
+            reconstruction : int
+                pk^r, to be used with decrypt.
+        """
+        excluded = set()
+        for attempt in range(self.retries + 1):
+            shareholders = await self._select(excluded)
+            partial_decryptions, hints, failed = await self._gather_partials(shareholders, c1)
+            if not failed:
+                self._preferred = shareholders
+                session = _session(self._sessions, self.maxsize, shareholders, self.p_i, self.q, self.p_0)
+                return session.reconstruct(partial_decryptions, c1, h_k, hints if self.hints else None, version)
+            self.failures += len(failed)
+            logger.warning("Shareholders (%s) did not answer or rejected, attempt (%s).", sorted(failed), attempt + 1)
+            excluded |= failed
+        raise TimeoutError(f"No authorized set answered within ({self.retries + 1}) attempts.")
+
+    async def reconstruct_many(self, ciphertexts : Sequence[tuple[int, int, int]], limit : int = 256) -> List[int]:
+        """
+        Reconstruct many ciphertexts concurrently.
+
+        Parameters
+        ----------
+            ciphertexts : Sequence[tuple[int, int, int]]
+                (c1, h_k, version) of every ciphertext.
+            limit : int
+                Most ciphertexts in flight at once.
+
+        Returns
+        -------
+            reconstructions : List[int]
+                pk^r of every ciphertext, in order.
+        """
+        semaphore = asyncio.Semaphore(limit)
+
+        async def bounded(c1, h_k, version):
+            async with semaphore:
+                return await self.reconstruct(c1, h_k, version)
+
+        return await asyncio.gather(*(bounded(*ciphertext) for ciphertext in ciphertexts))
+
+    async def close(self):
+        for connection in self._connections.values():
+            await connection.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
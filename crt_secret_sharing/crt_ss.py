@@ -1,10 +1,15 @@
+import logging
 import secrets
 from math import prod
 from typing import List, Optional
-from Crypto.Util.number import getPrime, isPrime
+from Crypto.Util.number import getPrime
+from crt_secret_sharing.backend import is_prime, mpz
 from crt_secret_sharing.util_primes import generate_party_primes, pairwise_coprime, primes_within_bitlength
-from crt_secret_sharing.util_crt import modinv
-from crt_secret_sharing.bcolors import bcolors as bc
+from crt_secret_sharing.prime_pool import default_pool
+from crt_secret_sharing.util_crt import PlanCache, DEFAULT_PLAN_CACHE, cached_product_tree, remainder_tree, modinv
+from crt_secret_sharing.bcolors import bcolors as bc, color_logging
+
+logger = logging.getLogger(__name__)
 
 # --- Core functions for CRT-SS ---
 
@@ -15,7 +20,8 @@ def share_distribution(p_lambda: int,
                        p_0 : Optional[int], 
                        p_i : Optional[List[int]], 
                        cand_L : Optional[int],
-                       weighted: bool) -> tuple[int, List[int], int, List[int]]:
+                       weighted: bool,
+                       reduction : str = "direct") -> tuple[int, List[int], int, List[int]]:
     """
     Setup scheme for Access Structure, Parameters and Share the secret.
 
@@ -37,6 +43,9 @@ def share_distribution(p_lambda: int,
             Optional argument for The upper bound for masking.
         weighted : bool
             Flag for weighted.
+        reduction : str
+            'direct' reduces Lift(s) by every prime, 'tree' walks it down 
+            the cached product tree of the primes.
 
     Returns
     -------
@@ -51,58 +60,220 @@ def share_distribution(p_lambda: int,
 
     """
     # Parameter for secret
-    print(bc.OKGREEN + f"The secret ({small_s})." + bc.ENDC)
+    logger.info("The secret (%s).", small_s)
+
+    # Validated parameters of the scheme
+    p_0, p_i, L = scheme_parameters(p_lambda, n, t, p_0, p_i, cand_L, weighted)
+
+    # Uniformly distributed random integer
+    u_L = secrets.randbelow(L) + 1    # Uniformly distributed over [L] using secrets
+    logger.info("Uniformly distributed random integer (%s).", u_L)
+
+    # Lifting of (s)
+    big_s = small_s + p_0 * u_L       # S = s + p_0 * U_L
+    logger.info("The lifting of s (%s).", big_s)
 
+    # Distribute shares to shareholders
+    s_i = reduce_shares(big_s, p_i, reduction)    # s_i = S mod p_i 
+    logger.info("The secret shares for the Shareholders (%s).", s_i)
+    return big_s, s_i, p_0, p_i
+
+def scheme_parameters(p_lambda: int, 
+                      n : int, 
+                      t : int,
+                      p_0 : Optional[int], 
+                      p_i : Optional[List[int]], 
+                      cand_L : Optional[int],
+                      weighted: bool) -> tuple[int, List[int], int]:
+    """
+    Setup and validation of the parameters for the Access Structure.
+
+    Parameters
+    ----------
+        p_lambda : int
+            Security parameter of bit length.
+        n : int
+            Number of shareholders.
+        t : int
+            Reconstruction threshold.
+        p_0 : Optional[int]
+            Optional argument for the order of field F.
+        p_i : Optional[List[int]]
+            Optional argument for List of distinct coprime integers for each shareholder.
+        cand_L : Optional[int]
+            Optional argument for The upper bound for masking.
+        weighted : bool
+            Flag for weighted.
+
+    Returns
+    -------
+        p_0 : int
+            Order of field F.
+        p_i : List[int]
+            List of distinct coprime integers for each shareholder.
+        L : int
+            The upper bound for masking.
+
+    """
     # Recommended bit length
     if not p_lambda >= 128:
-        print(bc.WARNING + f"Bit-length is recommended to be at least 128." + bc.ENDC)
+        logger.warning("Bit-length is recommended to be at least 128.")
     elif not weighted:
-        print(bc.OKGREEN + f"Security parameter is ({p_lambda}) bit length.")
+        logger.info("Security parameter is (%s) bit length.", p_lambda)
 
     # Validate that threshold does not exceed shareholders for unweighted
     if n < t and not weighted:
         raise ValueError(f"The amount of shareholders ({n}) must not be less threshold ({t}).")
     elif not weighted:
-        print(bc.OKGREEN + f"Amount of shareholder ({n}) and threshold ({t})." + bc.ENDC)
+        logger.info("Amount of shareholder (%s) and threshold (%s).", n, t)
     
     # Validation of order
     if p_0 is None:
         p_0 = getPrime(p_lambda)
-    elif not isPrime(p_0):
+    elif not is_prime(p_0):
         raise ValueError(f"p_0 ({p_0}) has to be a prime.")
     if not weighted:
-        print(bc.OKGREEN + f"Order of the field ({p_0})." + bc.ENDC)
+        logger.info("Order of the field (%s).", p_0)
 
     # Validation of distinct coprimes
     if p_i is None:
-        p_i = generate_party_primes(n, p_0, p_lambda)
+        p_i = generate_party_primes(n, p_0, p_lambda, default_pool())
     if not weighted:
         if not pairwise_coprime(p_i + [p_0]) or not primes_within_bitlength(p_i + [p_0], p_lambda) or not len(p_i) == n:
             raise ValueError("The given primes were not pairwise coprime, were over bit length "
             "or more entries of then given amount of Shareholders")
-    print(bc.OKGREEN + f"The distict primes ({p_i})." + bc.ENDC)
+    logger.info("The distict primes (%s).", p_i)
     
     # Correctness of scheme if unweighted
     if not weighted:
         L = crt_correctness(p_0, p_i, t, cand_L) 
     else:
         L = cand_L
-    print(bc.OKGREEN + f"The upper bound limit ({L})" + bc.ENDC)    
+    logger.info("The upper bound limit (%s)", L)
 
-    # Uniformly distributed random integer
-    u_L = secrets.randbelow(L) + 1    # Uniformly distributed over [L] using secrets
-    print(bc.OKGREEN + f"Uniformly distributed random integer ({u_L})." + bc.ENDC)
+    return p_0, p_i, L
 
-    # Lifting of (s)
-    big_s = small_s + p_0 * u_L       # S = s + p_0 * U_L
-    print(bc.OKGREEN + f"The lifting of s ({big_s})." + bc.ENDC)
+def sample_masks(L : int, count : int) -> List[int]:
+    """
+    Uniformly distributed integers over [L] drawn in bulk.
 
-    # Distribute shares to shareholders
-    s_i = [big_s % p for p in p_i]    # s_i = S mod p_i 
-    print(bc.OKGREEN + f"The secret shares for the Shareholders ({s_i})." + bc.ENDC)
-    return big_s, s_i, p_0, p_i
+    Randomness for all masks is requested at once and candidates
+    outside of [L] are rejected.
+
+    Parameters
+    ----------
+        L : int
+            The upper bound for masking.
+        count : int
+            Amount of masks.
+
+    Returns
+    -------
+        masks : List[int]
+            Masks uniformly distributed over [L].
+    """
+    size = ((L - 1).bit_length() + 7) // 8
+    if size == 0:
+        return [1] * count
+    excess = 8 * size - (L - 1).bit_length()
+    masks = []
+    while len(masks) < count:
+        pool = secrets.token_bytes(size * (count - len(masks)))
+        for k in range(0, len(pool), size):
+            u = int.from_bytes(pool[k:k + size], 'big') >> excess
+            if u < L:
+                masks.append(u + 1)
+    return masks
+
+def share_distribution_batch(p_lambda: int, 
+                             n : int, 
+                             t : int,
+                             small_secrets : List[int], 
+                             p_0 : Optional[int], 
+                             p_i : Optional[List[int]], 
+                             cand_L : Optional[int],
+                             weighted: bool,
+                             reduction : str = "direct") -> tuple[List[List[int]], int, List[int]]:
+    """
+    Share a sequence of secrets under one set of parameters.
+
+    The parameters are set up and validated once, after which every secret
+    is lifted with its own mask and reduced by the primes.
+
+    Parameters
+    ----------
+        p_lambda : int
+            Security parameter of bit length.
+        n : int
+            Number of shareholders.
+        t : int
+            Reconstruction threshold.
+        small_secrets : List[int] 
+            The secret integers from Field F_p0.
+        p_0 : Optional[int]
+            Optional argument for the order of field F.
+        p_i : Optional[List[int]]
+            Optional argument for List of distinct coprime integers for each shareholder.
+        cand_L : Optional[int]
+            Optional argument for The upper bound for masking.
+        weighted : bool
+            Flag for weighted.
+        reduction : str
+            'direct' or 'tree', see share_distribution.
 
-def share_reconstruction(p_0 : int, p_subset : List[int], shares_subset : List[int]) -> int:
+    Returns
+    -------
+        columns : List[List[int]]
+            For each shareholder the list of shares, one per secret.
+        p_0 : int
+            Order of field F.
+        p_i : List[int]
+            List of distinct coprime integers for each shareholder.
+    """
+    small_secrets = list(small_secrets)
+    p_0, p_i, L = scheme_parameters(p_lambda, n, t, p_0, p_i, cand_L, weighted)
+
+    # Lifting of every secret with masks drawn in bulk
+    masks = sample_masks(L, len(small_secrets))
+    lifts = [small_s + p_0 * u_L for small_s, u_L in zip(small_secrets, masks)]
+
+    # Column of shares for each shareholder
+    if reduction == "direct":
+        columns = [[big_s % p for big_s in lifts] for p in p_i]
+    else:
+        rows = [reduce_shares(big_s, p_i, reduction) for big_s in lifts]
+        columns = [list(column) for column in zip(*rows)] if rows else [[] for _ in p_i]
+    return columns, p_0, p_i
+
+def reduce_shares(big_s : int, p_i : List[int], reduction : str = "direct") -> List[int]:
+    """
+    Reduce Lift(s) modulo the prime of every shareholder.
+
+    The 'tree' mode reduces by the product tree of the primes, which is cached 
+    per parameter set. It needs fast division of big integers to pay off.
+
+    Parameters
+    ----------
+        big_s : int 
+            Lifting of the secret(s) known as Lift(s).
+        p_i : List[int]
+            List of distinct coprime integers for each shareholder.
+        reduction : str
+            'direct' or 'tree'.
+
+    Returns
+    -------
+        s_i : List[int]
+            List(s_i) of the shareholder's secret.
+    """
+    if reduction == "direct":
+        return [big_s % p for p in p_i]
+    if reduction == "tree":
+        return remainder_tree(big_s, cached_product_tree(tuple(p_i)))
+    raise ValueError(f"Unknown reduction ({reduction}), expected 'direct' or 'tree'.")
+
+def share_reconstruction(p_0 : int, p_subset : List[int], shares_subset : List[int],
+                         cache : Optional[PlanCache] = None) -> int:
     """
     Method for reconstructing an authorized set A of shareholders
 
@@ -114,6 +285,8 @@ def share_reconstruction(p_0 : int, p_subset : List[int], shares_subset : List[i
             List of primes for shareholders in set A.
         shares_subset : List[int]
             List of secrets for shareholders in set A.
+        cache : Optional[PlanCache]
+            Optional cache of reconstruction plans. Defaults to the shared cache.
     
     Returns
     -------
@@ -125,24 +298,91 @@ def share_reconstruction(p_0 : int, p_subset : List[int], shares_subset : List[i
     if len(p_subset) != len(shares_subset):
         raise ValueError("Subsets have to be an equal amount.")
 
-    P = prod(p_subset)                             # Product of primes in the subset
+    if cache is None:
+        cache = DEFAULT_PLAN_CACHE
     # Chinese Remainder Theorem
-    # It loops through the set A and we calculate the Langrange Coefficient
+    # The plan holds the Langrange Coefficient for every prime in set A
     # Which also can be written as: lambda_i = Q * Q^(-1)
     # to be used for the reconstruction: lambda_i * s_i mod P
-    result = 0                                     
-    for s_i, p_i in zip(shares_subset, p_subset):  
-        Q_i = P // p_i                             # Q = Prod_(j neq i) P_j
-        try:
-            inv_Q_i = modinv(Q_i, p_i)             # Inverse of Q modulo p_i
-        except ValueError as e:
-            raise ValueError(f"Failed modinv({Q_i}, {p_i}): {e}") from e
-        result += s_i * Q_i * inv_Q_i             
-    S = result % P                                 # Reconstruction of lift(s)
+    plan = cache.plan(p_subset)
+    S = plan.combine(p_subset, shares_subset)      # Reconstruction of lift(s)
     secret = S % p_0                               # Reconstruction of secret
-    print(bc.OKBLUE + f"The reconstructed secret ({secret})." + bc.ENDC)
+    logger.info("The reconstructed secret (%s).", secret, extra={"color": bc.OKBLUE})
     return secret
 
+class ShareAccumulator:
+    """
+    Online reconstruction for shares that arrive one at a time.
+
+    Every share (p_i, s_i) is folded into the running value S modulo the running
+    product P with one Garner step: S + P * ((s_i - S) * P^(-1) mod p_i). When the
+    accumulated weight reaches T the secret is S mod p_0, without further work.
+
+    Parameters
+    ----------
+        p_0 : int
+            Order of the field F.
+        T : int
+            Reconstruction threshold, compared with the sum of the weights of the added shares.
+    """
+    def __init__(self, p_0 : int, T : int):
+        self.p_0 = p_0
+        self.T = T
+        self.weight = 0
+        self.primes = set()
+        self.S = mpz(0)
+        self.P = mpz(1)
+
+    def add(self, p_i : int, s_i : int, weight : int = 1) -> bool:
+        """
+        Fold the share of a shareholder into the running CRT value.
+
+        Parameters
+        ----------
+            p_i : int
+                Prime of the shareholder.
+            s_i : int
+                Share of the shareholder.
+            weight : int
+                Weight of the shareholder, 1 for unweighted CRT-SS.
+
+        Returns
+        -------
+            ready : bool
+                Whether the accumulated weight reached the threshold T.
+        """
+        if p_i in self.primes:
+            raise ValueError(f"The share for the prime ({p_i}) was already added.")
+        inv_P = modinv(self.P % p_i, p_i)            # Inverse of P modulo p_i
+        digit = (s_i - self.S) * inv_P % p_i
+        self.S += self.P * digit
+        self.P *= p_i
+        self.primes.add(p_i)
+        self.weight += weight
+        return self.ready
+
+    @property
+    def ready(self) -> bool:
+        """
+        Whether the accumulated weight reached the threshold T.
+        """
+        return self.weight >= self.T
+
+    def finalize(self) -> int:
+        """
+        The secret from the shares added so far.
+
+        Returns
+        -------
+            secret : int
+                The secret integer from Field F_p0.
+        """
+        if not self.ready:
+            raise ValueError(f"Accumulated weight ({self.weight}) is below the threshold ({self.T}).")
+        secret = int(self.S % self.p_0)
+        logger.info("The reconstructed secret (%s).", secret, extra={"color": bc.OKBLUE})
+        return secret
+
 # --- Correctness and Security for unweighted CRT-SS ---
 
 def crt_correctness(p_0 : int, p_i : List[int], threshold : int, big_L : Optional[int]):
@@ -191,7 +431,7 @@ def crt_correctness(p_0 : int, p_i : List[int], threshold : int, big_L : Optiona
     # Validate the candidate to see if it satisfies for correctness
     # (L + 1) * p_0 < P_min
     if (big_L + 1) * p_0 < P_min and big_L >= 1:
-        print(bc.OKGREEN + "The scheme is perfectly correct according to Theoreom 5." + bc.ENDC)
+        logger.info("The scheme is perfectly correct according to Theoreom 5.")
         return big_L
     else:
         raise ValueError("The scheme does not satisfy for correctness.")
@@ -208,6 +448,7 @@ if __name__ == "__main__":
 
     It will reconstruct successfully given Authorized set A
     """
+    color_logging()
     big_s, shares, p_0, p_i = share_distribution(128, 3, 2, 420420, None, None, None, False)
     test_number = 2
     shares_subset = shares[:test_number]
@@ -1,12 +1,64 @@
 from Crypto.Hash import SHA256
 from Crypto.Protocol.KDF import HKDF
 import secrets
-from typing import List, Optional
-from crt_secret_sharing.util_crt import modinv
+from collections import deque
+from itertools import islice
+from threading import Lock
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, Iterator, List, Optional
+from crt_secret_sharing.util_crt import DEFAULT_PLAN_CACHE
 from crt_secret_sharing.weighted_crt_ss import weighted_setup
-from Crypto.Util.number import getPrime, isPrime
+from crt_secret_sharing.util_primes import generate_safe_prime
+from crt_secret_sharing.groups import Group, get_group, validate_group
+from crt_secret_sharing.fixed_base import FixedBaseTable, DEFAULT_TABLE_BUDGET
+from crt_secret_sharing.encoding import encode_int
+from crt_secret_sharing.backend import powmod
+from crt_secret_sharing.bcolors import color_logging
+
+# Versions of the ciphertext format, they differ in how group elements are
+# encoded for the hash and the extractor:
+# 1: decimal string, 2: big-endian bytes
+LEGACY_VERSION = 1
+CIPHERTEXT_VERSION = 2
+
+def encode_element(x : int, version : int = CIPHERTEXT_VERSION) -> bytes:
+    """
+    Bytes of a group element for the hash and the extractor of the given ciphertext version.
+    """
+    if version == CIPHERTEXT_VERSION:
+        return encode_int(x)
+    if version == LEGACY_VERSION:
+        return str(x).encode()
+    raise ValueError(f"Unknown ciphertext version ({version}).")
+
+class Ciphertext(tuple):
+    """
+    Ciphertext (c2, sd, c1, h_k) tagged with the version of its format.
+
+    Plain (c2, sd, c1, h_k) tuples carry no version. Reconstruction falls back to
+    LEGACY_VERSION for them and ciphertext_version tells the version from h_k.
+    """
+    def __new__(cls, c2 : int, sd : int, c1 : int, h_k : int, version : int = CIPHERTEXT_VERSION):
+        ciphertext = super().__new__(cls, (c2, sd, c1, h_k))
+        ciphertext.version = version
+        return ciphertext
+
+    def __getnewargs__(self):
+        return (*self, self.version)
+
+class Reconstruction(int):
+    """
+    Reconstructed pk^r tagged with the ciphertext version whose hash it matched.
+    """
+    def __new__(cls, value : int, version : int = CIPHERTEXT_VERSION):
+        reconstruction = super().__new__(cls, value)
+        reconstruction.version = version
+        return reconstruction
 
-def universal_hashing(x : int) -> int:
+    def __getnewargs__(self):
+        return (int(self), self.version)
+
+def universal_hashing(x : int, version : int = CIPHERTEXT_VERSION) -> int:
     """
     Universal hash function which uses SHA256.
 
@@ -14,6 +66,8 @@ def universal_hashing(x : int) -> int:
     ----------
         x : int 
             Input for universal hash function.
+        version : int
+            Ciphertext version, selects the encoding of x.
 
     Returns
     -------
@@ -21,10 +75,19 @@ def universal_hashing(x : int) -> int:
             SHA256 hash integer.
     """
     digest = SHA256.new()
-    digest.update(str(x).encode())
+    digest.update(encode_element(x, version))
     return int.from_bytes(digest.digest(), 'big')
 
-def randomness_extractor(s : int, X : int) -> int:
+def ciphertext_version(reconstruction : int, h_k : int) -> int:
+    """
+    Version of a ciphertext given its reconstructed key, the version whose hash of the key is h_k.
+    """
+    for version in (CIPHERTEXT_VERSION, LEGACY_VERSION):
+        if universal_hashing(reconstruction, version) == h_k:
+            return version
+    raise ValueError("The reconstruction does not match h_k in any ciphertext version.")
+
+def randomness_extractor(s : int, X : int, version : int = CIPHERTEXT_VERSION) -> int:
     """
     Randomness extractor from ElGamal session key using HKDF-SHA256.
 
@@ -34,6 +97,8 @@ def randomness_extractor(s : int, X : int) -> int:
             Seed for the randomness extractor.
         X : int
             Input for randomness extractor.
+        version : int
+            Ciphertext version, selects the encoding of X.
 
     Returns
     -------
@@ -42,7 +107,7 @@ def randomness_extractor(s : int, X : int) -> int:
 
     """
     hkdfsha256 = HKDF(
-        master=str(X).encode(),
+        master=encode_element(X, version),
         hashmod=SHA256,
         key_len=32,
         salt=s.to_bytes(32, 'big'), # Will get converted from int -> bytes
@@ -70,12 +135,12 @@ def find_generator(p : int, q : int) -> int:
         raise ValueError("q must divide p-1")
 
     for g in range(2, p):
-        if pow(g, q, p) == 1 and pow(g, 2, p) != 1:
+        if powmod(g, q, p) == 1 and powmod(g, 2, p) != 1:
             return g
         
     raise RuntimeError(f"Could not find generator of order {q} for prime {p}")
 
-def sample_group(p_lambda : int) -> tuple[int, int, int]:
+def sample_group(p_lambda : int, workers : int = 1) -> tuple[int, int, int]:
     """
     Sample safe prime p_0 and finds generator g.
 
@@ -83,6 +148,8 @@ def sample_group(p_lambda : int) -> tuple[int, int, int]:
     ----------
         p_lambda : int
             Security parameter of bit length.
+        workers : int
+            Amount of processes searching for the safe prime.
 
     Returns
     -------
@@ -93,21 +160,23 @@ def sample_group(p_lambda : int) -> tuple[int, int, int]:
         small_g : int
             Generator.
     """
-    while True:
-        q = getPrime(p_lambda)
-        p_0 = 2 * q + 1
-        if isPrime(p_0):
-            small_g = find_generator(p_0, q)
-            return p_0, q, small_g
+    # Sieved search for q with 2q+1 prime
+    q, _ = generate_safe_prime(p_lambda, workers)
+    p_0 = 2 * q + 1
+    small_g = find_generator(p_0, q)
+    return p_0, q, small_g
 
-def keygen(p_lambda):
+def keygen(p_lambda : int | str | Group, workers : int = 1):
     """
     Key generation for ElGamal scheme.
 
     Parameters
     ----------
-        p_lambda : int
-            Security parameter of bit length.
+        p_lambda : int | str | Group
+            Security parameter of bit length for a freshly sampled group,
+            or the name or handle of a registered group.
+        workers : int
+            Amount of processes searching for the safe prime.
 
     Returns
     -------
@@ -123,20 +192,27 @@ def keygen(p_lambda):
             Public key.
 
     """
-    p_0, q, small_g = sample_group(p_lambda)
+    if isinstance(p_lambda, str):
+        p_0, q, small_g = get_group(p_lambda)[1:]
+    elif isinstance(p_lambda, Group):
+        p_0, q, small_g = validate_group(p_lambda)[1:]
+    else:
+        p_0, q, small_g = sample_group(p_lambda, workers)
     s = secrets.randbelow(q-1) + 1
-    pk = pow(small_g, s, p_0)
+    pk = powmod(small_g, s, p_0)
     return p_0, q, small_g, s, pk
 
-def encrypt(m : int, pk : int, small_g : int, p_0 : int, q : int) -> tuple[tuple[int, int, int, int], int]:
+class PublicKey:
     """
-    ElGamal encryption.
+    ElGamal public key with fixed-base tables for g and pk.
+
+    The tables are built on the first encryption and reused for every following one,
+    so an encryption costs one multiplication per window of r instead of two full
+    exponentiations. The budget is shared between the two tables.
 
     Parameters
     ----------
-        m : int
-            Plaintext message.
-        pk : int 
+        pk : int
             Public key.
         small_g : int
             Generator.
@@ -144,29 +220,255 @@ def encrypt(m : int, pk : int, small_g : int, p_0 : int, q : int) -> tuple[tuple
             Safe prime.
         q : int
             Order.
+        budget : int
+            Memory budget of both tables together in bytes.
+    """
+    def __init__(self, pk : int, small_g : int, p_0 : int, q : int, budget : int = 2 * DEFAULT_TABLE_BUDGET):
+        self.pk = pk
+        self.small_g = small_g
+        self.p_0 = p_0
+        self.q = q
+        self.budget = budget
+        self._tables = None
+        self._lock = Lock()
+
+    def tables(self) -> tuple[FixedBaseTable, FixedBaseTable]:
+        """
+        Tables of g and pk, built on the first call.
+        """
+        with self._lock:
+            if self._tables is None:
+                # Exponents are r in [1, q-1]
+                bits = self.q.bit_length()
+                self._tables = (FixedBaseTable(self.small_g, self.p_0, bits, self.budget // 2),
+                                FixedBaseTable(self.pk, self.p_0, bits, self.budget // 2))
+            return self._tables
+
+    def g_pow(self, r : int) -> int:
+        """
+        g^r mod p_0.
+        """
+        return self.tables()[0].pow(r)
+
+    def pk_pow(self, r : int) -> int:
+        """
+        pk^r mod p_0.
+        """
+        return self.tables()[1].pow(r)
+
+    def check_group(self, small_g : int, p_0 : int, q : int):
+        """
+        Raise a ValueError unless the group matches the one of the key.
+        """
+        if (small_g, p_0, q) != (self.small_g, self.p_0, self.q):
+            raise ValueError(f"The group (g={small_g}, p_0={p_0}, q={q}) does not match the public key's "
+                             f"(g={self.small_g}, p_0={self.p_0}, q={self.q}).")
+
+    def size(self) -> int:
+        """
+        Memory of the built tables in bytes.
+        """
+        if self._tables is None:
+            return 0
+        return sum(table.size() for table in self._tables)
+
+class Precomputation:
+    """
+    Message independent part of an encryption, used for a single message.
+
+    Attributes
+    ----------
+        r : int
+            Random exponent.
+        sd : int
+            Seed.
+        c1 : int
+            g^r.
+        k_random : int
+            Ext(sd, pk^r).
+        h_k : int
+            h_k(pk^r).
+        version : int
+            Ciphertext version of the hash and the extractor.
+    """
+    __slots__ = ("r", "sd", "c1", "k_random", "h_k", "version", "used")
+
+    def __init__(self, r : int, sd : int, c1 : int, k_random : int, h_k : int,
+                 version : int = CIPHERTEXT_VERSION):
+        self.r = r
+        self.sd = sd
+        self.c1 = c1
+        self.k_random = k_random
+        self.h_k = h_k
+        self.version = version
+        self.used = False
+
+def encrypt_offline(pk : int | PublicKey, small_g : int, p_0 : int, q : int,
+                    version : int = CIPHERTEXT_VERSION) -> Precomputation:
+    """
+    Offline phase of ElGamal encryption, everything except the message.
+
+    Parameters
+    ----------
+        pk : int | PublicKey
+            Public key. A PublicKey uses its precomputed tables for g^r and pk^r,
+            the group has to match the one of the key.
+        small_g : int
+            Generator.
+        p_0 : int
+            Safe prime.
+        q : int
+            Order.
+        version : int
+            Ciphertext version.
 
     Returns
     -------
-        tuple : tuple[int, int, int, int]
-            Encrypted ciphertext
-        r : int
-            random integer.
+        pre : Precomputation
+            Randomness for a single call of encrypt_online.
     """
+    if isinstance(pk, PublicKey):
+        pk.check_group(small_g, p_0, q)
     # Generate random exponent
     r = secrets.randbelow(q - 1) + 1
-    # g^r
-    c1 = pow(small_g, r, p_0)
-    # pk^r
-    pub = pow(pk, r, p_0)
+    if isinstance(pk, PublicKey):
+        # g^r and pk^r from the fixed-base tables
+        c1 = pk.g_pow(r)
+        pub = pk.pk_pow(r)
+    else:
+        # g^r
+        c1 = powmod(small_g, r, p_0)
+        # pk^r
+        pub = powmod(pk, r, p_0)
     # seed
     sd = secrets.randbits(16)
     # Ext(sd,pk^r)
-    k_random = randomness_extractor(sd, pub)
-    # m \oplus Ext(sd, pk^r)
-    c2 = m ^ k_random
+    k_random = randomness_extractor(sd, pub, version)
     # h_k(pk^r)
-    h_k = universal_hashing(pub)
-    return (c2, sd, c1, h_k), r
+    h_k = universal_hashing(pub, version)
+    return Precomputation(r, sd, c1, k_random, h_k, version)
+
+def encrypt_online(m : int, pre : Precomputation) -> tuple[Ciphertext, int]:
+    """
+    Online phase of ElGamal encryption.
+
+    Parameters
+    ----------
+        m : int
+            Plaintext message.
+        pre : Precomputation
+            Output of encrypt_offline. Reusing it would reuse r, so it is rejected.
+
+    Returns
+    -------
+        tuple : Ciphertext
+            Encrypted ciphertext (c2, sd, c1, h_k)
+        r : int
+            random integer.
+    """
+    if pre.used:
+        raise ValueError("The precomputation has already been used for an encryption.")
+    pre.used = True
+    # m \oplus Ext(sd, pk^r)
+    c2 = m ^ pre.k_random
+    return Ciphertext(c2, pre.sd, pre.c1, pre.h_k, pre.version), pre.r
+
+def encrypt(m : int, pk : int | PublicKey, small_g : int, p_0 : int, q : int,
+            version : int = CIPHERTEXT_VERSION) -> tuple[Ciphertext, int]:
+    """
+    ElGamal encryption.
+
+    Parameters
+    ----------
+        m : int
+            Plaintext message.
+        pk : int | PublicKey
+            Public key. A PublicKey uses its precomputed tables for g^r and pk^r,
+            the group has to match the one of the key.
+        small_g : int
+            Generator.
+        p_0 : int
+            Safe prime.
+        q : int
+            Order.
+        version : int
+            Ciphertext version, LEGACY_VERSION for the decimal encoding.
+
+    Returns
+    -------
+        tuple : Ciphertext
+            Encrypted ciphertext (c2, sd, c1, h_k)
+        r : int
+            random integer.
+    """
+    return encrypt_online(m, encrypt_offline(pk, small_g, p_0, q, version))
+
+_batch_key = None
+
+def _init_batch_worker(pk, small_g, p_0, q, budget):
+    global _batch_key
+    # The group and the tables are set up once per worker, not pickled per message
+    if budget is not None:
+        pk = PublicKey(pk, small_g, p_0, q, budget)
+    _batch_key = (pk, small_g, p_0, q)
+
+def _encrypt_chunk(messages):
+    return [encrypt(m, *_batch_key) for m in messages]
+
+def encrypt_batch(messages : Iterable[int], pk : int | PublicKey, small_g : int, p_0 : int, q : int,
+                  workers : int = 1, chunksize : int = 64) -> Iterator[tuple[Ciphertext, int]]:
+    """
+    ElGamal encryption of many messages under one public key.
+
+    Parameters
+    ----------
+        messages : Iterable[int]
+            Plaintext messages, consumed lazily.
+        pk : int | PublicKey
+            Public key. For a PublicKey every worker builds its own tables with the same budget,
+            the group has to match the one of the key.
+        small_g : int
+            Generator.
+        p_0 : int
+            Safe prime.
+        q : int
+            Order.
+        workers : int
+            Amount of processes sharing the exponentiations.
+        chunksize : int
+            Amount of messages sent to a worker at a time.
+
+    Returns
+    -------
+        ciphertexts : Iterator[tuple[Ciphertext, int]]
+            The output of encrypt for every message, in the order of the messages.
+    """
+    if chunksize < 1:
+        raise ValueError(f"Chunk size ({chunksize}) has to be at least 1.")
+    if isinstance(pk, PublicKey):
+        pk.check_group(small_g, p_0, q)
+    messages = iter(messages)
+    if workers <= 1:
+        for m in messages:
+            yield encrypt(m, pk, small_g, p_0, q)
+        return
+
+    if isinstance(pk, PublicKey):
+        initargs = (pk.pk, small_g, p_0, q, pk.budget)
+    else:
+        initargs = (pk, small_g, p_0, q, None)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_batch_worker, initargs=initargs) as executor:
+        # A bounded amount of chunks in flight keeps the memory independent of the amount of messages
+        pending = deque()
+        while True:
+            while len(pending) < 2 * workers:
+                chunk = list(islice(messages, chunksize))
+                if not chunk:
+                    break
+                pending.append(executor.submit(_encrypt_chunk, chunk))
+            if not pending:
+                return
+            yield from pending.popleft().result()
 
 def lagrange_coeffs(index : int, shareholders : set[int], p_i : List[int]) -> int:
     """
@@ -186,13 +488,10 @@ def lagrange_coeffs(index : int, shareholders : set[int], p_i : List[int]) -> in
         lang_coeff : int ->
             Lagrange interpolation coefficient.
     """
-    P = 1
-    for j in shareholders:
-        P *= p_i[j]
-    p_i_index = p_i[index]
-    Q_i = P // p_i_index
-    Q_inv_i = modinv(Q_i, p_i_index)
-    return (Q_i * Q_inv_i) % P
+    # The plan computes the coefficients of the whole set once,
+    # with the product tree for large sets
+    plan = DEFAULT_PLAN_CACHE.plan([p_i[j] for j in shareholders])
+    return plan.coefficient(p_i[index])
     
 def partial_decrypt(index : int, share : int, c1 : int, p_0 : int, shareholders : set[int], 
                     p_i : List[int], q : int) -> int:
@@ -228,11 +527,11 @@ def partial_decrypt(index : int, share : int, c1 : int, p_0 : int, shareholders
     lambda_i = lagrange_coeffs(index, shareholders, p_i)
     exp = (share * lambda_i) % P_S
     final_exp = exp % q
-    mu_i = pow(c1, final_exp, p_0)
+    mu_i = powmod(c1, final_exp, p_0)
     return mu_i
 
 def reconstruct(partial_decryptions : dict, c1 : int, h_k : int, p_0 : int, shareholders : set[int], 
-                p_i : List[int], q : int) -> (int | None):
+                p_i : List[int], q : int, version : int = CIPHERTEXT_VERSION) -> (int | None):
     """
     Reconstruction of the key using Shareholders.
 
@@ -252,6 +551,9 @@ def reconstruct(partial_decryptions : dict, c1 : int, h_k : int, p_0 : int, shar
             List of distinct coprime integers for each shareholder.
         q : int
             Order.
+        version : int
+            Version of the ciphertext. For CIPHERTEXT_VERSION, LEGACY_VERSION is
+            tried as well if no candidate matches, plain tuples carry no version.
 
     Returns
     -------
@@ -265,22 +567,246 @@ def reconstruct(partial_decryptions : dict, c1 : int, h_k : int, p_0 : int, shar
     for i in shareholders:
         P *= p_i[i]
     
+    # Candidate j is mu * c1^(-j * P), every step multiplies by c1^(-P)
+    step = powmod(c1, (-P) % q, p_0)
     max_overflow = len(shareholders)
-    for j in range(max_overflow + 1):
-        exp_inv = (-j * P) % q
-
-        inv_factor = pow(c1, exp_inv, p_0) 
-        potential_k = (mu * inv_factor) % p_0 
+    versions = (version, LEGACY_VERSION) if version == CIPHERTEXT_VERSION else (version,)
+    for version in versions:
+        potential_k = mu
+        for _ in range(max_overflow + 1):
+            if universal_hashing(potential_k, version) == h_k:
+                return Reconstruction(potential_k, version)
+            potential_k = (potential_k * step) % p_0
 
-        if universal_hashing(potential_k) == h_k:
-            return potential_k
-    
     raise ValueError("Reconstruction failed: No matching hash")
 
-def decrypt(c2 : int, reconstruction : int, sd : int) -> int:
+# Bits of precision of the overflow hints above log2 of the amount of shareholders
+HINT_MARGIN = 16
+
+class DecryptionSession:
+    """
+    Threshold decryption for a fixed set of shareholders.
+
+    The product of the session primes P_S, the Lagrange coefficients of all
+    shareholders and P_S mod q are computed once when the session is created,
+    instead of once per partial decryption.
+
+    The sum of the exponents x_i = s_i * lambda_i mod P_S is S + j * P_S, where the
+    overflow j is at most |S|. Along with its partial decryption a shareholder can 
+    give the hint floor(x_i * 2^k / P_S), the leading k bits of x_i / P_S, from which
+    the session finds j directly instead of trying every candidate.
+
+    A hint is not harmless: x_i / P_S = (s_i * Q_i^(-1) mod p_i) / p_i, so every
+    published hint reveals k bits of s_i under a public multiplier, a new one for
+    every distinct set. Hints collected across sets form a hidden number problem
+    from which the share can be recovered. Hints may only be given to a combiner
+    the shareholders trust, or used inside one process as PartialDecryptionExecutor does.
+
+    Parameters
+    ----------
+        shareholders : set[int]
+            Indices of the shareholders.
+        p_i : List[int]
+            List of distinct coprime integers for each shareholder.
+        q : int
+            Order.
+        p_0 : int
+            Safe prime.
+        hint_bits : Optional[int]
+            Precision k of the overflow hints. Defaults to HINT_MARGIN bits above log2 |S|.
+    """
+    def __init__(self, shareholders : set[int], p_i : List[int], q : int, p_0 : int,
+                 hint_bits : Optional[int] = None):
+        self.shareholders = frozenset(shareholders)
+        self.q = q
+        self.p_0 = p_0
+        self.primes = {i: p_i[i] for i in self.shareholders}
+        # The plan computes all coefficients of the set together, with the product tree for large sets
+        self.plan = DEFAULT_PLAN_CACHE.plan(list(self.primes.values()))
+        self.P_S = self.plan.P
+        self.coeffs = {i: self.plan.coefficient(p) for i, p in self.primes.items()}
+        self.P_q = self.P_S % q
+        if hint_bits is None:
+            hint_bits = len(self.shareholders).bit_length() + HINT_MARGIN
+        self.hint_bits = hint_bits
+        # Candidates checked by the last reconstruction, the overflow and the version that matched
+        self.checks = 0
+        self.overflow_j = None
+        self.version = None
+
+    def _x(self, index : int, share : int) -> int:
+        if index not in self.coeffs:
+            raise ValueError(f"Shareholder ({index}) is not part of the session.")
+        return (share * self.coeffs[index]) % self.P_S
+
+    def exponent(self, index : int, share : int) -> int:
+        """
+        Exponent (share * lambda_i mod P_S) mod q of a shareholder.
+        """
+        return self._x(index, share) % self.q
+
+    def partial_decrypt(self, index : int, share : int, c1 : int) -> int:
+        """
+        Partial decryption of ciphertext for a shareholder, see partial_decrypt.
+        """
+        return powmod(c1, self.exponent(index, share), self.p_0)
+
+    def partial_decrypt_batch(self, index : int, share : int, c1s : Iterable[int]) -> List[int]:
+        """
+        Partial decryptions of many ciphertexts for a shareholder, the exponent is reduced once.
+        """
+        exponent = self.exponent(index, share)
+        p_0 = self.p_0
+        return [powmod(c1, exponent, p_0) for c1 in c1s]
+
+    def overflow_hint(self, index : int, share : int) -> int:
+        """
+        Overflow hint floor(x_i * 2^k / P_S) of a shareholder, it does not depend on the ciphertext.
+
+        The hint reveals k bits of the share, see the class description. It must
+        not be published, only given to a trusted combiner.
+        """
+        return (self._x(index, share) << self.hint_bits) // self.P_S
+
+    def overflow(self, hints : dict) -> range:
+        """
+        Candidates for the overflow j given the hints of all shareholders.
+
+        Every hint is rounded down by less than one, so the sum of x_i / P_S lies in
+        [H, H + |S|) / 2^k for the sum of hints H. The range holds one candidate,
+        or two if an integer falls inside that interval.
+        """
+        return self.overflow_range(sum(hints[i] for i in self.shareholders))
+
+    def overflow_range(self, total : int) -> range:
+        """
+        Candidates for the overflow j given the sum of the hints of all shareholders, see overflow.
+        """
+        lowest = total >> self.hint_bits
+        highest = (total + len(self.shareholders) - 1) >> self.hint_bits
+        return range(lowest, highest + 1)
+
+    def reconstruct(self, partial_decryptions : dict, c1 : int, h_k : int,
+                    hints : Optional[dict] = None, version : int = CIPHERTEXT_VERSION) -> int:
+        """
+        Reconstruction of the key using the partial decryptions, see reconstruct.
+
+        With the overflow hints of all shareholders only the candidates of overflow
+        are checked, otherwise every j from 0 to |S| is tried.
+        """
+        p_0 = self.p_0
+        mu = 1
+        for i in self.shareholders:
+            mu = (mu * partial_decryptions[i]) % p_0
+        return self.search(mu, c1, h_k, None if hints is None else self.overflow(hints), version)
+
+    def search(self, mu : int, c1 : int, h_k : int, candidates : Optional[range] = None,
+               version : int = CIPHERTEXT_VERSION) -> int:
+        """
+        Find the key among mu * c1^(-j * P_S) for the candidates of the overflow j.
+
+        Parameters
+        ----------
+            mu : int
+                Product of the partial decryptions of all shareholders modulo p_0.
+            c1 : int
+                g^r.
+            h_k : int
+                Hashed value for comparison.
+            candidates : Optional[range]
+                Candidates of j, from overflow or overflow_range. Every j from 0 to |S| if None.
+            version : int
+                Version of the ciphertext. For CIPHERTEXT_VERSION, LEGACY_VERSION is
+                tried as well if no candidate matches, plain tuples carry no version.
+
+        Returns
+        -------
+            potential_k : int
+                The candidate matching h_k.
+        """
+        p_0 = self.p_0
+        if candidates is None:
+            candidates = range(len(self.shareholders) + 1)
+
+        # Candidate j is mu * c1^(-j * P_S), every step multiplies by c1^(-P_S)
+        step_exponent = (-self.P_q) % self.q
+        start_exponent = (step_exponent * candidates.start) % self.q
+        potential_k = mu if start_exponent == 0 else (mu * powmod(c1, start_exponent, p_0)) % p_0
+        start = potential_k
+        step = None
+        self.checks = 0
+        versions = (version, LEGACY_VERSION) if version == CIPHERTEXT_VERSION else (version,)
+        for version in versions:
+            potential_k = start
+            for j in candidates:
+                self.checks += 1
+                if universal_hashing(potential_k, version) == h_k:
+                    self.overflow_j = j
+                    self.version = version
+                    return Reconstruction(potential_k, version)
+                # With hints the first candidate usually matches, the step is only needed otherwise
+                if step is None:
+                    step = powmod(c1, step_exponent, p_0)
+                potential_k = (potential_k * step) % p_0
+
+        raise ValueError("Reconstruction failed: No matching hash")
+
+    def reconstruct_batch(self, partial_decryptions : dict, ciphertexts : List[Ciphertext],
+                          hints : Optional[dict] = None) -> List[int]:
+        """
+        Reconstruction of the keys of many ciphertexts decrypted by the session's shareholders.
+
+        The overflow j = floor(sum x_i / P_S) only depends on the shares, not on the
+        ciphertext. Once it is found for the first ciphertext, with the hints or by
+        trying every candidate, every other key is checked for that j alone.
+
+        Parameters
+        ----------
+            partial_decryptions : dict
+                List of partial decryptions per shareholder, from partial_decrypt_batch,
+                in the order of the ciphertexts.
+            ciphertexts : List[Ciphertext]
+                Ciphertexts of the batch.
+            hints : Optional[dict]
+                Overflow hints of all shareholders. Every j from 0 to |S| is tried if None.
+
+        Returns
+        -------
+            reconstructions : List[int]
+                pk^r of every ciphertext, to be used with decrypt.
+        """
+        p_0 = self.p_0
+        mus = [1] * len(ciphertexts)
+        for i in self.shareholders:
+            vector = partial_decryptions[i]
+            if len(vector) != len(ciphertexts):
+                raise ValueError(f"Shareholder ({i}) has {len(vector)} partial decryptions "
+                                 f"for ({len(ciphertexts)}) ciphertexts.")
+            mus = [(mu * mu_i) % p_0 for mu, mu_i in zip(mus, vector)]
+
+        candidates = None if hints is None else self.overflow(hints)
+        reconstructions = []
+        checks = 0
+        for mu, ciphertext in zip(mus, ciphertexts):
+            version = getattr(ciphertext, 'version', CIPHERTEXT_VERSION)
+            reconstructions.append(self.search(mu, ciphertext[2], ciphertext[3], candidates, version))
+            checks += self.checks
+            if candidates is None or len(candidates) > 1:
+                candidates = range(self.overflow_j, self.overflow_j + 1)
+        # Candidates checked for the whole batch
+        self.checks = checks
+        return reconstructions
+
+def decrypt(c2 : int, reconstruction : int, sd : int, version : Optional[int] = None,
+            h_k : Optional[int] = None) -> int:
     """
     ElGamal Decryption.
 
+    The version is taken from the reconstruction, which reconstruct tags with
+    the version whose hash matched, from the version argument or from h_k. If
+    more than one is known they have to agree, so a legacy ciphertext is never
+    decrypted with the encoding of another version.
+
     Parameters
     ----------
         c2 : int
@@ -289,16 +815,39 @@ def decrypt(c2 : int, reconstruction : int, sd : int) -> int:
             Reconstructed for correct j.
         sd : int
             Seed.
+        version : Optional[int]
+            Version of the ciphertext. CIPHERTEXT_VERSION if it is not known otherwise.
+        h_k : Optional[int]
+            h_k of the ciphertext, the version is checked against it with ciphertext_version.
 
     Returns
     -------
         decrypted : int
             Decrypted message.
     """
-    k_random = randomness_extractor(sd, reconstruction)
+    versions = {getattr(reconstruction, 'version', None), version}
+    if h_k is not None:
+        versions.add(ciphertext_version(reconstruction, h_k))
+    versions.discard(None)
+    if len(versions) > 1:
+        raise ValueError(f"Conflicting ciphertext versions ({sorted(versions)}).")
+    version = versions.pop() if versions else CIPHERTEXT_VERSION
+    k_random = randomness_extractor(sd, int(reconstruction), version)
     return c2 ^ k_random
 
+def decrypt_batch(ciphertexts : Iterable[Ciphertext], reconstructions : Iterable[int]) -> List[int]:
+    """
+    ElGamal decryption of many ciphertexts with the output of reconstruct_batch.
+    """
+    decrypted = []
+    for ciphertext, reconstruction in zip(ciphertexts, reconstructions):
+        c2, sd, _, h_k = ciphertext
+        # The version of plain tuples follows from the hash of the key
+        decrypted.append(decrypt(c2, reconstruction, sd, getattr(ciphertext, 'version', None), h_k))
+    return decrypted
+
 if __name__ == "__main__":
+    color_logging()
     n = 5
     T = 25
     t = 15
@@ -0,0 +1,44 @@
+from typing import Optional
+
+def int_length(x : int) -> int:
+    """
+    Amount of bytes of the minimal big-endian encoding of a non-negative integer.
+    """
+    return max(1, (x.bit_length() + 7) // 8)
+
+def encode_int(x : int, length : Optional[int] = None) -> bytes:
+    """
+    Canonical big-endian encoding of a non-negative integer.
+
+    Parameters
+    ----------
+        x : int
+            Integer to encode.
+        length : Optional[int]
+            Fixed amount of bytes. Defaults to the minimal length.
+
+    Returns
+    -------
+        data : bytes
+            Big-endian bytes of x.
+    """
+    if x < 0:
+        raise ValueError(f"Only non-negative integers can be encoded, got ({x}).")
+    return x.to_bytes(int_length(x) if length is None else length, 'big')
+
+def encode_ints(*xs : int) -> bytes:
+    """
+    Unambiguous encoding of a sequence of integers, each prefixed by its 4 byte length.
+    """
+    out = bytearray()
+    for x in xs:
+        data = encode_int(x)
+        out += len(data).to_bytes(4, 'big')
+        out += data
+    return bytes(out)
+
+def decode_int(data : bytes) -> int:
+    """
+    Integer of big-endian bytes.
+    """
+    return int.from_bytes(data, 'big')
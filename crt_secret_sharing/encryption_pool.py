@@ -0,0 +1,142 @@
+from collections import deque
+from threading import Thread, Condition
+from typing import Optional
+from crt_secret_sharing.el_gamal_encryption import PublicKey, Precomputation, Ciphertext, encrypt_offline, encrypt_online
+
+class EncryptionPool:
+    """
+    Bounded pool of offline encryptions for a single public key.
+
+    A background thread keeps the pool filled, so an encryption only takes a
+    precomputation and XORs the message with its extracted key. Every
+    precomputation leaves the pool when it is taken, so it is used once.
+    When the pool runs empty the precomputation is done inline.
+
+    Parameters
+    ----------
+        pk : int | PublicKey
+            Public key.
+        small_g : int
+            Generator.
+        p_0 : int
+            Safe prime.
+        q : int
+            Order.
+        size : int
+            High-water mark, the pool is refilled up to this amount.
+        low_water : Optional[int]
+            Refilling starts once the pool holds fewer precomputations.
+            Defaults to half of the size.
+    """
+    def __init__(self, pk : int | PublicKey, small_g : int, p_0 : int, q : int,
+                 size : int = 256, low_water : Optional[int] = None):
+        if size < 1:
+            raise ValueError(f"Pool size ({size}) has to be at least 1.")
+        if low_water is None:
+            low_water = size // 2
+        if not 0 <= low_water < size:
+            raise ValueError(f"Low-water mark ({low_water}) has to be in [0, {size}).")
+        self.pk = pk
+        self.small_g = small_g
+        self.p_0 = p_0
+        self.q = q
+        self.size = size
+        self.low_water = low_water
+        self.hits = 0
+        self.misses = 0
+        self._ready = deque()
+        self._condition = Condition()
+        self._halt = False
+        self._worker = None
+
+    def _precompute(self) -> Precomputation:
+        return encrypt_offline(self.pk, self.small_g, self.p_0, self.q)
+
+    def _run(self):
+        while True:
+            with self._condition:
+                # Sleep until the pool drops below the low-water mark
+                while not self._halt and len(self._ready) > self.low_water:
+                    self._condition.wait()
+                if self._halt:
+                    return
+            while True:
+                pre = self._precompute()
+                with self._condition:
+                    if self._halt:
+                        return
+                    self._ready.append(pre)
+                    self._condition.notify_all()
+                    if len(self._ready) >= self.size:
+                        break
+
+    def start(self) -> "EncryptionPool":
+        """
+        Start the background thread filling the pool.
+        """
+        with self._condition:
+            if self._worker is not None:
+                return self
+            self._halt = False
+            self._worker = Thread(target=self._run, name="encryption-pool-refill", daemon=True)
+        self._worker.start()
+        return self
+
+    def stop(self, timeout : Optional[float] = None):
+        """
+        Stop the background thread after the precomputation it is currently doing.
+        """
+        with self._condition:
+            self._halt = True
+            self._condition.notify_all()
+            worker, self._worker = self._worker, None
+        if worker is not None:
+            worker.join(timeout)
+
+    def fill(self, count : Optional[int] = None):
+        """
+        Precompute in the calling thread until the pool holds count precomputations.
+
+        Parameters
+        ----------
+            count : Optional[int]
+                Wanted amount, at most and by default the size of the pool.
+        """
+        count = self.size if count is None else min(count, self.size)
+        while len(self) < count:
+            pre = self._precompute()
+            with self._condition:
+                self._ready.append(pre)
+                self._condition.notify_all()
+
+    def take(self) -> Precomputation:
+        """
+        Remove a precomputation from the pool, computing one if the pool is empty.
+        """
+        with self._condition:
+            if self._ready:
+                pre = self._ready.popleft()
+                self.hits += 1
+            else:
+                pre = None
+                self.misses += 1
+            if len(self._ready) <= self.low_water:
+                self._condition.notify_all()
+        if pre is None:
+            pre = self._precompute()
+        return pre
+
+    def encrypt(self, m : int) -> tuple[Ciphertext, int]:
+        """
+        ElGamal encryption with a precomputation of the pool, see el_gamal_encryption.encrypt.
+        """
+        return encrypt_online(m, self.take())
+
+    def __len__(self):
+        return len(self._ready)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
@@ -0,0 +1,98 @@
+from typing import Optional
+from crt_secret_sharing.backend import mpz, powmod
+
+# Memory per table if no budget is given, in bytes
+DEFAULT_TABLE_BUDGET = 8 * 1024 * 1024
+
+# Widest window considered for a table
+MAX_WINDOW = 12
+
+class FixedBaseTable:
+    """
+    Precomputed powers of a fixed base for windowed exponentiation.
+
+    Row i holds base^(d * 2^(w*i)) for every digit d of w bits, so an exponent
+    is applied as one modular multiplication per non-zero digit and no squarings.
+    The window w is the widest that keeps the table within the memory budget.
+
+    Parameters
+    ----------
+        base : int
+            The fixed base.
+        modulus : int
+            Modulus of the group.
+        exponent_bits : int
+            Bit length of the largest exponent.
+        budget : int
+            Memory budget of the table in bytes.
+    """
+    def __init__(self, base : int, modulus : int, exponent_bits : int, budget : int = DEFAULT_TABLE_BUDGET):
+        self.base = base % modulus
+        self.modulus = modulus
+        self.exponent_bits = exponent_bits
+        self.window = window_for_budget(modulus, exponent_bits, budget)
+        self.rows = None
+        if self.window is not None:
+            self.rows = self._build()
+
+    def _build(self):
+        w = self.window
+        rows = []
+        # Entries are integers of the arithmetic backend
+        modulus = self._modulus = mpz(self.modulus)
+        row_base = mpz(self.base)
+        for _ in range(-(-self.exponent_bits // w)):
+            row = [1, row_base]
+            for _ in range(2, 1 << w):
+                row.append(row[-1] * row_base % modulus)
+            rows.append(row)
+            # base^(2^(w*(i+1))) is the next row's base
+            row_base = row[-1] * row_base % modulus
+        return rows
+
+    def pow(self, exponent : int) -> int:
+        """
+        base^exponent mod modulus.
+
+        Exponents outside of the table fall back to backend.powmod.
+        """
+        if self.rows is None or exponent < 0 or exponent.bit_length() > self.exponent_bits:
+            return powmod(self.base, exponent, self.modulus)
+        w = self.window
+        mask = (1 << w) - 1
+        modulus = self._modulus
+        result = 1
+        for row in self.rows:
+            if not exponent:
+                break
+            digit = exponent & mask
+            if digit:
+                result = result * row[digit] % modulus
+            exponent >>= w
+        return int(result)
+
+    def size(self) -> int:
+        """
+        Approximate memory of the table in bytes.
+        """
+        if self.rows is None:
+            return 0
+        return table_size(self.modulus, self.exponent_bits, self.window)
+
+def table_size(modulus : int, exponent_bits : int, window : int) -> int:
+    """
+    Bytes held by the group elements of a table with the given window.
+    """
+    rows = -(-exponent_bits // window)
+    return rows * (1 << window) * ((modulus.bit_length() + 7) // 8)
+
+def window_for_budget(modulus : int, exponent_bits : int, budget : int) -> Optional[int]:
+    """
+    Widest window whose table fits in the budget, None if not even a window of one bit fits.
+    """
+    window = None
+    for w in range(1, MAX_WINDOW + 1):
+        if table_size(modulus, exponent_bits, w) > budget:
+            break
+        window = w
+    return window
@@ -0,0 +1,159 @@
+from typing import BinaryIO, NamedTuple
+from Crypto.Cipher import AES, ChaCha20_Poly1305
+from crt_secret_sharing.el_gamal_encryption import PublicKey, CIPHERTEXT_VERSION, encrypt_offline, randomness_extractor
+from crt_secret_sharing.serialization import Writer, Reader, KIND_HYBRID, read_exact, read_record
+
+# AEAD ciphers of the payload
+CIPHER_AES_GCM = 0
+CIPHER_CHACHA20_POLY1305 = 1
+
+TAG_SIZE = 16
+DEFAULT_CHUNKSIZE = 64 * 1024
+
+class HybridHeader(NamedTuple):
+    """
+    Key encapsulation of a hybrid ciphertext and the layout of its payload.
+
+    sd, c1 and h_k are the ElGamal part as in a Ciphertext, the key of the
+    payload is Ext(sd, pk^r) and is recovered with reconstruct.
+    """
+    version : int
+    sd : int
+    c1 : int
+    h_k : int
+    cipher : int
+    chunksize : int
+
+def dumps_header(header : HybridHeader) -> bytearray:
+    """
+    Serialize the header of a hybrid ciphertext.
+    """
+    writer = Writer()
+    writer.header(KIND_HYBRID)
+    for x in header:
+        writer.int(x)
+    return writer.buffer
+
+def read_header(source : BinaryIO) -> HybridHeader:
+    """
+    Read the header of a hybrid ciphertext, the stream is left at the start of the payload.
+    """
+    reader = Reader(read_record(source, len(HybridHeader._fields)))
+    reader.header(KIND_HYBRID)
+    header = HybridHeader(*(reader.int() for _ in HybridHeader._fields))
+    reader.end()
+    return header
+
+def _aead(cipher : int, key : bytes, counter : int, last : bool):
+    # Nonce of the STREAM construction: chunk counter and a flag for the last chunk
+    nonce = counter.to_bytes(11, 'big') + (b"\x01" if last else b"\x00")
+    if cipher == CIPHER_AES_GCM:
+        return AES.new(key, AES.MODE_GCM, nonce=nonce, mac_len=TAG_SIZE)
+    if cipher == CIPHER_CHACHA20_POLY1305:
+        return ChaCha20_Poly1305.new(key=key, nonce=nonce)
+    raise ValueError(f"Unknown cipher ({cipher}).")
+
+def encrypt_stream(source : BinaryIO, sink : BinaryIO, pk : int | PublicKey, small_g : int, p_0 : int, q : int,
+                   cipher : int = CIPHER_AES_GCM, chunksize : int = DEFAULT_CHUNKSIZE,
+                   version : int = CIPHERTEXT_VERSION) -> HybridHeader:
+    """
+    Hybrid encryption of a stream, threshold ElGamal for the key and an AEAD for the payload.
+
+    One ElGamal encryption encapsulates a fresh key, the payload is encrypted
+    with it in chunks, each with its own tag. The chunks are numbered in their
+    nonces and the last one is flagged, so reordered, dropped or truncated
+    chunks are detected. The header is authenticated with every chunk.
+
+    Parameters
+    ----------
+        source : BinaryIO
+            Stream with the payload.
+        sink : BinaryIO
+            Stream the header and the encrypted chunks are written to.
+        pk : int | PublicKey
+            Public key.
+        small_g : int
+            Generator.
+        p_0 : int
+            Safe prime.
+        q : int
+            Order.
+        cipher : int
+            CIPHER_AES_GCM or CIPHER_CHACHA20_POLY1305.
+        chunksize : int
+            Bytes of payload per chunk.
+        version : int
+            Ciphertext version of the key encapsulation.
+
+    Returns
+    -------
+        header : HybridHeader
+            Header written in front of the payload.
+    """
+    if chunksize < 1:
+        raise ValueError(f"Chunk size ({chunksize}) has to be at least 1.")
+    pre = encrypt_offline(pk, small_g, p_0, q, version)
+    pre.used = True
+    key = pre.k_random.to_bytes(32, 'big')
+    header = HybridHeader(version, pre.sd, pre.c1, pre.h_k, cipher, chunksize)
+    associated = bytes(dumps_header(header))
+    sink.write(associated)
+
+    counter = 0
+    while True:
+        chunk = read_exact(source, chunksize)
+        # A full chunk is never the last one, the payload ends with a shorter, possibly empty, chunk
+        last = len(chunk) < chunksize
+        aead = _aead(cipher, key, counter, last)
+        aead.update(associated)
+        encrypted, tag = aead.encrypt_and_digest(chunk)
+        sink.write(encrypted)
+        sink.write(tag)
+        counter += 1
+        if last:
+            return header
+
+def decrypt_stream(source : BinaryIO, sink : BinaryIO, header : HybridHeader, reconstruction : int) -> int:
+    """
+    Decrypt the payload of a hybrid ciphertext after its header was read with read_header.
+
+    Every chunk is verified before it is written, a ValueError is raised on a
+    forged or truncated payload. Chunks before it have already been written then.
+
+    Parameters
+    ----------
+        source : BinaryIO
+            Stream positioned after the header.
+        sink : BinaryIO
+            Stream the payload is written to.
+        header : HybridHeader
+            Header of the ciphertext.
+        reconstruction : int
+            pk^r from reconstruct with header.c1 and header.h_k.
+
+    Returns
+    -------
+        length : int
+            Amount of payload bytes written.
+    """
+    key = randomness_extractor(header.sd, reconstruction, header.version).to_bytes(32, 'big')
+    associated = bytes(dumps_header(header))
+    size = header.chunksize + TAG_SIZE
+    length = 0
+    counter = 0
+    while True:
+        chunk = read_exact(source, size)
+        if len(chunk) < TAG_SIZE:
+            raise ValueError("Truncated hybrid ciphertext.")
+        last = len(chunk) < size
+        aead = _aead(header.cipher, key, counter, last)
+        aead.update(associated)
+        try:
+            payload = aead.decrypt_and_verify(chunk[:-TAG_SIZE], chunk[-TAG_SIZE:])
+        except ValueError as e:
+            raise ValueError(f"Chunk ({counter}) failed authentication: {e}") from e
+        sink.write(payload)
+        length += len(payload)
+        counter += 1
+        if last:
+            return length
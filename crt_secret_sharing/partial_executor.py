@@ -0,0 +1,123 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
+from crt_secret_sharing.el_gamal_encryption import DecryptionSession, CIPHERTEXT_VERSION
+
+_worker_session = None
+_worker_shares = None
+
+def _init_partial_worker(shares, shareholders, p_i, q, p_0, hint_bits):
+    global _worker_session, _worker_shares
+    # The session and the shares are set up once per worker, a task only carries c1
+    _worker_session = DecryptionSession(shareholders, p_i, q, p_0, hint_bits)
+    _worker_shares = shares
+
+def _chunk(session, shares, c1, indices, combine):
+    if not combine:
+        return [(i, session.partial_decrypt(i, shares[i], c1)) for i in indices]
+    # Only the product of the chunk's partial decryptions goes back
+    p_0 = session.p_0
+    mu = 1
+    for i in indices:
+        mu = mu * session.partial_decrypt(i, shares[i], c1) % p_0
+    return mu
+
+def _partial_chunk(c1, indices, combine):
+    return _chunk(_worker_session, _worker_shares, c1, indices, combine)
+
+class PartialDecryptionExecutor:
+    """
+    Partial decryptions of a fixed set of shareholders spread over a process pool.
+
+    Every worker builds the DecryptionSession of the set and receives the
+    shares once, when it starts. A ciphertext is then split into one chunk
+    of shareholders per worker and only c1 is sent along.
+
+    Parameters
+    ----------
+        shares : Dict[int, int]
+            Share of every shareholder in the set.
+        p_i : List[int]
+            List of distinct coprime integers for each shareholder.
+        q : int
+            Order.
+        p_0 : int
+            Safe prime.
+        workers : Optional[int]
+            Amount of processes, the amount of CPUs by default. With 1 everything runs inline.
+        hint_bits : Optional[int]
+            Precision of the overflow hints, see DecryptionSession.
+    """
+    def __init__(self, shares : Dict[int, int], p_i : List[int], q : int, p_0 : int,
+                 workers : Optional[int] = None, hint_bits : Optional[int] = None):
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if workers < 1:
+            raise ValueError(f"Amount of workers ({workers}) has to be at least 1.")
+        self.shares = dict(shares)
+        self.session = DecryptionSession(self.shares, p_i, q, p_0, hint_bits)
+        self.workers = workers
+        # The overflow hints do not depend on the ciphertext
+        self.hint_total = sum(self.session.overflow_hint(i, s) for i, s in self.shares.items())
+
+        indices = sorted(self.shares)
+        size = -(-len(indices) // workers)
+        self.chunks = [indices[k:k + size] for k in range(0, len(indices), size)]
+        self._executor = None
+        if workers > 1:
+            self._executor = ProcessPoolExecutor(
+                max_workers=workers, initializer=_init_partial_worker,
+                initargs=(self.shares, self.session.shareholders, p_i, q, p_0, self.session.hint_bits))
+
+    def _map(self, c1 : int, combine : bool) -> list:
+        if self._executor is None:
+            return [_chunk(self.session, self.shares, c1, chunk, combine) for chunk in self.chunks]
+        futures = [self._executor.submit(_partial_chunk, c1, chunk, combine) for chunk in self.chunks]
+        return [future.result() for future in futures]
+
+    def partial_decrypt(self, c1 : int) -> Dict[int, int]:
+        """
+        Partial decryptions of all shareholders for the ciphertext's c1.
+        """
+        return {i: mu_i for chunk in self._map(c1, False) for i, mu_i in chunk}
+
+    def reconstruct(self, c1 : int, h_k : int, version : int = CIPHERTEXT_VERSION) -> int:
+        """
+        Reconstruction of the key, see DecryptionSession.reconstruct.
+
+        The workers multiply the partial decryptions of their chunk, so one
+        element per worker is returned, and the overflow comes from the hints.
+
+        Parameters
+        ----------
+            c1 : int
+                g^r.
+            h_k : int
+                Hashed value for comparison.
+            version : int
+                Version of the ciphertext.
+
+        Returns
+        -------
+            reconstruction : int
+                pk^r, to be used with decrypt.
+        """
+        p_0 = self.session.p_0
+        mu = 1
+        for mu_chunk in self._map(c1, True):
+            mu = mu * mu_chunk % p_0
+        return self.session.search(mu, c1, h_k, self.session.overflow_range(self.hint_total), version)
+
+    def close(self):
+        """
+        Shut the worker processes down.
+        """
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,212 @@
+import os
+import sqlite3
+from contextlib import closing
+from hashlib import sha256
+from threading import Thread, Event, Lock
+from typing import Callable, Dict, List, Optional
+from crt_secret_sharing.util_primes import generate_bucket_prime
+
+# Environment variable with the path of the default pool
+POOL_ENV = "CRT_SS_PRIME_POOL"
+
+def bucket_key(bucket : tuple) -> str:
+    """
+    Key of a bucket in the store, e.g. 'bits:256' or 'weighted:600:5'.
+    """
+    return ":".join(str(part) for part in bucket)
+
+class PrimePool:
+    """
+    File-backed pool of pre-generated primes.
+
+    Primes are bucketed by bit length or by weighted interval, see
+    util_primes.bits_bucket and util_primes.interval_bucket. A prime that
+    is taken from the pool is deleted and its digest is recorded, so it is
+    never handed out again, not even if it is added once more.
+
+    Parameters
+    ----------
+        path : str
+            Path of the SQLite file.
+    """
+    def __init__(self, path : str):
+        self.path = path
+        with closing(self._connect()) as conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS primes "
+                         "(id INTEGER PRIMARY KEY, bucket TEXT NOT NULL, prime BLOB NOT NULL UNIQUE)")
+            conn.execute("CREATE INDEX IF NOT EXISTS primes_bucket ON primes (bucket)")
+            conn.execute("CREATE TABLE IF NOT EXISTS consumed (digest BLOB PRIMARY KEY)")
+
+    def _connect(self) -> sqlite3.Connection:
+        # One connection per operation, so the pool can be shared between threads
+        return sqlite3.connect(self.path, timeout=30, isolation_level=None)
+
+    def add(self, bucket : tuple, primes : List[int]) -> int:
+        """
+        Store primes in a bucket.
+
+        Parameters
+        ----------
+            bucket : tuple
+                Bucket of the primes.
+            primes : List[int]
+                Primes to store.
+
+        Returns
+        -------
+            added : int
+                Amount of primes stored. Primes already in the pool or
+                consumed earlier are skipped.
+        """
+        key = bucket_key(bucket)
+        added = 0
+        with closing(self._connect()) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                for p in primes:
+                    blob = p.to_bytes((p.bit_length() + 7) // 8, 'big')
+                    digest = sha256(blob).digest()
+                    if conn.execute("SELECT 1 FROM consumed WHERE digest = ?", (digest,)).fetchone():
+                        continue
+                    cursor = conn.execute("INSERT OR IGNORE INTO primes (bucket, prime) VALUES (?, ?)", (key, blob))
+                    added += cursor.rowcount
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        return added
+
+    def take(self, bucket : tuple, count : int) -> List[int]:
+        """
+        Remove up to count primes from a bucket.
+
+        Parameters
+        ----------
+            bucket : tuple
+                Bucket of the primes.
+            count : int
+                Amount of primes wanted.
+
+        Returns
+        -------
+            primes : List[int]
+                The primes, fewer than count if the bucket runs empty.
+        """
+        if count <= 0:
+            return []
+        with closing(self._connect()) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                rows = conn.execute("SELECT id, prime FROM primes WHERE bucket = ? LIMIT ?",
+                                    (bucket_key(bucket), count)).fetchall()
+                conn.executemany("DELETE FROM primes WHERE id = ?", [(row[0],) for row in rows])
+                conn.executemany("INSERT OR IGNORE INTO consumed (digest) VALUES (?)",
+                                 [(sha256(row[1]).digest(),) for row in rows])
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        return [int.from_bytes(row[1], 'big') for row in rows]
+
+    def size(self, bucket : tuple) -> int:
+        """
+        Amount of primes available in a bucket.
+        """
+        with closing(self._connect()) as conn:
+            return conn.execute("SELECT COUNT(*) FROM primes WHERE bucket = ?", (bucket_key(bucket),)).fetchone()[0]
+
+    def refill(self, bucket : tuple, target : int,
+               generate : Callable[[tuple], int] = generate_bucket_prime,
+               stop : Optional[Event] = None) -> int:
+        """
+        Generate primes until the bucket holds at least target primes.
+
+        Parameters
+        ----------
+            bucket : tuple
+                Bucket to fill.
+            target : int
+                Wanted amount of primes in the bucket.
+            generate : Callable[[tuple], int]
+                Generator of a single prime for the bucket.
+            stop : Optional[Event]
+                Stops the refill early when set.
+
+        Returns
+        -------
+            added : int
+                Amount of primes added.
+        """
+        added = 0
+        missing = target - self.size(bucket)
+        while missing > 0 and not (stop is not None and stop.is_set()):
+            new = self.add(bucket, [generate(bucket)])
+            added += new
+            missing -= new
+        return added
+
+    def start_refill(self, targets : Dict[tuple, int], interval : float = 1.0,
+                     generate : Callable[[tuple], int] = generate_bucket_prime) -> "RefillWorker":
+        """
+        Start a background worker keeping the buckets at their targets.
+
+        Parameters
+        ----------
+            targets : Dict[tuple, int]
+                Wanted amount of primes per bucket.
+            interval : float
+                Seconds between checks of the buckets.
+            generate : Callable[[tuple], int]
+                Generator of a single prime for a bucket.
+
+        Returns
+        -------
+            worker : RefillWorker
+                The running worker, stopped with worker.stop().
+        """
+        worker = RefillWorker(self, targets, interval, generate)
+        worker.start()
+        return worker
+
+
+class RefillWorker(Thread):
+    """
+    Background thread refilling the buckets of a pool.
+    """
+    def __init__(self, pool : PrimePool, targets : Dict[tuple, int], interval : float,
+                 generate : Callable[[tuple], int]):
+        super().__init__(name="prime-pool-refill", daemon=True)
+        self.pool = pool
+        self.targets = dict(targets)
+        self.interval = interval
+        self.generate = generate
+        self._halt = Event()
+
+    def run(self):
+        while not self._halt.is_set():
+            for bucket, target in self.targets.items():
+                self.pool.refill(bucket, target, self.generate, self._halt)
+            self._halt.wait(self.interval)
+
+    def stop(self, timeout : Optional[float] = None):
+        """
+        Stop the worker after the prime it is currently generating.
+        """
+        self._halt.set()
+        self.join(timeout)
+
+
+_default_pools = {}
+_default_lock = Lock()
+
+def default_pool() -> Optional[PrimePool]:
+    """
+    Pool at the path given by CRT_SS_PRIME_POOL, or None if it is not set.
+    """
+    path = os.environ.get(POOL_ENV)
+    if not path:
+        return None
+    with _default_lock:
+        if path not in _default_pools:
+            _default_pools[path] = PrimePool(path)
+        return _default_pools[path]
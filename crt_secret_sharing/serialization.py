@@ -0,0 +1,305 @@
+import os
+import struct
+from typing import BinaryIO, List, NamedTuple, Optional, Tuple
+from crt_secret_sharing.encoding import encode_int
+
+# Every record starts with MAGIC, the format version and the record kind
+MAGIC = b"CRSS"
+FORMAT_VERSION = 1
+
+KIND_SCHEME = 1
+KIND_PUBLIC = 2
+KIND_SHARE = 3
+KIND_SHARES = 4
+KIND_STORE = 5
+KIND_STREAM = 6
+KIND_HYBRID = 7
+KIND_REQUEST = 8
+KIND_RESPONSE = 9
+
+SCHEME_UNWEIGHTED = 0
+SCHEME_WEIGHTED = 1
+
+# Length prefix of integers and lists
+_LENGTH = struct.Struct(">I")
+
+class SchemeParameters(NamedTuple):
+    """
+    Public parameters of an unweighted or weighted CRT-SS setup.
+    """
+    scheme : int
+    p_lambda : int
+    p_0 : int
+    p_i : List[int]
+    t : int
+    T : int
+    weights : List[int]
+    c : int
+
+class PublicParameters(NamedTuple):
+    """
+    ElGamal group and public key.
+    """
+    p_0 : int
+    q : int
+    small_g : int
+    pk : int
+
+class Share(NamedTuple):
+    """
+    Share of a single shareholder together with its prime.
+    """
+    index : int
+    p_i : int
+    share : int
+
+
+class Writer:
+    """
+    Appends records to a bytearray.
+
+    Integers are written as a 4 byte big-endian length followed by their
+    canonical bytes from encode_int, lists as a 4 byte count followed by the integers.
+
+    Parameters
+    ----------
+        buffer : bytearray
+            Buffer to append to, a new one by default.
+    """
+    def __init__(self, buffer : Optional[bytearray] = None):
+        self.buffer = bytearray() if buffer is None else buffer
+
+    def header(self, kind : int):
+        self.buffer += MAGIC
+        self.buffer.append(FORMAT_VERSION)
+        self.buffer.append(kind)
+
+    def int(self, x : int):
+        data = encode_int(x)
+        self.buffer += len(data).to_bytes(4, 'big')
+        self.buffer += data
+
+    def ints(self, xs : List[int]):
+        buffer = self.buffer
+        buffer += len(xs).to_bytes(4, 'big')
+        for x in xs:
+            data = encode_int(x)
+            buffer += len(data).to_bytes(4, 'big')
+            buffer += data
+
+
+class Reader:
+    """
+    Reads records from a buffer through a memoryview, integers are decoded
+    straight from slices of the view.
+
+    Parameters
+    ----------
+        data : bytes | bytearray | memoryview
+            Buffer holding the records.
+    """
+    def __init__(self, data):
+        self.view = memoryview(data)
+        self.offset = 0
+
+    def _take(self, length : int) -> memoryview:
+        end = self.offset + length
+        if end > len(self.view):
+            raise ValueError("Truncated record.")
+        chunk = self.view[self.offset:end]
+        self.offset = end
+        return chunk
+
+    def header(self, kind : int):
+        if bytes(self._take(len(MAGIC))) != MAGIC:
+            raise ValueError("Not a serialized CRT-SS record.")
+        version, found = self._take(2)
+        if version != FORMAT_VERSION:
+            raise ValueError(f"Unsupported format version ({version}).")
+        if found != kind:
+            raise ValueError(f"Expected a record of kind ({kind}), found ({found}).")
+
+    def int(self) -> int:
+        length = int.from_bytes(self._take(4), 'big')
+        return int.from_bytes(self._take(length), 'big')
+
+    def ints(self) -> List[int]:
+        count = int.from_bytes(self._take(4), 'big')
+        # Inlined loop over the view, this is the hot path of bulk files
+        view, offset, size = self.view, self.offset, len(self.view)
+        from_bytes = int.from_bytes
+        xs = []
+        try:
+            for _ in range(count):
+                start = offset + 4
+                end = start + _LENGTH.unpack_from(view, offset)[0]
+                if end > size:
+                    raise ValueError("Truncated record.")
+                xs.append(from_bytes(view[start:end], 'big'))
+                offset = end
+        except struct.error as e:
+            raise ValueError("Truncated record.") from e
+        self.offset = offset
+        return xs
+
+    def end(self):
+        if self.offset != len(self.view):
+            raise ValueError(f"Trailing bytes after the record ({len(self.view) - self.offset}).")
+
+
+def dumps_parameters(params : SchemeParameters) -> bytearray:
+    """
+    Serialize the parameters of a setup.
+    """
+    writer = Writer()
+    writer.header(KIND_SCHEME)
+    for x in (params.scheme, params.p_lambda, params.p_0):
+        writer.int(x)
+    writer.ints(params.p_i)
+    for x in (params.t, params.T):
+        writer.int(x)
+    writer.ints(params.weights)
+    writer.int(params.c)
+    return writer.buffer
+
+def loads_parameters(data) -> SchemeParameters:
+    """
+    Parameters of a setup from the output of dumps_parameters.
+    """
+    reader = Reader(data)
+    reader.header(KIND_SCHEME)
+    scheme, p_lambda, p_0 = reader.int(), reader.int(), reader.int()
+    p_i = reader.ints()
+    t, T = reader.int(), reader.int()
+    weights = reader.ints()
+    c = reader.int()
+    reader.end()
+    return SchemeParameters(scheme, p_lambda, p_0, p_i, t, T, weights, c)
+
+def dumps_public(params : PublicParameters) -> bytearray:
+    """
+    Serialize the ElGamal group and public key.
+    """
+    writer = Writer()
+    writer.header(KIND_PUBLIC)
+    for x in params:
+        writer.int(x)
+    return writer.buffer
+
+def loads_public(data) -> PublicParameters:
+    """
+    ElGamal group and public key from the output of dumps_public.
+    """
+    reader = Reader(data)
+    reader.header(KIND_PUBLIC)
+    params = PublicParameters(*(reader.int() for _ in PublicParameters._fields))
+    reader.end()
+    return params
+
+def dumps_share(share : Share) -> bytearray:
+    """
+    Serialize the share of a single shareholder.
+    """
+    writer = Writer()
+    writer.header(KIND_SHARE)
+    for x in share:
+        writer.int(x)
+    return writer.buffer
+
+def loads_share(data) -> Share:
+    """
+    Share from the output of dumps_share.
+    """
+    reader = Reader(data)
+    reader.header(KIND_SHARE)
+    share = Share(*(reader.int() for _ in Share._fields))
+    reader.end()
+    return share
+
+def dumps_shares(columns : List[List[int]], p_i : List[int]) -> bytearray:
+    """
+    Serialize many shares, one column per shareholder as returned by share_distribution_batch.
+
+    Parameters
+    ----------
+        columns : List[List[int]]
+            For each shareholder the list of shares, one per secret.
+        p_i : List[int]
+            Prime of each shareholder.
+
+    Returns
+    -------
+        data : bytearray
+            Header, the primes and the columns.
+    """
+    if len(columns) != len(p_i):
+        raise ValueError(f"Amount of columns ({len(columns)}) does not match the primes ({len(p_i)}).")
+    writer = Writer()
+    writer.header(KIND_SHARES)
+    writer.ints(p_i)
+    for column in columns:
+        writer.ints(column)
+    return writer.buffer
+
+def loads_shares(data) -> Tuple[List[List[int]], List[int]]:
+    """
+    Columns of shares and primes from the output of dumps_shares.
+    """
+    reader = Reader(data)
+    reader.header(KIND_SHARES)
+    p_i = reader.ints()
+    columns = [reader.ints() for _ in p_i]
+    reader.end()
+    return columns, p_i
+
+def read_exact(stream : BinaryIO, size : int) -> bytearray:
+    """
+    Read size bytes from a stream, fewer only at the end of the stream.
+    """
+    data = bytearray()
+    while len(data) < size:
+        part = stream.read(size - len(data))
+        if not part:
+            break
+        data += part
+    return data
+
+def read_record(stream : BinaryIO, count : int) -> bytearray:
+    """
+    Read a record of count integers from a stream, without reading past it.
+
+    Parameters
+    ----------
+        stream : BinaryIO
+            Stream positioned at the start of the record.
+        count : int
+            Amount of integers in the record.
+
+    Returns
+    -------
+        record : bytearray
+            Bytes of the record, to be decoded with a Reader.
+    """
+    record = read_exact(stream, len(MAGIC) + 2)
+    for _ in range(count):
+        prefix = read_exact(stream, 4)
+        record += prefix
+        record += read_exact(stream, int.from_bytes(prefix, 'big'))
+    return record
+
+def write_shares(path : str, columns : List[List[int]], p_i : List[int]):
+    """
+    Store many shares in a file, see dumps_shares.
+    """
+    with open(path, "wb") as f:
+        f.write(dumps_shares(columns, p_i))
+
+def read_shares(path : str) -> Tuple[List[List[int]], List[int]]:
+    """
+    Load a file written by write_shares.
+    """
+    with open(path, "rb") as f:
+        # Read into a preallocated buffer, the reader decodes from views of it
+        data = bytearray(os.fstat(f.fileno()).st_size)
+        f.readinto(data)
+    return loads_shares(data)
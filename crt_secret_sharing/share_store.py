@@ -0,0 +1,212 @@
+import mmap
+from typing import List, Optional, Sequence
+from crt_secret_sharing.crt_ss import scheme_parameters, sample_masks, share_reconstruction
+from crt_secret_sharing.serialization import Writer, Reader, KIND_STORE
+from crt_secret_sharing.util_crt import PlanCache
+
+# The share region starts at a multiple of this
+ALIGNMENT = 64
+
+class ShareStore:
+    """
+    Memory-mapped file of the shares of many secrets under one parameter set.
+
+    After a header with p_0 and the primes, every shareholder has a column
+    of fixed-width slots, one per secret, as wide as the bytes of its prime.
+    The share of (secret_id, index) is at a computed offset, so a secret is
+    reconstructed from the slots of the authorized set only.
+
+    Use ShareStore.create to write a store and ShareStore.open to read one.
+    """
+    def __init__(self, path : str, writable : bool = False):
+        self.path = path
+        self._file = open(path, "r+b" if writable else "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_WRITE if writable else mmap.ACCESS_READ)
+        self._view = memoryview(self._map)
+
+        reader = Reader(self._view)
+        reader.header(KIND_STORE)
+        self.count = reader.int()
+        self.p_0 = reader.int()
+        self.p_i = reader.ints()
+        self.widths = [(p.bit_length() + 7) // 8 for p in self.p_i]
+        self.columns = []
+        start = -(-reader.offset // ALIGNMENT) * ALIGNMENT
+        for width in self.widths:
+            self.columns.append(start)
+            start += width * self.count
+        if start > len(self._map):
+            raise ValueError(f"Store ({path}) is truncated.")
+
+    @classmethod
+    def create(cls, path : str, p_0 : int, p_i : List[int], count : int) -> "ShareStore":
+        """
+        Create a store for count secrets with every slot zeroed.
+
+        Parameters
+        ----------
+            path : str
+                Path of the file.
+            p_0 : int
+                Order of field F.
+            p_i : List[int]
+                List of distinct coprime integers for each shareholder.
+            count : int
+                Amount of secrets.
+
+        Returns
+        -------
+            store : ShareStore
+                The writable store.
+        """
+        writer = Writer()
+        writer.header(KIND_STORE)
+        writer.int(count)
+        writer.int(p_0)
+        writer.ints(p_i)
+        header = writer.buffer
+        start = -(-len(header) // ALIGNMENT) * ALIGNMENT
+        size = start + count * sum((p.bit_length() + 7) // 8 for p in p_i)
+        with open(path, "wb") as f:
+            f.write(header)
+            f.truncate(size)
+        return cls(path, writable=True)
+
+    @classmethod
+    def open(cls, path : str) -> "ShareStore":
+        """
+        Open a store read-only.
+        """
+        return cls(path)
+
+    def _slot(self, secret_id : int, index : int) -> slice:
+        if not 0 <= secret_id < self.count:
+            raise IndexError(f"Secret ({secret_id}) is not in the store of ({self.count}) secrets.")
+        width = self.widths[index]
+        start = self.columns[index] + secret_id * width
+        return slice(start, start + width)
+
+    def share(self, secret_id : int, index : int) -> int:
+        """
+        Share of the shareholder index for the secret secret_id.
+        """
+        return int.from_bytes(self._view[self._slot(secret_id, index)], 'big')
+
+    def write(self, secret_id : int, shares : List[int]):
+        """
+        Store the shares of all shareholders for the secret secret_id.
+        """
+        if len(shares) != len(self.p_i):
+            raise ValueError(f"Amount of shares ({len(shares)}) does not match the shareholders ({len(self.p_i)}).")
+        for index, s_i in enumerate(shares):
+            slot = self._slot(secret_id, index)
+            self._view[slot] = s_i.to_bytes(self.widths[index], 'big')
+
+    def write_column(self, index : int, first : int, column : List[int]):
+        """
+        Store consecutive shares of one shareholder, starting at secret first.
+        """
+        if first < 0 or first + len(column) > self.count:
+            raise IndexError(f"Secrets ({first}) to ({first + len(column)}) are not in the store.")
+        width = self.widths[index]
+        start = self.columns[index] + first * width
+        self._view[start:start + width * len(column)] = b"".join(s.to_bytes(width, 'big') for s in column)
+
+    def reconstruct(self, secret_id : int, shareholders : Sequence[int], cache : Optional[PlanCache] = None) -> int:
+        """
+        Reconstruct a secret from the slots of an authorized set, see share_reconstruction.
+
+        Parameters
+        ----------
+            secret_id : int
+                Secret to reconstruct.
+            shareholders : Sequence[int]
+                Indices of the authorized set.
+            cache : Optional[PlanCache]
+                Optional cache of reconstruction plans.
+
+        Returns
+        -------
+            secret : int
+                The secret integer from Field F_p0.
+        """
+        shares_subset = [self.share(secret_id, i) for i in shareholders]
+        primes_subset = [self.p_i[i] for i in shareholders]
+        return share_reconstruction(self.p_0, primes_subset, shares_subset, cache)
+
+    def flush(self):
+        self._map.flush()
+
+    def close(self):
+        """
+        Unmap and close the file.
+        """
+        if self._map.closed:
+            return
+        self._view.release()
+        self._map.close()
+        self._file.close()
+
+    def __len__(self):
+        return self.count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def share_to_store(path : str,
+                   p_lambda: int,
+                   n : int,
+                   t : int,
+                   small_secrets : Sequence[int],
+                   p_0 : Optional[int],
+                   p_i : Optional[List[int]],
+                   cand_L : Optional[int],
+                   weighted: bool,
+                   chunksize : int = 4096) -> ShareStore:
+    """
+    Share a sequence of secrets into a store, see share_distribution_batch.
+
+    The secrets are lifted and reduced a chunk at a time, so only one chunk
+    of shares is held in memory.
+
+    Parameters
+    ----------
+        path : str
+            Path of the store.
+        p_lambda : int
+            Security parameter of bit length.
+        n : int
+            Number of shareholders.
+        t : int
+            Reconstruction threshold.
+        small_secrets : Sequence[int]
+            The secret integers from Field F_p0.
+        p_0 : Optional[int]
+            Optional argument for the order of field F.
+        p_i : Optional[List[int]]
+            Optional argument for List of distinct coprime integers for each shareholder.
+        cand_L : Optional[int]
+            Optional argument for The upper bound for masking.
+        weighted : bool
+            Flag for weighted.
+        chunksize : int
+            Amount of secrets shared at a time.
+
+    Returns
+    -------
+        store : ShareStore
+            The writable store holding the shares.
+    """
+    p_0, p_i, L = scheme_parameters(p_lambda, n, t, p_0, p_i, cand_L, weighted)
+    store = ShareStore.create(path, p_0, p_i, len(small_secrets))
+    for first in range(0, len(small_secrets), chunksize):
+        chunk = small_secrets[first:first + chunksize]
+        masks = sample_masks(L, len(chunk))
+        lifts = [small_s + p_0 * u_L for small_s, u_L in zip(chunk, masks)]
+        for index, p in enumerate(p_i):
+            store.write_column(index, first, [big_s % p for big_s in lifts])
+    store.flush()
+    return store
@@ -0,0 +1,171 @@
+from typing import BinaryIO, List, Optional, Sequence
+from crt_secret_sharing.crt_ss import scheme_parameters, sample_masks
+from crt_secret_sharing.serialization import Writer, Reader, KIND_STREAM, read_exact, read_record
+from crt_secret_sharing.util_crt import PlanCache, DEFAULT_PLAN_CACHE
+
+# The payload is padded with PADDING followed by zero bytes up to a whole element
+PADDING = b"\x80"
+
+def element_size(p_0 : int) -> int:
+    """
+    Bytes of payload packed into one element, every element is below p_0.
+    """
+    size = (p_0.bit_length() - 1) // 8
+    if size < 1:
+        raise ValueError(f"p_0 ({p_0}) is too small to hold a byte.")
+    return size
+
+def _read_header(stream : BinaryIO) -> tuple[int, int, int, int]:
+    # Header of a shareholder stream: index, p_0, prime and element size
+    reader = Reader(read_record(stream, 4))
+    reader.header(KIND_STREAM)
+    header = (reader.int(), reader.int(), reader.int(), reader.int())
+    reader.end()
+    return header
+
+def share_stream(source : BinaryIO,
+                 sinks : Sequence[BinaryIO],
+                 p_lambda: int,
+                 n : int,
+                 t : int,
+                 p_0 : Optional[int],
+                 p_i : Optional[List[int]],
+                 cand_L : Optional[int],
+                 weighted: bool,
+                 chunksize : int = 4096) -> tuple[int, List[int]]:
+    """
+    Share a byte stream, writing one output stream per shareholder.
+
+    The payload is packed into elements of F_p0 and every element is shared
+    with the same parameters, a chunk of elements at a time, so memory does
+    not grow with the size of the input. Every output stream holds a header
+    with the index of the shareholder, p_0, its prime and the element size,
+    followed by one fixed-width share per element.
+
+    Parameters
+    ----------
+        source : BinaryIO
+            Stream with the payload.
+        sinks : Sequence[BinaryIO]
+            Output stream of every shareholder.
+        p_lambda : int
+            Security parameter of bit length.
+        n : int
+            Number of shareholders.
+        t : int
+            Reconstruction threshold.
+        p_0 : Optional[int]
+            Optional argument for the order of field F.
+        p_i : Optional[List[int]]
+            Optional argument for List of distinct coprime integers for each shareholder.
+        cand_L : Optional[int]
+            Optional argument for The upper bound for masking.
+        weighted : bool
+            Flag for weighted.
+        chunksize : int
+            Amount of elements shared at a time.
+
+    Returns
+    -------
+        p_0 : int
+            Order of field F.
+        p_i : List[int]
+            List of distinct coprime integers for each shareholder.
+    """
+    if chunksize < 1:
+        raise ValueError(f"Chunk size ({chunksize}) has to be at least 1.")
+    p_0, p_i, L = scheme_parameters(p_lambda, n, t, p_0, p_i, cand_L, weighted)
+    if len(sinks) != len(p_i):
+        raise ValueError(f"Amount of output streams ({len(sinks)}) does not match the shareholders ({len(p_i)}).")
+    size = element_size(p_0)
+    widths = [(p.bit_length() + 7) // 8 for p in p_i]
+
+    for index, (sink, p) in enumerate(zip(sinks, p_i)):
+        writer = Writer()
+        writer.header(KIND_STREAM)
+        for x in (index, p_0, p, size):
+            writer.int(x)
+        sink.write(writer.buffer)
+
+    done = False
+    while not done:
+        data = read_exact(source, size * chunksize)
+        if len(data) < size * chunksize:
+            # Last chunk, pad up to a whole element
+            data += PADDING + bytes(-(len(data) + 1) % size)
+            done = True
+        elements = [int.from_bytes(data[k:k + size], 'big') for k in range(0, len(data), size)]
+        masks = sample_masks(L, len(elements))
+        lifts = [small_s + p_0 * u_L for small_s, u_L in zip(elements, masks)]
+        for sink, p, width in zip(sinks, p_i, widths):
+            sink.write(b"".join((big_s % p).to_bytes(width, 'big') for big_s in lifts))
+    return p_0, p_i
+
+def reconstruct_stream(sources : Sequence[BinaryIO],
+                       sink : BinaryIO,
+                       cache : Optional[PlanCache] = None,
+                       chunksize : int = 4096) -> int:
+    """
+    Reconstruct a payload shared by share_stream from the streams of an authorized set.
+
+    The streams are read a chunk of shares at a time and every element is
+    combined with one reconstruction plan, see share_reconstruction.
+
+    Parameters
+    ----------
+        sources : Sequence[BinaryIO]
+            Streams of the shareholders in the authorized set.
+        sink : BinaryIO
+            Stream the payload is written to.
+        cache : Optional[PlanCache]
+            Optional cache of reconstruction plans. Defaults to the shared cache.
+        chunksize : int
+            Amount of elements reconstructed at a time.
+
+    Returns
+    -------
+        length : int
+            Amount of payload bytes written.
+    """
+    if not sources:
+        raise ValueError("Streams of the authorized set can't be empty.")
+    headers = [_read_header(source) for source in sources]
+    p_0, size = headers[0][1], headers[0][3]
+    if any(h[1] != p_0 or h[3] != size for h in headers):
+        raise ValueError("The streams were not shared with the same parameters.")
+    primes = [h[2] for h in headers]
+    widths = [(p.bit_length() + 7) // 8 for p in primes]
+    plan = (DEFAULT_PLAN_CACHE if cache is None else cache).plan(primes)
+
+    length = 0
+    # The last element holds the padding, so it is written once the streams end
+    pending = b""
+    while True:
+        columns = []
+        for source, width in zip(sources, widths):
+            data = read_exact(source, width * chunksize)
+            if len(data) % width:
+                raise ValueError("Truncated shareholder stream.")
+            columns.append([int.from_bytes(data[k:k + width], 'big') for k in range(0, len(data), width)])
+        count = len(columns[0])
+        if any(len(column) != count for column in columns):
+            raise ValueError("The shareholder streams hold different amounts of shares.")
+        if not count:
+            break
+        sink.write(pending)
+        length += len(pending)
+        elements = [plan.combine(primes, row) % p_0 for row in zip(*columns)]
+        if max(elements).bit_length() > 8 * size:
+            raise ValueError("Reconstructed element out of range, the set is not authorized.")
+        data = b"".join(small_s.to_bytes(size, 'big') for small_s in elements)
+        pending = data[-size:]
+        sink.write(data[:-size])
+        length += len(data) - size
+        if count < chunksize:
+            break
+
+    last = pending.rstrip(b"\x00")
+    if not last.endswith(PADDING):
+        raise ValueError("Missing padding, the streams are truncated or the set is not authorized.")
+    sink.write(last[:-len(PADDING)])
+    return length + len(last) - len(PADDING)
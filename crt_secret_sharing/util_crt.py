@@ -1,3 +1,10 @@
+from math import prod
+from threading import Lock
+from collections import OrderedDict
+from functools import lru_cache
+from typing import List, Optional
+from crt_secret_sharing.backend import mpz, invert
+
 def gcd(a : int, b : int) -> int:
     """
     Greatest Common Divisor for two integers using Euclidean algorithm.
@@ -69,11 +76,433 @@ def modinv(a : int, m : int) -> int:
             Modular multiplicative inverse.
 
     """
-    # Find coefficients using extended_gcd
-    g, x, y = extended_gcd(a, m)
-    # coprime if gcd=1
-    if g != 1:
-        raise ValueError(f"Modular inverse does not exist for {a} mod {m}")
-    else:
-        return x % m
+    # Inverse by the arithmetic backend, it only exists if a and m are coprime
+    try:
+        return invert(a, m)
+    except ValueError:
+        raise ValueError(f"Modular inverse does not exist for {a} mod {m}") from None
+
+def batch_inverse(values : List[int], m : int) -> List[int]:
+    """
+    Inverses of many integers modulo the same m with Montgomery's trick.
+
+    The prefix products are inverted once, every inverse is then recovered 
+    with two multiplications, so k inverses cost one inversion and 3(k-1) 
+    modular multiplications.
+
+    Parameters
+    ----------
+        values : List[int]
+            Integers to invert.
+        m : int
+            Modulo.
+
+    Returns
+    -------
+        inverses : List[int]
+            values[i]^(-1) mod m for every i.
+    """
+    if not values:
+        return []
+    prefix = [values[0] % m]
+    for a in values[1:]:
+        prefix.append(prefix[-1] * a % m)
+    try:
+        inv = invert(prefix[-1], m)
+    except ValueError:
+        # Report the first value that is not invertible
+        for a in values:
+            modinv(a, m)
+        raise
+    inverses = [0] * len(values)
+    for i in range(len(values) - 1, 0, -1):
+        inverses[i] = inv * prefix[i - 1] % m
+        inv = inv * values[i] % m
+    inverses[0] = inv
+    return inverses
+
+def batch_modinv(values : List[int], moduli : List[int]) -> List[int]:
+    """
+    Inverses of values[i] modulo moduli[i] for distinct moduli.
+
+    The inversions run back to back in the backend, which reduces every
+    value by its modulus first.
+
+    Parameters
+    ----------
+        values : List[int]
+            Integers to invert.
+        moduli : List[int]
+            Modulo of every integer.
+
+    Returns
+    -------
+        inverses : List[int]
+            values[i]^(-1) mod moduli[i] for every i.
+    """
+    if len(values) != len(moduli):
+        raise ValueError(f"Amount of values ({len(values)}) does not match the moduli ({len(moduli)}).")
+    inverses = []
+    for a, m in zip(values, moduli):
+        try:
+            inverses.append(invert(a, m))
+        except ValueError:
+            raise ValueError(f"Modular inverse does not exist for {a} mod {m}") from None
+    return inverses
+
+
+# --- Fast CRT ---
+
+# Methods for CRT reconstruction
+CRT_METHODS = ("naive", "tree", "garner")
+
+# Amount of moduli from which the product tree is used by default
+FAST_CRT_THRESHOLD = 32
+
+def product_tree(moduli : List[int]) -> List[List[int]]:
+    """
+    Subproduct tree of the moduli.
+
+    The nodes are integers of the arithmetic backend, see backend.mpz.
+
+    Parameters
+    ----------
+        moduli : List[int]
+            Leaves of the tree.
+
+    Returns
+    -------
+        tree : List[List[int]]
+            Levels of the tree from the leaves up to the root [prod(moduli)].
+    """
+    tree = [[mpz(m) for m in moduli]]
+    while len(tree[-1]) > 1:
+        level = tree[-1]
+        tree.append([level[k] * level[k + 1] if k + 1 < len(level) else level[k]
+                     for k in range(0, len(level), 2)])
+    return tree
+
+@lru_cache(maxsize=32)
+def cached_product_tree(moduli : tuple) -> List[List[int]]:
+    """
+    Product tree of the moduli, built once per parameter set.
+
+    Parameters
+    ----------
+        moduli : tuple
+            Leaves of the tree.
+
+    Returns
+    -------
+        tree : List[List[int]]
+            Levels of the tree from the leaves up to the root [prod(moduli)].
+    """
+    return product_tree(moduli)
+
+def remainder_tree(x : int, tree : List[List[int]]) -> List[int]:
+    """
+    Reduces x modulo every leaf by walking down the product tree.
+
+    Parameters
+    ----------
+        x : int
+            Integer to reduce.
+        tree : List[List[int]]
+            Product tree of the moduli.
+
+    Returns
+    -------
+        remainders : List[int]
+            x mod m for every leaf m.
+    """
+    remainders = [mpz(x) % tree[-1][0]]
+    for level in reversed(tree[:-1]):
+        remainders = [remainders[k // 2] % m for k, m in enumerate(level)]
+    return [int(r) for r in remainders]
+
+def crt_inverses(tree : List[List[int]]) -> List[int]:
+    """
+    Inverses of Q_i = P / m_i modulo m_i for all leaves at once.
+
+    P mod m_i^2 = m_i * (Q_i mod m_i) is found by reducing P down the tree 
+    of squared products, so no division of P by each modulus is needed.
+
+    Parameters
+    ----------
+        tree : List[List[int]]
+            Product tree of the moduli.
+
+    Returns
+    -------
+        inverses : List[int]
+            Q_i^(-1) mod m_i for every leaf m_i.
+    """
+    P = tree[-1][0]
+    remainders = [P]
+    for level in reversed(tree[:-1]):
+        remainders = [remainders[k // 2] % (m * m) for k, m in enumerate(level)]
+    return batch_modinv([int(r // m) for r, m in zip(remainders, tree[0])], [int(m) for m in tree[0]])
+
+def crt_tree(residues : List[int], tree : List[List[int]], inverses : List[int]) -> int:
+    """
+    CRT reconstruction by combining up the product tree.
+
+    Every node holds sum c_i * (N / m_i) over its leaves, with c_i = r_i * Q_i^(-1) mod m_i,
+    which is computed from its children as left * N_right + right * N_left.
+
+    Parameters
+    ----------
+        residues : List[int]
+            Residues in the order of the leaves.
+        tree : List[List[int]]
+            Product tree of the moduli.
+        inverses : List[int]
+            Output of crt_inverses for the tree.
+
+    Returns
+    -------
+        x : int
+            The unique integer modulo P with the given residues.
+    """
+    values = [r * inv % m for r, inv, m in zip(residues, inverses, tree[0])]
+    for level in tree[:-1]:
+        values = [values[k] * level[k + 1] + values[k + 1] * level[k] if k + 1 < len(level) else values[k]
+                  for k in range(0, len(level), 2)]
+    return int(values[0] % tree[-1][0])
+
+def garner_constants(moduli : List[int]) -> List[List[int]]:
+    """
+    Constants m_j^(-1) mod m_i for j < i used by Garner's algorithm.
+
+    Parameters
+    ----------
+        moduli : List[int]
+            Pairwise coprime moduli.
+
+    Returns
+    -------
+        constants : List[List[int]]
+            Row i holds the inverses of m_0, ..., m_(i-1) modulo m_i.
+    """
+    return [batch_inverse(moduli[:i], m_i) for i, m_i in enumerate(moduli)]
+
+def crt_garner(residues : List[int], moduli : List[int], constants : List[List[int]]) -> int:
+    """
+    CRT reconstruction with Garner's mixed-radix algorithm.
+
+    The mixed-radix digits only use arithmetic modulo each m_i, the full size 
+    integer is built once at the end with Horner's rule.
+
+    Parameters
+    ----------
+        residues : List[int]
+            Residues in the order of the moduli.
+        moduli : List[int]
+            Pairwise coprime moduli.
+        constants : List[List[int]]
+            Output of garner_constants for the moduli.
+
+    Returns
+    -------
+        x : int
+            The unique integer modulo P with the given residues.
+    """
+    digits = []
+    for r_i, m_i, row in zip(residues, moduli, constants):
+        u = r_i % m_i
+        for v_j, c_ji in zip(digits, row):
+            u = (u - v_j) * c_ji % m_i
+        digits.append(u)
+    x = mpz(0)
+    for v_i, m_i in zip(reversed(digits), reversed(moduli)):
+        x = x * m_i + v_i
+    return int(x)
+
+def crt(residues : List[int], moduli : List[int], method : Optional[str] = None) -> int:
+    """
+    Chinese Remainder Theorem for pairwise coprime moduli.
+
+    Parameters
+    ----------
+        residues : List[int]
+            Residues in the order of the moduli.
+        moduli : List[int]
+            Pairwise coprime moduli.
+        method : Optional[str]
+            'naive', 'tree' or 'garner'. Chosen by the amount of moduli if None.
+
+    Returns
+    -------
+        x : int
+            The unique integer modulo prod(moduli) with the given residues.
+    """
+    return ReconstructionPlan(moduli, method).combine(moduli, residues)
+
+# --- Reconstruction plans ---
+
+class ReconstructionPlan:
+    """
+    CRT basis coefficients for a fixed set of primes.
+
+    The coefficients lambda_i = Q_i * Q_i^(-1) mod P only depend on the primes
+    in the authorized set, so they are computed once and a reconstruction is a 
+    single multiply-accumulate followed by one reduction modulo P.
+
+    Large sets use the quasi-linear product tree (or Garner's algorithm) instead, 
+    since the multiply-accumulate against full size coefficients is quadratic.
+
+    Parameters
+    ----------
+        primes : List[int]
+            Distinct primes of the authorized set.
+        method : Optional[str]
+            'naive', 'tree' or 'garner'. If None the tree is used from 
+            FAST_CRT_THRESHOLD primes and up.
+    """
+    def __init__(self, primes, method : Optional[str] = None):
+        self.primes = frozenset(primes)
+        if len(self.primes) != len(primes):
+            raise ValueError("The primes of a reconstruction plan have to be distinct.")
+        if method is None:
+            method = "tree" if len(primes) >= FAST_CRT_THRESHOLD else "naive"
+        if method not in CRT_METHODS:
+            raise ValueError(f"Unknown CRT method ({method}), expected one of {CRT_METHODS}.")
+        self.method = method
+        self.order = list(primes)
+        self.index = {p_i: k for k, p_i in enumerate(primes)}
+        self.coeffs = {}
+
+        if method == "tree":
+            self.tree = product_tree(primes)
+            self.P = int(self.tree[-1][0])
+            self.inverses = crt_inverses(self.tree)
+        elif method == "garner":
+            self.P = prod(primes)
+            self.constants = garner_constants(self.order)
+        else:
+            self.P = prod(primes)                      # Product of primes in the subset
+            Q = [self.P // p_i for p_i in primes]      # Q = Prod_(j neq i) P_j
+            inverses = batch_modinv(Q, primes)         # Inverses of Q modulo p_i, all at once
+            for p_i, Q_i, inv_Q_i in zip(primes, Q, inverses):
+                self.coeffs[p_i] = (Q_i * inv_Q_i) % self.P
+
+    def _lagrange(self, p_i : int) -> int:
+        Q_i = self.P // p_i                            # Q = Prod_(j neq i) P_j
+        if self.method == "tree":
+            inv_Q_i = self.inverses[self.index[p_i]]
+        else:
+            try:
+                inv_Q_i = modinv(Q_i, p_i)             # Inverse of Q modulo p_i
+            except ValueError as e:
+                raise ValueError(f"Failed modinv({Q_i}, {p_i}): {e}") from e
+        return (Q_i * inv_Q_i) % self.P
+
+    def coefficient(self, p_i : int) -> int:
+        """
+        Lagrange coefficient lambda_i for the prime p_i.
+        """
+        if p_i not in self.index:
+            raise ValueError(f"The prime ({p_i}) is not part of the plan.")
+        if p_i not in self.coeffs:
+            self.coeffs[p_i] = self._lagrange(p_i)
+        return self.coeffs[p_i]
+
+    def combine(self, p_subset, shares_subset) -> int:
+        """
+        Combine the shares into the unique integer modulo P.
+
+        Parameters
+        ----------
+            p_subset : List[int]
+                Primes of the shareholders, in the same order as the shares.
+            shares_subset : List[int]
+                Shares of the shareholders.
+
+        Returns
+        -------
+            S : int
+                The integer congruent to every share modulo its prime.
+        """
+        if self.method == "naive":
+            coeffs = self.coeffs
+            return sum(s_i * coeffs[p_i] for s_i, p_i in zip(shares_subset, p_subset)) % self.P
+
+        # Residues in the order of the plan
+        residues = [0] * len(self.order)
+        for s_i, p_i in zip(shares_subset, p_subset):
+            residues[self.index[p_i]] = s_i
+        if self.method == "tree":
+            return crt_tree(residues, self.tree, self.inverses)
+        return crt_garner(residues, self.order, self.constants)
+
+
+class PlanCache:
+    """
+    Bounded LRU cache of reconstruction plans keyed on the frozen prime subset.
+
+    Parameters
+    ----------
+        maxsize : int
+            Maximum amount of plans kept before the least recently used is evicted.
+        method : Optional[str]
+            CRT method of the plans, see ReconstructionPlan.
+    """
+    def __init__(self, maxsize : int = 64, method : Optional[str] = None):
+        if maxsize < 1:
+            raise ValueError(f"Cache size ({maxsize}) has to be at least 1.")
+        self.maxsize = maxsize
+        self.method = method
+        self.hits = 0
+        self.misses = 0
+        self._plans = OrderedDict()
+        self._lock = Lock()
+
+    def plan(self, primes) -> ReconstructionPlan:
+        """
+        Get the plan for the primes, building it on a miss.
+
+        Parameters
+        ----------
+            primes : List[int]
+                Primes of the authorized set.
+
+        Returns
+        -------
+            plan : ReconstructionPlan
+                Plan for the given primes.
+        """
+        key = frozenset(primes)
+        with self._lock:
+            plan = self._plans.get(key)
+            if plan is not None:
+                self._plans.move_to_end(key)
+                self.hits += 1
+                return plan
+            self.misses += 1
+
+        plan = ReconstructionPlan(list(primes), self.method)
+        with self._lock:
+            self._plans[key] = plan
+            self._plans.move_to_end(key)
+            while len(self._plans) > self.maxsize:
+                self._plans.popitem(last=False)
+        return plan
+
+    def clear(self):
+        """
+        Remove all plans and reset the counters.
+        """
+        with self._lock:
+            self._plans.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self):
+        return len(self._plans)
+
+    def __contains__(self, primes):
+        return frozenset(primes) in self._plans
+
 
+# Shared cache used by share_reconstruction when no cache is given
+DEFAULT_PLAN_CACHE = PlanCache()
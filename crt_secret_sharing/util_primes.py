@@ -1,46 +1,215 @@
 from math import ceil
-from sympy import prevprime
 from secrets import SystemRandom
-from Crypto.Util.number import getPrime, isPrime
-from crt_secret_sharing.util_crt import gcd
+from multiprocessing import get_context
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from Crypto.Util.number import getPrime
+from crt_secret_sharing.backend import is_prime
+from Crypto.Math.Primality import miller_rabin_test, test_probable_prime, COMPOSITE
 
 def pairwise_coprime(primes):
-    if not all(isPrime(p) for p in primes):
+    if not all(is_prime(p) for p in primes):
         raise ValueError("Given integer is not prime.")
     return len(primes) == len(set(primes))
 
 def primes_within_bitlength(primes, p_lambda):
     return all(p.bit_length() <= p_lambda for p in primes)
 
-def generate_party_primes(n, p_0, p_lambda):
+def bits_bucket(p_lambda):
+    return ("bits", p_lambda)
+
+def interval_bucket(w, num_p):
+    return ("weighted", w, num_p)
+
+def interval_bounds(w, num_p):
+    upper_bound = 2 ** w
+    try:
+        lower_bound = ceil(upper_bound * num_p // (num_p + 1))
+    except OverflowError:
+        raise ValueError("Constant c is way too big causing overflow error. " \
+        "Gap between the thresholds needs to be wider")
+    return lower_bound, upper_bound
+
+def small_primes(limit):
+    sieve = bytearray([1]) * limit
+    sieve[0:2] = b"\x00\x00"
+    for r in range(2, int(limit ** 0.5) + 1):
+        if sieve[r]:
+            sieve[r * r::r] = bytes(len(range(r * r, limit, r)))
+    return [r for r in range(limit) if sieve[r]]
+
+# Small primes for sieving windows of candidates
+SIEVE_BOUND = 1 << 14
+SMALL_PRIMES = small_primes(SIEVE_BOUND)
+
+def _probable_prime(candidate):
+    if candidate.bit_length() < 512:
+        return is_prime(candidate)
+    return test_probable_prime(candidate) != COMPOSITE
+
+def prev_prime(x, lower_bound=2):
+    # Largest prime below x and not below lower_bound, None if there is none
+
+    # Windows above the small primes are sieved by them, the survivors
+    # are rejected by a single Miller-Rabin round before the full test
+    width = 4 * x.bit_length()
+    end = x
+    while end > max(lower_bound, SIEVE_BOUND):
+        start = max(end - width, lower_bound, SIEVE_BOUND)
+        sieve = bytearray([1]) * (end - start)
+        for r in SMALL_PRIMES:
+            offset = (-start) % r
+            sieve[offset::r] = bytes(len(range(offset, end - start, r)))
+        idx = len(sieve)
+        while True:
+            idx = sieve.rfind(1, 0, idx)
+            if idx < 0:
+                break
+            candidate = start + idx
+            if miller_rabin_test(candidate, 1) != COMPOSITE and _probable_prime(candidate):
+                return candidate
+        end = start
+
+    # Small candidates are tested directly
+    for candidate in range(end - 1, max(lower_bound, 2) - 1, -1):
+        if is_prime(candidate):
+            return candidate
+    return None
+
+def safe_prime_window(start, width, stop=None):
+    # Sieve q and 2q+1 jointly: q = 0 or q = (r-1)/2 mod r makes one of them divisible by r
+    sieve = bytearray([1]) * width
+    for r in SMALL_PRIMES:
+        for residue in {0, (r - 1) // 2}:
+            offset = (residue - start) % r
+            sieve[offset::r] = bytes(len(range(offset, width, r)))
+    attempts = 0
+    idx = sieve.find(1)
+    while idx >= 0 and not (stop is not None and stop.is_set()):
+        q = start + idx
+        p = 2 * q + 1
+        attempts += 1
+        if (miller_rabin_test(q, 1) != COMPOSITE and miller_rabin_test(p, 1) != COMPOSITE
+                and _probable_prime(q) and _probable_prime(p)):
+            return q, attempts
+        idx = sieve.find(1, idx + 1)
+    return None, attempts
+
+def search_safe_prime(p_lambda, stop=None):
+    # Prime q of p_lambda bits with 2q+1 prime, and the amount of candidates tested
+    attempts = 0
+    if p_lambda < 2 * SIEVE_BOUND.bit_length():
+        while not (stop is not None and stop.is_set()):
+            q = getPrime(p_lambda)
+            attempts += 1
+            if is_prime(2 * q + 1):
+                return q, attempts
+        return None, attempts
+
+    cryptogen = SystemRandom()
+    width = 16 * p_lambda
+    while not (stop is not None and stop.is_set()):
+        start = cryptogen.randrange(2 ** (p_lambda - 1), 2 ** p_lambda - width)
+        q, tested = safe_prime_window(start, width, stop)
+        attempts += tested
+        if q is not None:
+            return q, attempts
+    return None, attempts
+
+_stop_event = None
+
+def _init_safe_prime_worker(stop):
+    global _stop_event
+    _stop_event = stop
+
+def _safe_prime_task(p_lambda):
+    return search_safe_prime(p_lambda, _stop_event)
+
+def generate_safe_prime(p_lambda, workers=1):
+    if workers <= 1:
+        return search_safe_prime(p_lambda)
+
+    # The first worker to find a safe prime stops the others
+    context = get_context()
+    stop = context.Event()
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                             initializer=_init_safe_prime_worker, initargs=(stop,)) as executor:
+        futures = [executor.submit(_safe_prime_task, p_lambda) for _ in range(workers)]
+        q = None
+        attempts = 0
+        for future in as_completed(futures):
+            found, tested = future.result()
+            attempts += tested
+            if found is not None and q is None:
+                q = found
+                stop.set()
+    return q, attempts
+
+def weighted_prime(lower_bound, upper_bound, cryptogen):
+    while True:
+        random_cand = cryptogen.randrange(lower_bound, upper_bound)
+        candidate = prev_prime(random_cand, lower_bound)
+        if candidate is not None:
+            return candidate
+
+def generate_bucket_prime(bucket):
+    if bucket[0] == "bits":
+        return getPrime(bucket[1])
+    if bucket[0] == "weighted":
+        return weighted_prime(*interval_bounds(bucket[1], bucket[2]), SystemRandom())
+    raise ValueError(f"Unknown bucket ({bucket}).")
+
+def generate_party_primes(n, p_0, p_lambda, pool=None):
     primes = set()
+    if pool is not None:
+        primes.update(p for p in pool.take(bits_bucket(p_lambda), n) if p != p_0)
     while len(primes) < n:
         prime = getPrime(p_lambda)
         if prime != p_0 and prime not in primes:
             primes.add(prime)
     return sorted(primes)
 
-def generate_weighted_party_primes(p_0, weights):
+def _interval_prime(bounds):
+    return weighted_prime(bounds[0], bounds[1], SystemRandom())
+
+def search_interval_primes(intervals, workers=1):
+    if workers <= 1 or len(intervals) < 2:
+        cryptogen = SystemRandom()
+        return [weighted_prime(lower_bound, upper_bound, cryptogen) for lower_bound, upper_bound in intervals]
+    # Every interval is searched by its own process
+    with ProcessPoolExecutor(max_workers=min(workers, len(intervals))) as executor:
+        return list(executor.map(_interval_prime, intervals))
+
+def generate_weighted_party_primes(p_0, weights, pool=None, workers=1):
     num_p = len(weights)
     p_i = [0] * num_p
     generated_primes = {p_0}
-    cryptogen = SystemRandom()
+    bounds = {w: interval_bounds(w, num_p) for w in set(weights)}
 
-    for i, w in enumerate(weights):
-        upper_bound = 2 ** w
-        try:
-            lower_bound = ceil(upper_bound * num_p // (num_p + 1))
-        except OverflowError:
-            raise ValueError("Constant c is way too big causing overflow error. " \
-            "Gap between the thresholds needs to be wider")
-        while True:
-            random_cand = cryptogen.randrange(lower_bound, upper_bound)
-            candidate = prevprime(random_cand)
-            if isPrime(candidate) and all(gcd(candidate, p) == 1 for p in generated_primes):
-                if candidate >= lower_bound:
-                    p_i[i] = candidate
-                    generated_primes.add(candidate)
-                    break
+    # Primes from the pool, drawn once per interval
+    pooled = {}
+    if pool is not None:
+        for w in bounds:
+            pooled[w] = pool.take(interval_bucket(w, num_p), weights.count(w))
+
+    pending = list(range(num_p))
+    while pending:
+        candidates = {}
+        for i in pending:
+            if pooled.get(weights[i]):
+                candidates[i] = pooled[weights[i]].pop()
+        live = [i for i in pending if i not in candidates]
+        candidates.update(zip(live, search_interval_primes([bounds[weights[i]] for i in live], workers)))
+
+        # Distinct primes are coprime, parties whose candidate collides search again
+        retry = []
+        for i in pending:
+            candidate = candidates[i]
+            if candidate not in generated_primes:
+                p_i[i] = candidate
+                generated_primes.add(candidate)
+            else:
+                retry.append(i)
+        pending = retry
     if 0 in p_i:
         raise ValueError(f"Failed to generate unique primes")
     return p_i
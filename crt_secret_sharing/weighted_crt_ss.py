@@ -1,9 +1,14 @@
+import logging
 from math import ceil
 from typing import List, Optional
-from Crypto.Util.number import getPrime, isPrime
-from crt_secret_sharing.util_primes import generate_weighted_party_primes
-from crt_secret_sharing.crt_ss import share_distribution, share_reconstruction
-from crt_secret_sharing.bcolors import bcolors as bc
+from Crypto.Util.number import getPrime
+from crt_secret_sharing.backend import is_prime
+from crt_secret_sharing.util_primes import generate_weighted_party_primes, interval_bucket
+from crt_secret_sharing.prime_pool import PrimePool, default_pool
+from crt_secret_sharing.crt_ss import share_distribution, share_distribution_batch, share_reconstruction, ShareAccumulator
+from crt_secret_sharing.bcolors import color_logging
+
+logger = logging.getLogger(__name__)
 
 # --- Efficient WRSS ---
 
@@ -37,18 +42,42 @@ def efficient_scaling(T : int, t : int, weights : List[int], p_lambda : int):
     return scaled_T, scaled_t, scaled_weights, c
     
 
+def weighted_buckets(T : int, t : int, weights : List[int], p_lambda : int):
+    """
+    Prime pool buckets and the amount of primes one setup draws from each.
+
+    Parameters
+    ----------
+        T : int 
+            Reconstruction threshold.
+        t : int 
+            Privacy threshold.
+        weights : List[int]
+            Weights for the shareholders.
+        p_lambda : int
+            Security parameter of bit length.
+
+    Returns
+    -------
+        buckets : dict
+            Amount of primes per bucket.
+    """
+    _, _, scaled_weights, _ = efficient_scaling(T, t, weights, p_lambda)
+    return {interval_bucket(w, len(weights)): scaled_weights.count(w) for w in set(scaled_weights)}
+
 # --- Weighted CRT-SS Setup ---
 
-def weighted_setup(p_lambda: int, 
-                       n : int,
-                       T : int,
-                       t : int,
-                       weights: List[int],
-                       small_s: int,
-                       p_0 : Optional[int],
-                       ):
+def weighted_parameters(p_lambda: int, 
+                        n : int,
+                        T : int,
+                        t : int,
+                        weights: List[int],
+                        p_0 : Optional[int],
+                        pool : Optional[PrimePool] = None,
+                        workers : int = 1,
+                        ) -> tuple[int, List[int], int, int, int]:
     """
-    Setup for WRSS using CRT-based Secret Sharing.
+    Setup of the parameters for WRSS using CRT-based Secret Sharing.
 
     Parameters
     ----------
@@ -62,20 +91,23 @@ def weighted_setup(p_lambda: int,
             Privacy threshold.
         weights : List[int]
             Weights for the shareholders.
-        small_s : int 
-            The secret integer from Field F_p0.
         p_0 : Optional[int]
             Optional argument for the order of field F.
+        pool : Optional[PrimePool]
+            Optional pool to draw the party primes from. Defaults to the pool 
+            given by CRT_SS_PRIME_POOL, primes are generated if it runs empty.
+        workers : int
+            Amount of processes searching for the party primes concurrently.
     Returns
     -------
-        big_s : int 
-            Lifting of the secret(s) known as Lift(s).
-        s_i : List[int]
-            List(s_i) of the shareholder's secret.
         p_0 : int
             Order of field F.
         p_i : List[int]
             List of distinct coprime integers for each shareholder.
+        L : int
+            The upper bound for masking.
+        T : int
+            Scaled reconstruction threshold.
         c : int
             c constant.
 
@@ -90,30 +122,141 @@ def weighted_setup(p_lambda: int,
     
     # Corollary 1 for Efficient WRSS
     T, t, weights, c = efficient_scaling(T, t, weights, p_lambda)
-    print(bc.OKGREEN + f"The constant c is {c}." + bc.ENDC)
+    logger.info("The constant c is %s.", c)
 
     # Recommended bit length
     if not p_lambda >= 128:
-        print(bc.WARNING + f"Bit-length is recommended to be at least 128." + bc.ENDC)
-    print(bc.OKGREEN + f"Security parameter is ({p_lambda}) bit length." + bc.ENDC)
+        logger.warning("Bit-length is recommended to be at least 128.")
+    logger.info("Security parameter is (%s) bit length.", p_lambda)
     
     # Validation of order
     if p_0 is None:
         p_0 = getPrime(p_lambda)
-    elif not isPrime(p_0):
+    elif not is_prime(p_0):
         raise ValueError(f"p_0 ({p_0}) has to be a prime.")
-    print(bc.OKGREEN + f"Order of the field ({p_0})." + bc.ENDC)
+    logger.info("Order of the field (%s).", p_0)
 
     # Generate party primes with weights
-    p_i = generate_weighted_party_primes(p_0, weights)
+    if pool is None:
+        pool = default_pool()
+    p_i = generate_weighted_party_primes(p_0, weights, pool, workers)
 
     # Theorem 6 (p. 13)
     L = (2 ** (t + p_lambda))
 
+    return p_0, p_i, L, T, c
+
+def weighted_setup(p_lambda: int, 
+                       n : int,
+                       T : int,
+                       t : int,
+                       weights: List[int],
+                       small_s: int,
+                       p_0 : Optional[int],
+                       reduction : str = "direct",
+                       pool : Optional[PrimePool] = None,
+                       workers : int = 1,
+                       ):
+    """
+    Setup for WRSS using CRT-based Secret Sharing.
+
+    Parameters
+    ----------
+        p_lambda : int
+            Security parameter of bit length.
+        n : int
+            Number of shareholders.
+        T : int
+            Reconstruction threshold.
+        t : int 
+            Privacy threshold.
+        weights : List[int]
+            Weights for the shareholders.
+        small_s : int 
+            The secret integer from Field F_p0.
+        p_0 : Optional[int]
+            Optional argument for the order of field F.
+        reduction : str
+            'direct' or 'tree' reduction of Lift(s), see share_distribution.
+        pool : Optional[PrimePool]
+            Optional pool to draw the party primes from, see weighted_parameters.
+        workers : int
+            Amount of processes searching for the party primes concurrently.
+    Returns
+    -------
+        big_s : int 
+            Lifting of the secret(s) known as Lift(s).
+        s_i : List[int]
+            List(s_i) of the shareholder's secret.
+        p_0 : int
+            Order of field F.
+        p_i : List[int]
+            List of distinct coprime integers for each shareholder.
+        c : int
+            c constant.
+
+    """
+    # Validated parameters with scaled thresholds
+    p_0, p_i, L, T, c = weighted_parameters(p_lambda, n, T, t, weights, p_0, pool, workers)
+
     # Make share distribtution from crt_ss
-    big_s, shares, p_0, p_i = share_distribution(p_lambda, n, T, small_s, p_0, p_i, L, True)
+    big_s, shares, p_0, p_i = share_distribution(p_lambda, n, T, small_s, p_0, p_i, L, True, reduction)
     return big_s, shares, p_0, p_i, c
 
+def weighted_setup_batch(p_lambda: int, 
+                         n : int,
+                         T : int,
+                         t : int,
+                         weights: List[int],
+                         small_secrets: List[int],
+                         p_0 : Optional[int],
+                         reduction : str = "direct",
+                         pool : Optional[PrimePool] = None,
+                         workers : int = 1,
+                         ):
+    """
+    Setup for WRSS sharing a sequence of secrets under one set of parameters.
+
+    Parameters
+    ----------
+        p_lambda : int
+            Security parameter of bit length.
+        n : int
+            Number of shareholders.
+        T : int
+            Reconstruction threshold.
+        t : int 
+            Privacy threshold.
+        weights : List[int]
+            Weights for the shareholders.
+        small_secrets : List[int] 
+            The secret integers from Field F_p0.
+        p_0 : Optional[int]
+            Optional argument for the order of field F.
+        reduction : str
+            'direct' or 'tree' reduction of Lift(s), see share_distribution.
+        pool : Optional[PrimePool]
+            Optional pool to draw the party primes from, see weighted_parameters.
+        workers : int
+            Amount of processes searching for the party primes concurrently.
+    Returns
+    -------
+        columns : List[List[int]]
+            For each shareholder the list of shares, one per secret.
+        p_0 : int
+            Order of field F.
+        p_i : List[int]
+            List of distinct coprime integers for each shareholder.
+        c : int
+            c constant.
+
+    """
+    p_0, p_i, L, T, c = weighted_parameters(p_lambda, n, T, t, weights, p_0, pool, workers)
+
+    # Make batch share distribtution from crt_ss
+    columns, p_0, p_i = share_distribution_batch(p_lambda, n, T, small_secrets, p_0, p_i, L, True, reduction)
+    return columns, p_0, p_i, c
+
 # --- Main ---
 
 if __name__ == "__main__":
@@ -126,6 +269,7 @@ if __name__ == "__main__":
 
     It will reconstruct successfully given Authorized set A
     """
+    color_logging()
     n = 5
     T = 25
     t = 15
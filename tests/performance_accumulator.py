@@ -0,0 +1,70 @@
+import csv
+import random
+from time import perf_counter
+from crt_secret_sharing.weighted_crt_ss import weighted_setup, share_reconstruction, ShareAccumulator
+from crt_secret_sharing.util_crt import PlanCache
+
+def export_efficiency_to_csv(results, filename):
+    with open(filename, mode='w', newline='') as csvfile:
+        fieldnames = ['shareholders', 'cold_batch_latency', 'warm_batch_latency', 'last_step_latency', 'accumulated_runtime']
+        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+
+        writer.writeheader()
+        for row in results:
+            writer.writerow(row)
+
+def test_of_accumulator(shareholder_counts, rounds):
+    result = []
+    p_lambda = 256
+    secret = 420420
+
+    for n in shareholder_counts:
+        weights = [50 + i for i in range(1, n + 1)]
+        # Every shareholder is needed, the threshold is met by the last share
+        T = sum(weights)
+        _, shares, p_0, p_i, _ = weighted_setup(p_lambda, n, T, T // 3, weights, secret, None)
+
+        cold = warm = last = accumulated = 0
+        cache = PlanCache()
+        for _ in range(rounds):
+            # Shares arrive in a random order
+            order = random.sample(range(n), n)
+            primes_subset = [p_i[i] for i in order]
+            shares_subset = [shares[i] for i in order]
+
+            # Batch reconstruction starts when the last share arrived
+            start = perf_counter()
+            assert(share_reconstruction(p_0, primes_subset, shares_subset, PlanCache()) == secret)
+            cold += perf_counter() - start
+            share_reconstruction(p_0, primes_subset, shares_subset, cache)
+            start = perf_counter()
+            assert(share_reconstruction(p_0, primes_subset, shares_subset, cache) == secret)
+            warm += perf_counter() - start
+
+            accumulator = ShareAccumulator(p_0, T)
+            start = perf_counter()
+            for i in order[:-1]:
+                accumulator.add(p_i[i], shares[i], weights[i])
+            start_last = perf_counter()
+            assert(accumulator.add(p_i[order[-1]], shares[order[-1]], weights[order[-1]]))
+            assert(accumulator.finalize() == secret)
+            end = perf_counter()
+            last += end - start_last
+            accumulated += end - start
+
+        result.append({
+            'shareholders' : n,
+            'cold_batch_latency' : cold / rounds,
+            'warm_batch_latency' : warm / rounds,
+            'last_step_latency' : last / rounds,
+            'accumulated_runtime' : accumulated / rounds,
+        })
+    return result
+
+if __name__ == "__main__":
+    results = test_of_accumulator([10, 50, 100, 200, 400], 20)
+    export_efficiency_to_csv(results, "performance_accumulator.csv")
+    for r in results:
+        print(f"n={r['shareholders']:>3}: batch {r['cold_batch_latency'] * 1e3:.3f}ms cold, "
+              f"{r['warm_batch_latency'] * 1e3:.3f}ms cached, last step {r['last_step_latency'] * 1e3:.3f}ms "
+              f"(all steps {r['accumulated_runtime'] * 1e3:.3f}ms)")
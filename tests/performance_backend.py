@@ -0,0 +1,80 @@
+import csv
+import random
+from time import time
+from crt_secret_sharing.backend import available_backends, set_backend, get_backend
+from crt_secret_sharing.crt_ss import scheme_parameters, reduce_shares, share_reconstruction
+from crt_secret_sharing.el_gamal_encryption import keygen, encrypt, decrypt, DecryptionSession
+from crt_secret_sharing.weighted_crt_ss import weighted_setup
+from crt_secret_sharing.util_crt import PlanCache
+
+def export_efficiency_to_csv(results, filename):
+    with open(filename, mode='w', newline='') as csvfile:
+        fieldnames = ['backend', 'p_lambda', 'shareholders', 'setup_runtime', 'share_runtime',
+                      'recon_runtime', 'threshold_runtime']
+        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+
+        writer.writeheader()
+        for row in results:
+            writer.writerow(row)
+
+def print_matrix(results):
+    print(f"{'backend':>8} {'bits':>5} {'n':>5} {'setup (s)':>10} {'share (s)':>10} {'recon (s)':>10} {'decrypt (s)':>12}")
+    for r in results:
+        print(f"{r['backend']:>8} {r['p_lambda']:>5} {r['shareholders']:>5} {r['setup_runtime']:>10.5f} "
+              f"{r['share_runtime']:>10.6f} {r['recon_runtime']:>10.6f} {r['threshold_runtime']:>12.5f}")
+
+def test_of_backends(bit_lengths, sizes, rounds):
+    result = []
+    for p_lambda in bit_lengths:
+        p_0, q, small_g, small_s, pk = keygen(p_lambda)
+        for n in sizes:
+            t = n // 2 + 1
+            weights = [50 + i for i in range(1, n + 1)]
+            _, shares, q, p_i, _ = weighted_setup(p_lambda, n, 150, 50, weights, small_s, q)
+            ciphertext, _ = encrypt(420420, pk, small_g, p_0, q)
+            c2, seed, c1, h_k = ciphertext
+            shareholders = set(range(n))
+
+            for backend in available_backends():
+                set_backend(backend)
+
+                start_setup = time()
+                p_0_ss, p_i_ss, L = scheme_parameters(p_lambda, n, t, None, None, None, False)
+                end_setup = time() - start_setup
+
+                secrets = [random.randrange(p_0_ss) for _ in range(rounds)]
+                lifts = [s + p_0_ss * random.randrange(L) for s in secrets]
+                start_share = time()
+                rows = [reduce_shares(big_s, p_i_ss, "tree") for big_s in lifts]
+                end_share = (time() - start_share) / rounds
+
+                start_recon = time()
+                for secret, row in zip(secrets, rows):
+                    # Fresh plans, so every reconstruction pays for its coefficients
+                    assert(share_reconstruction(p_0_ss, p_i_ss[:t], row[:t], PlanCache()) == secret)
+                end_recon = (time() - start_recon) / rounds
+
+                start_threshold = time()
+                session = DecryptionSession(shareholders, p_i, q, p_0)
+                partial_decryptions = {i: session.partial_decrypt(i, shares[i], c1) for i in shareholders}
+                k_constructed = session.reconstruct(partial_decryptions, c1, h_k)
+                assert(decrypt(c2, k_constructed, seed) == 420420)
+                end_threshold = time() - start_threshold
+
+                result.append({
+                    'backend' : backend,
+                    'p_lambda' : p_lambda,
+                    'shareholders' : n,
+                    'setup_runtime' : end_setup,
+                    'share_runtime' : end_share,
+                    'recon_runtime' : end_recon,
+                    'threshold_runtime' : end_threshold,
+                })
+    return result
+
+if __name__ == "__main__":
+    previous = get_backend()
+    results = test_of_backends([128, 256, 512], [10, 50, 100], 50)
+    set_backend(previous)
+    export_efficiency_to_csv(results, "performance_backend.csv")
+    print_matrix(results)
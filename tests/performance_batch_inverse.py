@@ -0,0 +1,72 @@
+import csv
+from math import prod
+from time import time
+from Crypto.Util.number import getPrime
+from crt_secret_sharing.backend import get_backend
+from crt_secret_sharing.util_crt import extended_gcd, modinv, batch_inverse, batch_modinv, crt_inverses, product_tree
+
+def export_efficiency_to_csv(results, filename):
+    with open(filename, mode='w', newline='') as csvfile:
+        fieldnames = ['backend', 'prime_bits', 'moduli', 'method', 'inversions_per_second']
+        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+
+        writer.writeheader()
+        for row in results:
+            writer.writerow(row)
+
+def euclid_modinv(a, m):
+    # The extended Euclid loop modinv was built on
+    g, x, _ = extended_gcd(a, m)
+    if g != 1:
+        raise ValueError(f"Modular inverse does not exist for {a} mod {m}")
+    return x % m
+
+def timed(run, rounds):
+    start = time()
+    for _ in range(rounds):
+        run()
+    return (time() - start) / rounds
+
+def test_of_batch_inverse(bits, sizes, rounds):
+    result = []
+    for n in sizes:
+        moduli = list({getPrime(bits) for _ in range(n)})
+        P = prod(moduli)
+        # Q_i = P / p_i as in the coefficients of a reconstruction plan
+        Q = [P // m for m in moduli]
+        expected = [pow(Q_i, -1, m) for Q_i, m in zip(Q, moduli)]
+
+        assert([euclid_modinv(Q_i, m) for Q_i, m in zip(Q, moduli)] == expected)
+        assert(batch_modinv(Q, moduli) == expected)
+        assert(crt_inverses(product_tree(moduli)) == expected)
+        runtimes = {
+            'euclid loop' : timed(lambda: [euclid_modinv(Q_i, m) for Q_i, m in zip(Q, moduli)], rounds),
+            'modinv loop' : timed(lambda: [modinv(Q_i, m) for Q_i, m in zip(Q, moduli)], rounds),
+            'batch_modinv' : timed(lambda: batch_modinv(Q, moduli), rounds),
+            # Q_i mod p_i from the tree of squared products, then batch_modinv
+            'crt_inverses' : timed(lambda: crt_inverses(product_tree(moduli)), rounds),
+        }
+
+        # Many inverses modulo one prime, as in a row of Garner's constants
+        m = moduli[-1]
+        row = moduli[:-1]
+        assert(batch_inverse(row, m) == [modinv(m_j, m) for m_j in row])
+        runtimes['modinv row'] = timed(lambda: [modinv(m_j, m) for m_j in row], rounds)
+        runtimes['batch_inverse row'] = timed(lambda: batch_inverse(row, m), rounds)
+
+        for method, runtime in runtimes.items():
+            count = len(row) if method.endswith('row') else len(moduli)
+            result.append({
+                'backend' : get_backend(),
+                'prime_bits' : bits,
+                'moduli' : n,
+                'method' : method,
+                'inversions_per_second' : count / runtime if runtime else float('inf'),
+            })
+    return result
+
+if __name__ == "__main__":
+    results = test_of_batch_inverse(256, [10, 100, 1000], 5)
+    export_efficiency_to_csv(results, f"performance_batch_inverse_{get_backend()}.csv")
+    for r in results:
+        print(f"{r['moduli']:>5} {r['method']:>18} {r['inversions_per_second']:>14.0f} inversions/s")
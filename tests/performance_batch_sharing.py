@@ -0,0 +1,78 @@
+import csv
+import matplotlib.pyplot as plt
+from time import time
+from crt_secret_sharing.crt_ss import share_distribution, share_distribution_batch
+from crt_secret_sharing.weighted_crt_ss import weighted_setup, weighted_setup_batch
+
+def export_efficiency_to_csv(results, filename):
+    with open(filename, mode='w', newline='') as csvfile:
+        fieldnames = ['secrets', 'loop_throughput', 'batch_throughput', 
+                      'weighted_loop_throughput', 'weighted_batch_throughput']
+        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+
+        writer.writeheader()
+        for row in results:
+            writer.writerow(row)
+
+def plot_efficiency(results):
+    amount = [r['secrets'] for r in results]
+    plt.figure(figsize=(12, 6))
+    plt.plot(amount, [r['loop_throughput'] for r in results], marker='o', label='share_distribution loop')
+    plt.plot(amount, [r['batch_throughput'] for r in results], marker='s', label='share_distribution_batch')
+    plt.plot(amount, [r['weighted_loop_throughput'] for r in results], marker='^', label='weighted_setup loop')
+    plt.plot(amount, [r['weighted_batch_throughput'] for r in results], marker='x', label='weighted_setup_batch')
+    plt.title("Throughput of Sharing vs Number of Secrets")
+    plt.xlabel("Number of Secrets")
+    plt.ylabel("Secrets per second")
+    plt.xscale('log')
+    plt.yscale('log')
+    plt.legend()
+    plt.grid(True)
+    plt.tight_layout()
+    plt.show()
+
+def test_of_batch_sharing(amounts, p_lambda, n, t):
+    result = []
+    weights = [10 + i for i in range(n)]
+    T = sum(weights) // 2
+    t_weighted = T // 2
+    for amount in amounts:
+        small_secrets = list(range(amount))
+
+        # Current per-call loop with fixed primes
+        _, _, p_0, p_i = share_distribution(p_lambda, n, t, 0, None, None, None, False)
+        start_loop = time()
+        for small_s in small_secrets:
+            share_distribution(p_lambda, n, t, small_s, p_0, p_i, None, False)
+        end_loop = time() - start_loop
+
+        start_batch = time()
+        share_distribution_batch(p_lambda, n, t, small_secrets, p_0, p_i, None, False)
+        end_batch = time() - start_batch
+
+        # Weighted setup regenerates the weighted primes each call
+        start_weighted_loop = time()
+        for small_s in small_secrets:
+            weighted_setup(p_lambda, n, T, t_weighted, weights, small_s, p_0)
+        end_weighted_loop = time() - start_weighted_loop
+
+        start_weighted_batch = time()
+        weighted_setup_batch(p_lambda, n, T, t_weighted, weights, small_secrets, p_0)
+        end_weighted_batch = time() - start_weighted_batch
+
+        result.append({
+            'secrets' : amount,
+            'loop_throughput' : amount / end_loop,
+            'batch_throughput' : amount / end_batch,
+            'weighted_loop_throughput' : amount / end_weighted_loop,
+            'weighted_batch_throughput' : amount / end_weighted_batch,
+        })
+    return result
+
+if __name__ == "__main__":
+    p_lambda = 256
+    n = 10
+    t = 5
+    results = test_of_batch_sharing([10, 100, 1000], p_lambda, n, t)
+    export_efficiency_to_csv(results, f"performance_batch_sharing_{n}shareholders_{p_lambda}bits.csv")
+    plot_efficiency(results)
@@ -0,0 +1,97 @@
+import csv
+import random
+import asyncio
+from time import perf_counter
+from statistics import quantiles
+from crt_secret_sharing.el_gamal_encryption import keygen, encrypt, decrypt
+from crt_secret_sharing.weighted_crt_ss import weighted_setup
+from crt_secret_sharing.combiner import ShareholderServer, Combiner
+
+def export_efficiency_to_csv(results, filename):
+    with open(filename, mode='w', newline='') as csvfile:
+        fieldnames = ['shareholders', 'slow_shareholders', 'concurrency', 'ciphertexts', 'throughput',
+                      'p50_latency', 'p99_latency', 'failures', 'errors']
+        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+
+        writer.writeheader()
+        for row in results:
+            writer.writerow(row)
+
+def network_delay(mean, slow_probability, slow_delay):
+    # Exponential latency, sometimes a request stalls
+    def delay():
+        if random.random() < slow_probability:
+            return slow_delay
+        return random.expovariate(1 / mean)
+    return delay
+
+async def load_test(n, slow, concurrency, ciphertexts, timeout):
+    p_lambda = 256
+    weights = [50 + i for i in range(1, n + 1)]
+    T = sum(sorted(weights)[:n // 2])
+    p_0, q, small_g, small_s, pk = keygen(p_lambda)
+    _, shares, q, p_i, _ = weighted_setup(p_lambda, n, T, T // 3, weights, small_s, q)
+
+    # The shareholders are served from the same event loop as the combiner
+    servers = []
+    endpoints = {}
+    for i in range(n):
+        # The first shareholders straggle often, the others answer after a few milliseconds
+        delay = network_delay(0.005, 0.2 if i < slow else 0.01, 2 * timeout)
+        # The simulated shareholders trust the combiner with their overflow hints
+        server = ShareholderServer(i, shares[i], weights, T, p_i, q, p_0, delay, allow_hints=True)
+        servers.append(server)
+        endpoints[i] = await server.start()
+
+    messages = [random.getrandbits(64) for _ in range(ciphertexts)]
+    encrypted = [encrypt(m, pk, small_g, p_0, q)[0] for m in messages]
+    times = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async with Combiner(endpoints, weights, T, p_i, q, p_0, timeout=timeout, retries=4, hints=True) as combiner:
+        async def timed(ciphertext):
+            async with semaphore:
+                start = perf_counter()
+                try:
+                    reconstruction = await combiner.reconstruct(ciphertext[2], ciphertext[3], ciphertext.version)
+                except TimeoutError:
+                    # The combiner and the simulated shareholders share one CPU, an overloaded run times out
+                    return None
+                times.append(perf_counter() - start)
+                return reconstruction
+
+        start = perf_counter()
+        reconstructions = await asyncio.gather(*(timed(c) for c in encrypted))
+        runtime = perf_counter() - start
+        failures = combiner.failures
+
+    for server in servers:
+        await server.stop()
+    for m, ciphertext, reconstruction in zip(messages, encrypted, reconstructions):
+        if reconstruction is not None:
+            assert(decrypt(ciphertext[0], reconstruction, ciphertext[1]) == m)
+
+    cuts = quantiles(times, n=100)
+    return {
+        'shareholders' : n,
+        'slow_shareholders' : slow,
+        'concurrency' : concurrency,
+        'ciphertexts' : ciphertexts,
+        'throughput' : len(times) / runtime,
+        'p50_latency' : cuts[49],
+        'p99_latency' : cuts[98],
+        'failures' : failures,
+        'errors' : reconstructions.count(None),
+    }
+
+def test_of_combiner(settings, ciphertexts, timeout):
+    return [asyncio.run(load_test(n, slow, concurrency, ciphertexts, timeout)) for n, slow, concurrency in settings]
+
+if __name__ == "__main__":
+    settings = [(10, 0, 1), (10, 0, 16), (10, 0, 64), (10, 3, 16), (30, 0, 1), (30, 0, 16), (30, 10, 16)]
+    results = test_of_combiner(settings, 1000, 0.5)
+    export_efficiency_to_csv(results, "performance_combiner.csv")
+    for r in results:
+        print(f"n={r['shareholders']:>3} slow={r['slow_shareholders']:>3} concurrency={r['concurrency']:>4}: "
+              f"{r['throughput']:.0f} ciphertexts/s, p50 {r['p50_latency'] * 1e3:.1f}ms, "
+              f"p99 {r['p99_latency'] * 1e3:.1f}ms, failures {r['failures']}, errors {r['errors']}")
@@ -0,0 +1,70 @@
+import csv
+from time import time
+from crt_secret_sharing.el_gamal_encryption import keygen, encrypt_batch, decrypt, decrypt_batch, partial_decrypt, reconstruct, DecryptionSession
+from crt_secret_sharing.weighted_crt_ss import weighted_setup
+
+def export_efficiency_to_csv(results, filename):
+    with open(filename, mode='w', newline='') as csvfile:
+        fieldnames = ['shareholders', 'ciphertexts', 'single_per_s', 'session_per_s', 'batch_per_s', 'batch_checks']
+        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+
+        writer.writeheader()
+        for row in results:
+            writer.writerow(row)
+
+def test_of_decrypt_batch(backlogs, n, single_limit):
+    result = []
+    p_lambda = 256
+    weights = [50 + i for i in range(1, n + 1)]
+    p_0, q, small_g, small_s, pk = keygen(p_lambda)
+    _, shares, q, p_i, _ = weighted_setup(p_lambda, n, 150, 50, weights, small_s, q)
+    shareholders = set(range(n))
+
+    for count in backlogs:
+        plaintexts = list(range(count))
+        ciphertexts = [ciphertext for ciphertext, _ in encrypt_batch(plaintexts, pk, small_g, p_0, q)]
+        # The per-ciphertext paths are timed on a prefix of large backlogs
+        sample = ciphertexts[:single_limit]
+
+        # Coefficients, exponents and the overflow scan for every ciphertext
+        start_single = time()
+        for m, (c2, seed, c1, h_k) in enumerate(sample):
+            partial_decryptions = {i: partial_decrypt(i, shares[i], c1, p_0, shareholders, p_i, q) for i in shareholders}
+            assert(decrypt(c2, reconstruct(partial_decryptions, c1, h_k, p_0, shareholders, p_i, q), seed) == m)
+        end_single = time() - start_single
+
+        # One session, one ciphertext at a time
+        session = DecryptionSession(shareholders, p_i, q, p_0)
+        hints = {i: session.overflow_hint(i, shares[i]) for i in shareholders}
+        start_session = time()
+        for m, (c2, seed, c1, h_k) in enumerate(sample):
+            partial_decryptions = {i: session.partial_decrypt(i, shares[i], c1) for i in shareholders}
+            assert(decrypt(c2, session.reconstruct(partial_decryptions, c1, h_k, hints), seed) == m)
+        end_session = time() - start_session
+
+        start_batch = time()
+        session = DecryptionSession(shareholders, p_i, q, p_0)
+        hints = {i: session.overflow_hint(i, shares[i]) for i in shareholders}
+        c1s = [ciphertext[2] for ciphertext in ciphertexts]
+        partial_decryptions = {i: session.partial_decrypt_batch(i, shares[i], c1s) for i in shareholders}
+        reconstructions = session.reconstruct_batch(partial_decryptions, ciphertexts, hints)
+        decrypted = decrypt_batch(ciphertexts, reconstructions)
+        end_batch = time() - start_batch
+        assert(decrypted == plaintexts)
+
+        result.append({
+            'shareholders' : n,
+            'ciphertexts' : count,
+            'single_per_s' : len(sample) / end_single,
+            'session_per_s' : len(sample) / end_session,
+            'batch_per_s' : count / end_batch,
+            'batch_checks' : session.checks,
+        })
+    return result
+
+if __name__ == "__main__":
+    results = test_of_decrypt_batch([1000, 10000, 100000], 10, 1000)
+    export_efficiency_to_csv(results, "performance_decrypt_batch.csv")
+    for r in results:
+        print(f"{r['ciphertexts']:>6} ciphertexts: single {r['single_per_s']:.0f}/s, session {r['session_per_s']:.0f}/s, "
+              f"batch {r['batch_per_s']:.0f}/s ({r['batch_checks']} checks)")
@@ -0,0 +1,70 @@
+import sys
+import csv
+import logging
+import secrets
+from math import prod
+from time import time
+from crt_secret_sharing.el_gamal_encryption import universal_hashing, randomness_extractor, LEGACY_VERSION, CIPHERTEXT_VERSION
+from Crypto.Util.number import getPrime
+
+def export_efficiency_to_csv(results, filename):
+    with open(filename, mode='w', newline='') as csvfile:
+        fieldnames = ['bits', 'operation', 'before_runtime', 'after_runtime']
+        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+
+        writer.writeheader()
+        for row in results:
+            writer.writerow(row)
+
+def test_of_hashing(bits, rounds):
+    result = []
+    x = getPrime(bits)
+    for operation, run in (('hash', lambda version: universal_hashing(x, version)),
+                           ('extract', lambda version: randomness_extractor(1, x, version))):
+        runtimes = {}
+        for version in (LEGACY_VERSION, CIPHERTEXT_VERSION):
+            start = time()
+            for _ in range(rounds):
+                run(version)
+            runtimes[version] = (time() - start) / rounds
+        result.append({
+            'bits' : bits,
+            'operation' : operation,
+            'before_runtime' : runtimes[LEGACY_VERSION],
+            'after_runtime' : runtimes[CIPHERTEXT_VERSION],
+        })
+    return result
+
+def test_of_logging(bits, n, rounds):
+    logger = logging.getLogger("crt_secret_sharing.crt_ss")
+    # The integers share_distribution reports for n shareholders of the given bits
+    p_i = [secrets.randbits(bits) | 1 for _ in range(n)]
+    L = prod(p_i[:n // 2]) // secrets.randbits(bits)
+    big_s = secrets.randbits(bits) * L
+    s_i = [big_s % p for p in p_i]
+
+    # Decimal conversion of every integer, as the diagnostic prints did.
+    # Past 4300 digits it raises unless the limit of int to str conversion is lifted
+    limit = sys.get_int_max_str_digits()
+    sys.set_int_max_str_digits(0)
+    start = time()
+    for _ in range(rounds):
+        for x in (p_i, L, big_s, s_i):
+            f"{x}"
+    end_formatted = (time() - start) / rounds
+    sys.set_int_max_str_digits(limit)
+
+    # Silent default, the arguments are never formatted
+    start = time()
+    for _ in range(rounds):
+        for x in (p_i, L, big_s, s_i):
+            logger.info("%s", x)
+    end_silent = (time() - start) / rounds
+    return [{'bits' : bits, 'operation' : 'share_distribution_diagnostics', 'before_runtime' : end_formatted, 'after_runtime' : end_silent}]
+
+if __name__ == "__main__":
+    bits = 4096
+    results = test_of_hashing(bits, rounds=200) + test_of_logging(bits, n=10, rounds=20)
+    for row in results:
+        print(f"{row['operation']}: before {row['before_runtime'] * 1000:.3f}ms, after {row['after_runtime'] * 1000:.3f}ms")
+    export_efficiency_to_csv(results, f"performance_encoding_{bits}bits.csv")
@@ -0,0 +1,56 @@
+import csv
+import secrets
+from time import perf_counter, sleep
+from statistics import quantiles
+from crt_secret_sharing.el_gamal_encryption import keygen, encrypt, PublicKey
+from crt_secret_sharing.encryption_pool import EncryptionPool
+
+def export_efficiency_to_csv(results, filename):
+    with open(filename, mode='w', newline='') as csvfile:
+        fieldnames = ['bits', 'mode', 'p50_latency', 'p99_latency', 'pool_misses']
+        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+
+        writer.writeheader()
+        for row in results:
+            writer.writerow(row)
+
+def latencies(encrypt_one, messages, gap):
+    times = []
+    for m in messages:
+        start = perf_counter()
+        encrypt_one(m)
+        times.append(perf_counter() - start)
+        # Time between requests of the ingest path, used by the worker to refill
+        sleep(gap)
+    cuts = quantiles(times, n=100)
+    return cuts[49], cuts[98]
+
+def test_of_encryption_pool(groups, rounds, gap):
+    result = []
+    for group in groups:
+        p_0, q, small_g, _, pk = keygen(group)
+        public_key = PublicKey(pk, small_g, p_0, q)
+        public_key.tables()
+        messages = [secrets.randbits(256) for _ in range(rounds)]
+
+        modes = {
+            'encrypt' : lambda m: encrypt(m, pk, small_g, p_0, q),
+            'encrypt_tables' : lambda m: encrypt(m, public_key, small_g, p_0, q),
+        }
+        for mode, encrypt_one in modes.items():
+            p50, p99 = latencies(encrypt_one, messages, gap)
+            result.append({'bits' : p_0.bit_length(), 'mode' : mode, 'p50_latency' : p50, 'p99_latency' : p99, 'pool_misses' : 0})
+
+        with EncryptionPool(public_key, small_g, p_0, q, size=64) as pool:
+            pool.fill()
+            p50, p99 = latencies(pool.encrypt, messages, gap)
+        result.append({'bits' : p_0.bit_length(), 'mode' : 'pool', 'p50_latency' : p50, 'p99_latency' : p99, 'pool_misses' : pool.misses})
+
+        for row in result[-3:]:
+            print(f"{row['bits']} bits, {row['mode']}: p50 {row['p50_latency'] * 1e6:.1f}us, p99 {row['p99_latency'] * 1e6:.1f}us")
+    return result
+
+if __name__ == "__main__":
+    groups = [256, 1024, "modp2048"]
+    results = test_of_encryption_pool(groups, rounds=200, gap=0.02)
+    export_efficiency_to_csv(results, "performance_encryption_pool.csv")
@@ -0,0 +1,80 @@
+import csv
+import random
+import matplotlib.pyplot as plt
+from math import prod
+from time import time
+from Crypto.Util.number import getPrime
+from crt_secret_sharing.util_crt import CRT_METHODS, ReconstructionPlan
+
+def export_efficiency_to_csv(results, filename):
+    with open(filename, mode='w', newline='') as csvfile:
+        fieldnames = ['prime_bits', 'shareholders', 'method', 'cold_runtime', 'warm_runtime']
+        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+
+        writer.writeheader()
+        for row in results:
+            writer.writerow(row)
+
+def print_crossover(results):
+    print(f"{'bits':>6} {'n':>5} {'fastest cold':>14} {'fastest warm':>14}")
+    keys = sorted({(r['prime_bits'], r['shareholders']) for r in results})
+    for bits, n in keys:
+        rows = [r for r in results if r['prime_bits'] == bits and r['shareholders'] == n]
+        cold = min(rows, key=lambda r: r['cold_runtime'])['method']
+        warm = min(rows, key=lambda r: r['warm_runtime'])['method']
+        print(f"{bits:>6} {n:>5} {cold:>14} {warm:>14}")
+
+def plot_efficiency(results):
+    fig, axes = plt.subplots(1, 2, figsize=(12, 6))
+    for bits in sorted({r['prime_bits'] for r in results}):
+        for method in CRT_METHODS:
+            rows = [r for r in results if r['prime_bits'] == bits and r['method'] == method]
+            n = [r['shareholders'] for r in rows]
+            axes[0].plot(n, [r['cold_runtime'] for r in rows], marker='o', label=f'{method} {bits} bits')
+            axes[1].plot(n, [r['warm_runtime'] for r in rows], marker='o', label=f'{method} {bits} bits')
+    axes[0].set_title("Plan + Reconstruction (cold)")
+    axes[1].set_title("Reconstruction (warm)")
+    for ax in axes:
+        ax.set_xlabel("Number of Shareholders in Authorized Set")
+        ax.set_ylabel("Time (s)")
+        ax.set_xscale('log')
+        ax.set_yscale('log')
+        ax.grid(True)
+        ax.legend()
+    plt.tight_layout()
+    plt.show()
+
+def test_of_fast_crt(bit_lengths, sizes, rounds):
+    result = []
+    for bits in bit_lengths:
+        for n in sizes:
+            primes = list({getPrime(bits) for _ in range(n)})
+            x = random.randrange(prod(primes))
+            shares = [x % p for p in primes]
+            for method in CRT_METHODS:
+                start_cold = time()
+                plan = ReconstructionPlan(primes, method)
+                assert(plan.combine(primes, shares) == x)
+                end_cold = time() - start_cold
+
+                start_warm = time()
+                for _ in range(rounds):
+                    plan.combine(primes, shares)
+                end_warm = (time() - start_warm) / rounds
+
+                result.append({
+                    'prime_bits' : bits,
+                    'shareholders' : n,
+                    'method' : method,
+                    'cold_runtime' : end_cold,
+                    'warm_runtime' : end_warm,
+                })
+    return result
+
+if __name__ == "__main__":
+    bit_lengths = [256, 1024, 4096]
+    sizes = [4, 8, 16, 32, 64, 128]
+    results = test_of_fast_crt(bit_lengths, sizes, rounds=5)
+    export_efficiency_to_csv(results, "performance_fast_crt_crossover.csv")
+    print_crossover(results)
+    plot_efficiency(results)
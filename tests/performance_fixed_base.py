@@ -0,0 +1,52 @@
+import csv
+import secrets
+from time import time
+from crt_secret_sharing.el_gamal_encryption import keygen, encrypt, PublicKey
+
+def export_efficiency_to_csv(results, filename):
+    with open(filename, mode='w', newline='') as csvfile:
+        fieldnames = ['bits', 'rounds', 'pow_runtime', 'table_build_runtime', 'table_runtime', 'table_bytes', 'speedup']
+        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+
+        writer.writeheader()
+        for row in results:
+            writer.writerow(row)
+
+def test_of_fixed_base(groups, rounds):
+    result = []
+    for group in groups:
+        p_0, q, small_g, _, pk = keygen(group)
+        messages = [secrets.randbits(256) for _ in range(rounds)]
+
+        start_pow = time()
+        for m in messages:
+            encrypt(m, pk, small_g, p_0, q)
+        end_pow = (time() - start_pow) / rounds
+
+        public_key = PublicKey(pk, small_g, p_0, q)
+        start_build = time()
+        public_key.tables()
+        end_build = time() - start_build
+
+        start_table = time()
+        for m in messages:
+            encrypt(m, public_key, small_g, p_0, q)
+        end_table = (time() - start_table) / rounds
+
+        result.append({
+            'bits' : p_0.bit_length(),
+            'rounds' : rounds,
+            'pow_runtime' : end_pow,
+            'table_build_runtime' : end_build,
+            'table_runtime' : end_table,
+            'table_bytes' : public_key.size(),
+            'speedup' : end_pow / end_table,
+        })
+        print(f"{p_0.bit_length()} bits: pow {end_pow * 1000:.3f}ms, table {end_table * 1000:.3f}ms per encryption")
+    return result
+
+if __name__ == "__main__":
+    # Sampled 256 and 1024 bit groups next to the registry group of 2048 bits
+    groups = [256, 1024, "modp2048"]
+    results = test_of_fixed_base(groups, rounds=200)
+    export_efficiency_to_csv(results, "performance_fixed_base.csv")
@@ -0,0 +1,34 @@
+import csv
+from time import time
+from crt_secret_sharing.el_gamal_encryption import keygen
+
+def export_efficiency_to_csv(results, filename):
+    with open(filename, mode='w', newline='') as csvfile:
+        fieldnames = ['group', 'bits', 'keygen_runtime']
+        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+
+        writer.writeheader()
+        for row in results:
+            writer.writerow(row)
+
+def test_of_groups(groups, rounds):
+    result = []
+    for group in groups:
+        start_keygen = time()
+        for _ in range(rounds):
+            p_0, _, _, _, _ = keygen(group)
+        end_keygen = (time() - start_keygen) / rounds
+
+        result.append({
+            'group' : group,
+            'bits' : p_0.bit_length(),
+            'keygen_runtime' : end_keygen,
+        })
+        print(f"{group}: {end_keygen:.4f}s per keygen")
+    return result
+
+if __name__ == "__main__":
+    # Sampled groups by bit length next to the registry groups
+    groups = [256, 1024, "modp1536", "modp2048", "ffdhe3072", "modp4096"]
+    results = test_of_groups(groups, rounds=5)
+    export_efficiency_to_csv(results, "performance_groups.csv")
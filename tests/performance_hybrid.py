@@ -0,0 +1,100 @@
+import os
+import csv
+import tempfile
+from time import time
+from crt_secret_sharing.el_gamal_encryption import keygen, encrypt, decrypt, DecryptionSession
+from crt_secret_sharing.weighted_crt_ss import weighted_setup
+from crt_secret_sharing.hybrid import encrypt_stream, decrypt_stream, read_header, CIPHER_AES_GCM, CIPHER_CHACHA20_POLY1305
+
+CIPHERS = {'aes-gcm' : CIPHER_AES_GCM, 'chacha20-poly1305' : CIPHER_CHACHA20_POLY1305}
+
+class NullSink:
+    # Output stream that only counts the bytes written to it
+    def __init__(self):
+        self.written = 0
+
+    def write(self, data):
+        self.written += len(data)
+
+class MemorySource:
+    # Input stream over bytes without copying them
+    def __init__(self, data):
+        self.view = memoryview(data)
+        self.offset = 0
+
+    def read(self, size):
+        chunk = self.view[self.offset:self.offset + size]
+        self.offset += len(chunk)
+        return chunk
+
+def export_efficiency_to_csv(results, filename):
+    with open(filename, mode='w', newline='') as csvfile:
+        fieldnames = ['cipher', 'payload_mb', 'encrypt_mb_per_s', 'decrypt_mb_per_s', 'threshold_operations',
+                      'threshold_runtime', 'legacy_threshold_operations', 'legacy_runtime_estimate']
+        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+
+        writer.writeheader()
+        for row in results:
+            writer.writerow(row)
+
+def threshold_decryption(session, shares, c1, h_k, version):
+    partial_decryptions = {i: session.partial_decrypt(i, shares[i], c1) for i in session.shareholders}
+    return session.reconstruct(partial_decryptions, c1, h_k, version=version)
+
+def test_of_hybrid(sizes_mb, n):
+    result = []
+    p_lambda = 256
+    weights = [50 + i for i in range(1, n + 1)]
+    p_0, q, small_g, small_s, pk = keygen(p_lambda)
+    _, shares, q, p_i, _ = weighted_setup(p_lambda, n, 150, 50, weights, small_s, q)
+    session = DecryptionSession(set(range(n)), p_i, q, p_0)
+
+    # Legacy mode: one encryption and one threshold decryption per 32 bytes
+    rounds = 20
+    start_legacy = time()
+    for _ in range(rounds):
+        ciphertext, _ = encrypt(420420, pk, small_g, p_0, q)
+        c2, seed, c1, h_k = ciphertext
+        assert(decrypt(c2, threshold_decryption(session, shares, c1, h_k, ciphertext.version), seed) == 420420)
+    legacy_block = (time() - start_legacy) / rounds
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "payload.bin")
+        for name, cipher in CIPHERS.items():
+            for size_mb in sizes_mb:
+                size = size_mb * 1024 * 1024
+                payload = os.urandom(size)
+                with open(path, "wb") as sink:
+                    start_encrypt = time()
+                    encrypt_stream(MemorySource(payload), sink, pk, small_g, p_0, q, cipher)
+                    end_encrypt = time() - start_encrypt
+
+                with open(path, "rb") as source:
+                    header = read_header(source)
+                    start_threshold = time()
+                    reconstruction = threshold_decryption(session, shares, header.c1, header.h_k, header.version)
+                    end_threshold = time() - start_threshold
+                    start_decrypt = time()
+                    assert(decrypt_stream(source, NullSink(), header, reconstruction) == size)
+                    end_decrypt = time() - start_decrypt
+
+                blocks = -(-size // 32)
+                result.append({
+                    'cipher' : name,
+                    'payload_mb' : size_mb,
+                    'encrypt_mb_per_s' : size_mb / end_encrypt,
+                    'decrypt_mb_per_s' : size_mb / end_decrypt,
+                    'threshold_operations' : 1,
+                    'threshold_runtime' : end_threshold,
+                    'legacy_threshold_operations' : blocks,
+                    'legacy_runtime_estimate' : blocks * legacy_block,
+                })
+    return result
+
+if __name__ == "__main__":
+    results = test_of_hybrid([1, 16, 64], 10)
+    export_efficiency_to_csv(results, "performance_hybrid.csv")
+    for r in results:
+        print(f"{r['cipher']:>18} {r['payload_mb']:>3} MB: encrypt {r['encrypt_mb_per_s']:.1f} MB/s, "
+              f"decrypt {r['decrypt_mb_per_s']:.1f} MB/s, threshold {r['threshold_runtime']:.4f} s "
+              f"(legacy {r['legacy_threshold_operations']} decryptions, ~{r['legacy_runtime_estimate']:.0f} s)")
@@ -0,0 +1,62 @@
+import csv
+from time import time
+from crt_secret_sharing.el_gamal_encryption import keygen, encrypt, DecryptionSession
+from crt_secret_sharing.weighted_crt_ss import weighted_setup
+
+def export_efficiency_to_csv(results, filename):
+    with open(filename, mode='w', newline='') as csvfile:
+        fieldnames = ['shareholders', 'overflow', 'scan_checks', 'scan_runtime', 'hint_checks', 'hint_runtime']
+        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+
+        writer.writeheader()
+        for row in results:
+            writer.writerow(row)
+
+def test_of_overflow(start, end, step, rounds):
+    result = []
+    p_lambda = 256
+    weight_limit = 50
+
+    weights = [weight_limit + i for i in range(1, end + 1)]
+    t = 50
+    T = 150
+    p_0, q, small_g, small_s, pk = keygen(p_lambda)
+
+    _, shares, q, p_i, _ = weighted_setup(p_lambda, end, T, t, weights, small_s, q)
+    ciphertext, _ = encrypt(420420, pk, small_g, p_0, q)
+    _, _, c1, h_k = ciphertext
+
+    for x in range(start, end + 1, step):
+        shareholders = set(range(x))
+        session = DecryptionSession(shareholders, p_i, q, p_0)
+        partial_decryptions = {i: session.partial_decrypt(i, shares[i], c1) for i in shareholders}
+        hints = {i: session.overflow_hint(i, shares[i]) for i in shareholders}
+
+        start_scan = time()
+        for _ in range(rounds):
+            k_scan = session.reconstruct(partial_decryptions, c1, h_k)
+        end_scan = (time() - start_scan) / rounds
+        scan_checks = session.checks
+
+        start_hint = time()
+        for _ in range(rounds):
+            k_hint = session.reconstruct(partial_decryptions, c1, h_k, hints)
+        end_hint = (time() - start_hint) / rounds
+        assert(k_scan == k_hint)
+
+        result.append({
+            'shareholders' : x,
+            'overflow' : scan_checks - 1,
+            'scan_checks' : scan_checks,
+            'scan_runtime' : end_scan,
+            'hint_checks' : session.checks,
+            'hint_runtime' : end_hint,
+        })
+        print(f"{x} shareholders: j = {scan_checks - 1}, scan {end_scan * 1000:.3f}ms, hints {end_hint * 1000:.3f}ms")
+    return result
+
+if __name__ == "__main__":
+    start = 3
+    end = 300
+    results = test_of_overflow(start, end, step=9, rounds=20)
+    export_efficiency_to_csv(results, f"performance_overflow_{start}to{end}_256bits.csv")
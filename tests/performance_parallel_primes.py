@@ -0,0 +1,57 @@
+import os
+import csv
+import matplotlib.pyplot as plt
+from time import time
+from crt_secret_sharing.weighted_crt_ss import weighted_setup
+
+def export_efficiency_to_csv(results, filename):
+    with open(filename, mode='w', newline='') as csvfile:
+        fieldnames = ['shareholders', 'workers', 't', 'T', 'setup_runtime']
+        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+
+        writer.writeheader()
+        for row in results:
+            writer.writerow(row)
+
+def plot_efficiency(results):
+    plt.figure(figsize=(12, 6))
+    for n in sorted({r['shareholders'] for r in results}):
+        rows = [r for r in results if r['shareholders'] == n]
+        plt.plot([r['workers'] for r in rows], [r['setup_runtime'] for r in rows], marker='o', label=f'n = {n}')
+    plt.title("WRSS Setup vs Number of Cores")
+    plt.xlabel("Worker processes")
+    plt.ylabel("Time (s)")
+    plt.legend()
+    plt.grid(True)
+    plt.tight_layout()
+    plt.show()
+
+def test_of_parallel_primes(sizes, cores, p_lambda):
+    result = []
+    weight_limit = 50
+
+    for n in sizes:
+        weights = [weight_limit + i for i in range(1, n + 1)]
+        t = weight_limit    
+        T = (weight_limit * 3)
+        for workers in cores:
+            start_setup = time()
+            weighted_setup(p_lambda, n, T, t, weights, 420420, None, workers=workers)
+            end_setup = time() - start_setup
+
+            result.append({
+                'shareholders' : n,
+                'workers' : workers,
+                't' : t,
+                'T' : T,
+                'setup_runtime' : end_setup,
+            })
+    return result
+
+if __name__ == "__main__":
+    p_lambda = 256
+    sizes = [5, 10, 25, 50, 100]
+    cores = sorted({1, 2, 4, 8, os.cpu_count() or 1})
+    results = test_of_parallel_primes(sizes, cores, p_lambda)
+    export_efficiency_to_csv(results, f"performance_parallel_primes_5to100_{p_lambda}bits.csv")
+    plot_efficiency(results)
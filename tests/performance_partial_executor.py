@@ -0,0 +1,57 @@
+import os
+import csv
+from time import time
+from crt_secret_sharing.el_gamal_encryption import keygen, encrypt, decrypt
+from crt_secret_sharing.weighted_crt_ss import weighted_setup
+from crt_secret_sharing.partial_executor import PartialDecryptionExecutor
+
+def export_efficiency_to_csv(results, filename):
+    with open(filename, mode='w', newline='') as csvfile:
+        fieldnames = ['shareholders', 'workers', 'runtime', 'ciphertexts_per_s', 'speedup']
+        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+
+        writer.writeheader()
+        for row in results:
+            writer.writerow(row)
+
+def test_of_partial_executor(shareholder_counts, worker_counts, ciphertexts):
+    result = []
+    p_lambda = 256
+    p_0, q, small_g, small_s, pk = keygen(p_lambda)
+    encrypted = [encrypt(m, pk, small_g, p_0, q) for m in range(ciphertexts)]
+
+    for n in shareholder_counts:
+        weights = [50 + i for i in range(1, n + 1)]
+        _, shares, q_n, p_i, _ = weighted_setup(p_lambda, n, 150, 50, weights, small_s, q)
+        # All shareholders take part, the worst case for the partial decryptions
+        shares = {i: shares[i] for i in range(n)}
+        baseline = None
+        for workers in worker_counts:
+            with PartialDecryptionExecutor(shares, p_i, q_n, p_0, workers=workers) as executor:
+                # The first round starts the worker processes
+                executor.partial_decrypt(encrypted[0][0][2])
+                start = time()
+                for m, (ciphertext, _) in enumerate(encrypted):
+                    c2, seed, c1, h_k = ciphertext
+                    reconstruction = executor.reconstruct(c1, h_k, ciphertext.version)
+                    assert(decrypt(c2, reconstruction, seed) == m)
+                runtime = time() - start
+            if baseline is None:
+                baseline = runtime
+            result.append({
+                'shareholders' : n,
+                'workers' : workers,
+                'runtime' : runtime,
+                'ciphertexts_per_s' : ciphertexts / runtime,
+                'speedup' : baseline / runtime,
+            })
+    return result
+
+if __name__ == "__main__":
+    cores = os.cpu_count() or 1
+    worker_counts = sorted({1, 2, 4, 8, cores})
+    results = test_of_partial_executor([10, 50, 200], worker_counts, 20)
+    export_efficiency_to_csv(results, "performance_partial_executor.csv")
+    for r in results:
+        print(f"n={r['shareholders']:>3} workers={r['workers']:>2}: {r['ciphertexts_per_s']:.1f} ciphertexts/s, "
+              f"speedup {r['speedup']:.2f}")
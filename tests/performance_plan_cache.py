@@ -0,0 +1,70 @@
+import csv
+import matplotlib.pyplot as plt
+from time import time
+from crt_secret_sharing.crt_ss import share_distribution, share_reconstruction
+from crt_secret_sharing.util_crt import PlanCache
+
+def export_efficiency_to_csv(results, filename):
+    with open(filename, mode='w', newline='') as csvfile:
+        fieldnames = ['shareholders', 'rounds', 'cold_runtime', 'warm_runtime', 'hits', 'misses']
+        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+
+        writer.writeheader()
+        for row in results:
+            writer.writerow(row)
+
+def plot_efficiency(results):
+    shareholders = [r['shareholders'] for r in results]
+    cold_runtime = [r['cold_runtime'] for r in results]
+    warm_runtime = [r['warm_runtime'] for r in results]
+
+    plt.figure(figsize=(12, 6))
+    plt.plot(shareholders, cold_runtime, marker='o', label='Cold cache (s)')
+    plt.plot(shareholders, warm_runtime, marker='s', label='Warm cache (s)')
+    plt.title("Latency per Reconstruction vs Number of Shareholders")
+    plt.xlabel("Number of Shareholders in Authorized Set")
+    plt.ylabel("Time (s)")
+    plt.xscale('log')
+    plt.yscale('log')
+    plt.legend()
+    plt.grid(True)
+    plt.tight_layout()
+    plt.show()
+
+def test_of_plan_cache(sizes, p_lambda, rounds):
+    result = []
+    for n in sizes:
+        _, shares, p_0, p_i = share_distribution(p_lambda, n, 2, 420420, None, None, None, False)
+        cache = PlanCache()
+
+        # Cold: every reconstruction builds the plan
+        start_cold = time()
+        for _ in range(rounds):
+            cache.clear()
+            assert(share_reconstruction(p_0, p_i, shares, cache) == 420420)
+        end_cold = (time() - start_cold) / rounds
+
+        # Warm: the plan is built once and reused
+        cache.clear()
+        share_reconstruction(p_0, p_i, shares, cache)
+        start_warm = time()
+        for _ in range(rounds):
+            assert(share_reconstruction(p_0, p_i, shares, cache) == 420420)
+        end_warm = (time() - start_warm) / rounds
+
+        result.append({
+            'shareholders' : n,
+            'rounds' : rounds,
+            'cold_runtime' : end_cold,
+            'warm_runtime' : end_warm,
+            'hits' : cache.hits,
+            'misses' : cache.misses,
+        })
+    return result
+
+if __name__ == "__main__":
+    sizes = [3, 30, 300]
+    p_lambda = 256
+    results = test_of_plan_cache(sizes, p_lambda, rounds=20)
+    export_efficiency_to_csv(results, f"performance_plan_cache_{p_lambda}bits.csv")
+    plot_efficiency(results)
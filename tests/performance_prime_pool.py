@@ -0,0 +1,68 @@
+import os
+import csv
+import tempfile
+import matplotlib.pyplot as plt
+from time import time
+from crt_secret_sharing.prime_pool import PrimePool
+from crt_secret_sharing.weighted_crt_ss import weighted_setup, weighted_buckets
+
+def export_efficiency_to_csv(results, filename):
+    with open(filename, mode='w', newline='') as csvfile:
+        fieldnames = ['shareholders', 't', 'T', 'live_setup_runtime', 'pool_setup_runtime']
+        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+
+        writer.writeheader()
+        for row in results:
+            writer.writerow(row)
+
+def plot_efficiency(results):
+    shareholders = [r['shareholders'] for r in results]
+    plt.figure(figsize=(12, 6))
+    plt.plot(shareholders, [r['live_setup_runtime'] for r in results], marker='o', label='Live generation (s)')
+    plt.plot(shareholders, [r['pool_setup_runtime'] for r in results], marker='s', label='Prime pool (s)')
+    plt.title("WRSS Setup with and without Prime Pool vs Number of Users")
+    plt.xlabel("Number of Shareholders (n)")
+    plt.ylabel("Time (s)")
+    plt.legend()
+    plt.grid(True)
+    plt.tight_layout()
+    plt.show()
+
+def test_of_prime_pool(start, end, p_lambda, pool):
+    result = []
+    weight_limit = 50
+
+    for n in range(start, end):
+        weights = [weight_limit for _ in range(1, n + 1)]
+        t = weight_limit    
+        T = (weight_limit * 3)
+
+        start_live = time()
+        _, _, p_0, _, _ = weighted_setup(p_lambda, n, T, t, weights, 420420, None)
+        end_live = time() - start_live
+
+        # Fill the pool ahead of the setup
+        for bucket, count in weighted_buckets(T, t, weights, p_lambda).items():
+            pool.refill(bucket, count)
+        start_pool = time()
+        weighted_setup(p_lambda, n, T, t, weights, 420420, p_0, pool=pool)
+        end_pool = time() - start_pool
+
+        result.append({
+            'shareholders' : n,
+            't' : t,
+            'T' : T,
+            'live_setup_runtime' : end_live,
+            'pool_setup_runtime' : end_pool,
+        })
+    return result
+
+if __name__ == "__main__":
+    start = 3
+    end = 30
+    p_lambda = 256
+    with tempfile.TemporaryDirectory() as directory:
+        pool = PrimePool(os.path.join(directory, "primes.db"))
+        results = test_of_prime_pool(start, end, p_lambda, pool)
+    export_efficiency_to_csv(results, f"performance_prime_pool_{start}to{end - 1}_sameW_{p_lambda}bits.csv")
+    plot_efficiency(results)
@@ -0,0 +1,79 @@
+import csv
+import matplotlib.pyplot as plt
+from time import time
+from secrets import SystemRandom
+from sympy import prevprime
+from Crypto.Util.number import isPrime, getPrime
+from crt_secret_sharing.util_crt import gcd
+from crt_secret_sharing.util_primes import generate_weighted_party_primes, interval_bounds
+from crt_secret_sharing.weighted_crt_ss import efficient_scaling
+
+def export_efficiency_to_csv(results, filename):
+    with open(filename, mode='w', newline='') as csvfile:
+        fieldnames = ['t', 'c', 'avg_prime_bits', 'prevprime_runtime', 'sieve_runtime']
+        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+
+        writer.writeheader()
+        for row in results:
+            writer.writerow(row)
+
+def plot_efficiency(results):
+    bits = [r['avg_prime_bits'] for r in results]
+    plt.figure(figsize=(12, 6))
+    plt.plot(bits, [r['prevprime_runtime'] for r in results], marker='o', label='sympy prevprime (s)')
+    plt.plot(bits, [r['sieve_runtime'] for r in results], marker='s', label='Sieved search (s)')
+    plt.title("Weighted Prime Generation vs Prime Size")
+    plt.xlabel("Average Prime Size (bits)")
+    plt.ylabel("Time (s)")
+    plt.yscale('log')
+    plt.legend()
+    plt.grid(True)
+    plt.tight_layout()
+    plt.show()
+
+def prevprime_party_primes(p_0, weights):
+    # The search used before the sieve: sympy prevprime, isPrime and gcd
+    num_p = len(weights)
+    p_i = [0] * num_p
+    generated_primes = {p_0}
+    cryptogen = SystemRandom()
+    for i, w in enumerate(weights):
+        lower_bound, upper_bound = interval_bounds(w, num_p)
+        while True:
+            candidate = prevprime(cryptogen.randrange(lower_bound, upper_bound))
+            if isPrime(candidate) and all(gcd(candidate, p) == 1 for p in generated_primes):
+                if candidate >= lower_bound:
+                    p_i[i] = candidate
+                    generated_primes.add(candidate)
+                    break
+    return p_i
+
+def test_of_prime_search(p_lambda, weights, T, thresholds):
+    result = []
+    p_0 = getPrime(p_lambda)
+    for t in thresholds:
+        _, _, scaled_weights, c = efficient_scaling(T, t, weights, p_lambda)
+
+        start_prevprime = time()
+        prevprime_party_primes(p_0, scaled_weights)
+        end_prevprime = time() - start_prevprime
+
+        start_sieve = time()
+        p_i = generate_weighted_party_primes(p_0, scaled_weights)
+        end_sieve = time() - start_sieve
+
+        result.append({
+            't' : t,
+            'c' : c,
+            'avg_prime_bits' : sum(p.bit_length() for p in p_i) / len(p_i),
+            'prevprime_runtime' : end_prevprime,
+            'sieve_runtime' : end_sieve,
+        })
+    return result
+
+if __name__ == "__main__":
+    p_lambda = 256
+    weights = [60, 80, 100, 120, 140]
+    results = test_of_prime_search(p_lambda, weights, 300, [0, 100, 200, 250, 269])
+    export_efficiency_to_csv(results, "performance_prime_search_256bits.csv")
+    plot_efficiency(results)
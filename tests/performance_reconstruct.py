@@ -1,12 +1,14 @@
 import csv
 import matplotlib.pyplot as plt
 from time import time
-from crt_secret_sharing.el_gamal_encryption import keygen, encrypt, partial_decrypt, decrypt, reconstruct
+from crt_secret_sharing.el_gamal_encryption import keygen, encrypt, partial_decrypt, decrypt, reconstruct, DecryptionSession
 from crt_secret_sharing.weighted_crt_ss import weighted_setup
+from crt_secret_sharing.util_crt import DEFAULT_PLAN_CACHE
 
 def export_efficiency_to_csv(results, filename):
     with open(filename, mode='w', newline='') as csvfile:
-        fieldnames = ['shareholders', 't', 'T', 'encrypt_runtime', 'partial_runtime', 'recon_runtime', 'decrypt_runtime']
+        fieldnames = ['shareholders', 't', 'T', 'encrypt_runtime', 'partial_runtime', 'recon_runtime', 'decrypt_runtime',
+                      'session_runtime', 'session_partial_runtime', 'session_recon_runtime']
         writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
 
         writer.writeheader()
@@ -23,6 +25,8 @@ def plot_efficiency(results):
     plt.plot(shareholders, partial_runtime, marker='o', label='Partial Decryption (s)')
     plt.plot(shareholders, recon_runtime, marker='s', label='Reconstruction (s)')
     plt.plot(shareholders, decrypt_runtime, marker='^', label='Total Decryption (s)')
+    plt.plot(shareholders, [r['session_partial_runtime'] for r in results], marker='x', label='Session Partial Decryption (s)')
+    plt.plot(shareholders, [r['session_recon_runtime'] for r in results], marker='d', label='Session Reconstruction (s)')
 
     plt.title("Decryption Performance vs Number of Shareholders")
     plt.xlabel("Number of Shareholders in Group")
@@ -64,6 +68,18 @@ def test_of_elgamal(start, end):
         end_decryp = time() - start_decryp
         assert(decrypted_message == 420420)
 
+        # Fresh plans, so the session pays for its coefficients
+        DEFAULT_PLAN_CACHE.clear()
+        start_session = time()
+        session = DecryptionSession(shareholders, p_i, q, p_0)
+        end_session = time() - start_session
+        start_session_partial = time()
+        session_decryptions = {i: session.partial_decrypt(i, shares[i], c1) for i in shareholders}
+        end_session_partial = time() - start_session_partial
+        start_session_recon = time()
+        assert(session.reconstruct(session_decryptions, c1, h_k) == k_constructed)
+        end_session_recon = time() - start_session_recon
+
         result.append({
             'shareholders' : x,
             't' : t,
@@ -71,6 +87,9 @@ def test_of_elgamal(start, end):
             'partial_runtime' : end_partial,
             'recon_runtime' : end_recon,
             'decrypt_runtime' : end_decryp,
+            'session_runtime' : end_session,
+            'session_partial_runtime' : end_session_partial,
+            'session_recon_runtime' : end_session_recon,
         })
     return result
 
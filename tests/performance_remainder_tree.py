@@ -0,0 +1,71 @@
+import csv
+import matplotlib.pyplot as plt
+from time import time
+from crt_secret_sharing.crt_ss import share_distribution_batch
+from crt_secret_sharing.util_crt import cached_product_tree
+from crt_secret_sharing.weighted_crt_ss import weighted_parameters
+
+def export_efficiency_to_csv(results, filename):
+    with open(filename, mode='w', newline='') as csvfile:
+        fieldnames = ['shareholders', 't', 'T', 'secrets', 'tree_build_runtime', 'direct_runtime', 'tree_runtime']
+        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+
+        writer.writeheader()
+        for row in results:
+            writer.writerow(row)
+
+def plot_efficiency(results):
+    shareholders = [r['shareholders'] for r in results]
+    plt.figure(figsize=(12, 6))
+    plt.plot(shareholders, [r['direct_runtime'] for r in results], marker='o', label='Direct reduction (s)')
+    plt.plot(shareholders, [r['tree_runtime'] for r in results], marker='s', label='Remainder tree (s)')
+    plt.plot(shareholders, [r['tree_build_runtime'] for r in results], marker='^', label='Tree build, once (s)')
+    plt.title("Share Generation vs Number of Shareholders")
+    plt.xlabel("Number of Shareholders (n)")
+    plt.ylabel("Time (s)")
+    plt.legend()
+    plt.grid(True)
+    plt.tight_layout()
+    plt.show()
+
+def test_of_remainder_tree(start, end, p_lambda, amount):
+    result = []
+    weight_limit = 50
+    small_secrets = list(range(amount))
+
+    for n in range(start, end):
+        weights = [weight_limit + i for i in range(1, n + 1)]
+        t = weight_limit
+        T = (weight_limit * 3)
+        p_0, p_i, L, scaled_T, _ = weighted_parameters(p_lambda, n, T, t, weights, None)
+
+        start_build = time()
+        cached_product_tree(tuple(p_i))
+        end_build = time() - start_build
+
+        start_direct = time()
+        direct, _, _ = share_distribution_batch(p_lambda, n, scaled_T, small_secrets, p_0, p_i, L, True, "direct")
+        end_direct = time() - start_direct
+
+        start_tree = time()
+        tree, _, _ = share_distribution_batch(p_lambda, n, scaled_T, small_secrets, p_0, p_i, L, True, "tree")
+        end_tree = time() - start_tree
+
+        result.append({
+            'shareholders' : n,
+            't' : t,
+            'T' : T,
+            'secrets' : amount,
+            'tree_build_runtime' : end_build,
+            'direct_runtime' : end_direct,
+            'tree_runtime' : end_tree,
+        })
+    return result
+
+if __name__ == "__main__":
+    start = 3
+    end = 30
+    p_lambda = 256
+    results = test_of_remainder_tree(start, end, p_lambda, 1000)
+    export_efficiency_to_csv(results, f"performance_remainder_tree_{start}to{end - 1}_{p_lambda}bits.csv")
+    plot_efficiency(results)
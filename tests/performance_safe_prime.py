@@ -0,0 +1,59 @@
+import os
+import csv
+import matplotlib.pyplot as plt
+from time import time
+from crt_secret_sharing.el_gamal_encryption import keygen
+from crt_secret_sharing.util_primes import generate_safe_prime
+
+def export_efficiency_to_csv(results, filename):
+    with open(filename, mode='w', newline='') as csvfile:
+        fieldnames = ['bits', 'workers', 'attempts', 'search_runtime', 'attempts_per_second', 'keygen_runtime']
+        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+
+        writer.writeheader()
+        for row in results:
+            writer.writerow(row)
+
+def plot_efficiency(results):
+    plt.figure(figsize=(12, 6))
+    for workers in sorted({r['workers'] for r in results}):
+        rows = [r for r in results if r['workers'] == workers]
+        plt.plot([r['bits'] for r in rows], [r['keygen_runtime'] for r in rows], marker='o', label=f'{workers} workers')
+    plt.title("ElGamal Key Generation vs Bit Length")
+    plt.xlabel("Bit length of q")
+    plt.ylabel("Time (s)")
+    plt.yscale('log')
+    plt.legend()
+    plt.grid(True)
+    plt.tight_layout()
+    plt.show()
+
+def test_of_safe_prime(bit_lengths, cores):
+    result = []
+    for bits in bit_lengths:
+        for workers in cores:
+            start_search = time()
+            _, attempts = generate_safe_prime(bits, workers)
+            end_search = time() - start_search
+
+            start_keygen = time()
+            keygen(bits, workers)
+            end_keygen = time() - start_keygen
+
+            result.append({
+                'bits' : bits,
+                'workers' : workers,
+                'attempts' : attempts,
+                'search_runtime' : end_search,
+                'attempts_per_second' : attempts / end_search,
+                'keygen_runtime' : end_keygen,
+            })
+            print(f"{bits} bits, {workers} workers: {attempts / end_search:.0f} attempts/s")
+    return result
+
+if __name__ == "__main__":
+    bit_lengths = [256, 1024, 2048, 3072]
+    cores = sorted({1, os.cpu_count() or 1})
+    results = test_of_safe_prime(bit_lengths, cores)
+    export_efficiency_to_csv(results, "performance_safe_prime.csv")
+    plot_efficiency(results)
@@ -0,0 +1,63 @@
+import os
+import csv
+import json
+import secrets
+import tempfile
+from time import time
+from Crypto.Util.number import getPrime
+from crt_secret_sharing.serialization import write_shares, read_shares
+
+def export_efficiency_to_csv(results, filename):
+    with open(filename, mode='w', newline='') as csvfile:
+        fieldnames = ['bits', 'shareholders', 'secrets', 'format', 'bytes', 'store_runtime', 'load_runtime', 'load_mb_per_second']
+        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+
+        writer.writeheader()
+        for row in results:
+            writer.writerow(row)
+
+def write_json(path, columns, p_i):
+    with open(path, "w") as f:
+        json.dump({"p_i": [str(p) for p in p_i], "columns": [[str(s) for s in column] for column in columns]}, f)
+
+def read_json(path):
+    with open(path) as f:
+        data = json.load(f)
+    return [[int(s) for s in column] for column in data["columns"]], [int(p) for p in data["p_i"]]
+
+def test_of_serialization(bit_lengths, n, count):
+    result = []
+    formats = {'binary' : (write_shares, read_shares), 'json' : (write_json, read_json)}
+    with tempfile.TemporaryDirectory() as directory:
+        for bits in bit_lengths:
+            # Shares are uniform below their prime, the values themselves do not matter for the format
+            p_i = [getPrime(bits) for _ in range(n)]
+            columns = [[secrets.randbelow(p) for _ in range(count)] for p in p_i]
+            for name, (write, read) in formats.items():
+                path = os.path.join(directory, f"shares.{name}")
+                start_store = time()
+                write(path, columns, p_i)
+                end_store = time() - start_store
+
+                start_load = time()
+                loaded = read(path)
+                end_load = time() - start_load
+                assert(loaded == (columns, p_i))
+
+                size = os.path.getsize(path)
+                result.append({
+                    'bits' : bits,
+                    'shareholders' : n,
+                    'secrets' : count,
+                    'format' : name,
+                    'bytes' : size,
+                    'store_runtime' : end_store,
+                    'load_runtime' : end_load,
+                    'load_mb_per_second' : size / end_load / 1e6,
+                })
+                print(f"{bits} bits, {name}: {size / 1e6:.1f}MB, store {end_store:.3f}s, load {end_load:.3f}s")
+    return result
+
+if __name__ == "__main__":
+    results = test_of_serialization([256, 1024, 4096], n=10, count=10000)
+    export_efficiency_to_csv(results, "performance_serialization.csv")
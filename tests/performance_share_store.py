@@ -0,0 +1,56 @@
+import os
+import csv
+import random
+import tempfile
+from time import time
+from crt_secret_sharing.share_store import ShareStore, share_to_store
+from crt_secret_sharing.util_crt import PlanCache
+
+def export_efficiency_to_csv(results, filename):
+    with open(filename, mode='w', newline='') as csvfile:
+        fieldnames = ['bits', 'shareholders', 'secrets', 'store_bytes', 'build_runtime', 'reconstructions', 'reconstruct_runtime']
+        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+
+        writer.writeheader()
+        for row in results:
+            writer.writerow(row)
+
+def test_of_share_store(p_lambda, n, t, count, reconstructions, directory):
+    path = os.path.join(directory, "shares.store")
+    # The secret values do not matter, a range keeps them out of memory
+    small_secrets = range(count)
+
+    start_build = time()
+    share_to_store(path, p_lambda, n, t, small_secrets, None, None, None, False).close()
+    end_build = time() - start_build
+
+    with ShareStore.open(path) as store:
+        secret_ids = [random.randrange(count) for _ in range(reconstructions)]
+        subsets = [random.sample(range(n), t) for _ in range(reconstructions)]
+        # Room for the plan of every subset, so the timing is the reads from the mapping
+        cache = PlanCache(maxsize=len({frozenset(s) for s in subsets}))
+        start_reconstruct = time()
+        for secret_id, shareholders in zip(secret_ids, subsets):
+            assert(store.reconstruct(secret_id, shareholders, cache) == secret_id)
+        end_reconstruct = (time() - start_reconstruct) / reconstructions
+    size = os.path.getsize(path)
+    os.remove(path)
+
+    print(f"{size / 1e9:.2f}GB store: built in {end_build:.1f}s, {end_reconstruct * 1e6:.1f}us per reconstruction")
+    return {
+        'bits' : p_lambda,
+        'shareholders' : n,
+        'secrets' : count,
+        'store_bytes' : size,
+        'build_runtime' : end_build,
+        'reconstructions' : reconstructions,
+        'reconstruct_runtime' : end_reconstruct,
+    }
+
+if __name__ == "__main__":
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        # 10 shareholders with 1024 bit primes take 1.28KB per secret
+        for count in [10 ** 4, 10 ** 5, 10 ** 6, 2 * 10 ** 6]:
+            results.append(test_of_share_store(1024, 10, 5, count, 10000, directory))
+    export_efficiency_to_csv(results, "performance_share_store.csv")
@@ -1,7 +1,9 @@
+import os
 import csv
+import secrets
 import matplotlib.pyplot as plt
 from time import time
-from crt_secret_sharing.el_gamal_encryption import keygen, encrypt
+from crt_secret_sharing.el_gamal_encryption import keygen, encrypt, encrypt_batch
 from crt_secret_sharing.weighted_crt_ss import weighted_setup
 
 def export_efficiency_to_csv(results, filename):
@@ -61,6 +63,36 @@ def test_of_elgamal(start, end, p_lambda, sameweights=False):
         })
     return result
 
+def export_throughput_to_csv(results, filename):
+    with open(filename, mode='w', newline='') as csvfile:
+        fieldnames = ['bits', 'workers', 'messages', 'batch_runtime', 'ciphertexts_per_second']
+        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+
+        writer.writeheader()
+        for row in results:
+            writer.writerow(row)
+
+def test_of_batch_encryption(groups, cores, messages):
+    result = []
+    for group in groups:
+        p_0, q, small_g, _, pk = keygen(group)
+        plaintexts = [secrets.randbits(256) for _ in range(messages)]
+        for workers in cores:
+            start_batch = time()
+            for _ in encrypt_batch(plaintexts, pk, small_g, p_0, q, workers):
+                pass
+            end_batch = time() - start_batch
+
+            result.append({
+                'bits' : p_0.bit_length(),
+                'workers' : workers,
+                'messages' : messages,
+                'batch_runtime' : end_batch,
+                'ciphertexts_per_second' : messages / end_batch,
+            })
+            print(f"{p_0.bit_length()} bits, {workers} workers: {messages / end_batch:.1f} ciphertexts/s")
+    return result
+
 if __name__ == "__main__":
     start = 3
     end = 30
@@ -72,4 +104,7 @@ if __name__ == "__main__":
     export_efficiency_to_csv(results, f"performance_shareholders_{start}to{end - 1}_sameW_{p_lambda}bits.csv")
     plot_efficiency(results)
 
-    
\ No newline at end of file
+    
+    cores = sorted({1, 2, 4, os.cpu_count() or 1})
+    results = test_of_batch_encryption([256, "modp2048"], cores, messages=1000)
+    export_throughput_to_csv(results, "performance_batch_encryption.csv")
@@ -0,0 +1,90 @@
+import os
+import csv
+import tempfile
+import tracemalloc
+from time import time
+from crt_secret_sharing.streaming import share_stream, reconstruct_stream
+
+class NullSink:
+    # Output stream that only counts the bytes written to it
+    def __init__(self):
+        self.written = 0
+
+    def write(self, data):
+        self.written += len(data)
+
+class RandomSource:
+    # Input stream of size random bytes, nothing is held in memory
+    def __init__(self, size):
+        self.remaining = size
+
+    def read(self, size):
+        size = min(size, self.remaining)
+        self.remaining -= size
+        return os.urandom(size)
+
+def export_efficiency_to_csv(results, filename):
+    with open(filename, mode='w', newline='') as csvfile:
+        fieldnames = ['p_lambda', 'payload_mb', 'share_mb_per_s', 'reconstruct_mb_per_s', 'share_peak_kb', 'reconstruct_peak_kb']
+        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+
+        writer.writeheader()
+        for row in results:
+            writer.writerow(row)
+
+def share_pass(source, paths, p_lambda, n, t, trace=False):
+    sinks = [open(path, "wb") for path in paths]
+    if trace:
+        tracemalloc.start()
+    start = time()
+    share_stream(source, sinks, p_lambda, n, t, None, None, None, False)
+    runtime = time() - start
+    peak = tracemalloc.get_traced_memory()[1] if trace else 0
+    tracemalloc.stop()
+    for sink in sinks:
+        sink.close()
+    return runtime, peak
+
+def reconstruct_pass(paths, size, trace=False):
+    sources = [open(path, "rb") for path in paths]
+    if trace:
+        tracemalloc.start()
+    start = time()
+    assert(reconstruct_stream(sources, NullSink()) == size)
+    runtime = time() - start
+    peak = tracemalloc.get_traced_memory()[1] if trace else 0
+    tracemalloc.stop()
+    for source in sources:
+        source.close()
+    return runtime, peak
+
+def test_of_streaming(bit_lengths, sizes_mb, n, t):
+    result = []
+    with tempfile.TemporaryDirectory() as directory:
+        paths = [os.path.join(directory, f"shareholder_{i}.bin") for i in range(n)]
+        for p_lambda in bit_lengths:
+            for size_mb in sizes_mb:
+                size = size_mb * 1024 * 1024
+                # Throughput is timed without tracing, the peak memory is traced in a second pass
+                share_peak = share_pass(RandomSource(size), paths, p_lambda, n, t, trace=True)[1]
+                end_share = share_pass(RandomSource(size), paths, p_lambda, n, t)[0]
+                recon_peak = reconstruct_pass(paths[:t], size, trace=True)[1]
+                end_recon = reconstruct_pass(paths[:t], size)[0]
+
+                result.append({
+                    'p_lambda' : p_lambda,
+                    'payload_mb' : size_mb,
+                    'share_mb_per_s' : size_mb / end_share,
+                    'reconstruct_mb_per_s' : size_mb / end_recon,
+                    'share_peak_kb' : share_peak / 1024,
+                    'reconstruct_peak_kb' : recon_peak / 1024,
+                })
+    return result
+
+if __name__ == "__main__":
+    results = test_of_streaming([128, 256], [1, 4, 16], 5, 3)
+    export_efficiency_to_csv(results, "performance_streaming.csv")
+    for r in results:
+        print(f"{r['p_lambda']:>4} bits {r['payload_mb']:>3} MB: share {r['share_mb_per_s']:.2f} MB/s, "
+              f"reconstruct {r['reconstruct_mb_per_s']:.2f} MB/s, "
+              f"peak {r['share_peak_kb']:.0f} / {r['reconstruct_peak_kb']:.0f} KB")
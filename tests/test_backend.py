@@ -0,0 +1,73 @@
+import unittest
+import random
+from math import prod
+from Crypto.Util.number import getPrime
+from crt_secret_sharing import backend
+from crt_secret_sharing.backend import available_backends, set_backend, get_backend, powmod, invert, is_prime
+from crt_secret_sharing.util_crt import CRT_METHODS, ReconstructionPlan, modinv, product_tree, remainder_tree
+from crt_secret_sharing.el_gamal_encryption import keygen, encrypt, decrypt, DecryptionSession
+from crt_secret_sharing.weighted_crt_ss import weighted_setup
+
+class TestWithBackend(unittest.TestCase):
+
+    def setUp(self):
+        self.previous = get_backend()
+
+    def tearDown(self):
+        set_backend(self.previous)
+
+    def test_selection(self):
+        self.assertIn("python", available_backends())
+        set_backend("python")
+        self.assertEqual(set_backend("auto"), "python")
+        self.assertEqual(get_backend(), "gmpy2" if backend.gmpy2 is not None else "python")
+        with self.assertRaises(ValueError):
+            set_backend("unknown")
+
+    def test_primitives(self):
+        p = getPrime(256)
+        x = random.randrange(2, p)
+        for name in available_backends():
+            set_backend(name)
+            self.assertEqual(powmod(x, p - 1, p), 1)
+            self.assertEqual(invert(x, p) * x % p, 1)
+            self.assertIs(type(invert(x, p)), int)
+            self.assertTrue(is_prime(p))
+            self.assertFalse(is_prime(p * getPrime(64)))
+            with self.assertRaises(ValueError):
+                invert(6, 9)
+            with self.assertRaises(ValueError):
+                modinv(6, 9)
+
+    def test_results_identical(self):
+        moduli = sorted({getPrime(64) for _ in range(40)})
+        x = random.randrange(prod(moduli))
+        residues = [x % m for m in moduli]
+        results = []
+        for name in available_backends():
+            set_backend(name)
+            remainders = remainder_tree(x, product_tree(moduli))
+            combined = [ReconstructionPlan(moduli, method).combine(moduli, residues) for method in CRT_METHODS]
+            self.assertTrue(all(type(r) is int for r in remainders + combined))
+            results.append((remainders, combined))
+        self.assertEqual(results[0][0], residues)
+        self.assertEqual(results[0][1], [x] * len(CRT_METHODS))
+        self.assertTrue(all(r == results[0] for r in results))
+
+    def test_threshold_decryption(self):
+        p_lambda = 256
+        p_0, q, small_g, small_s, pk = keygen(p_lambda)
+        _, shares, q, p_i, _ = weighted_setup(p_lambda, 5, 25, 15, [3,7,9,10,12], small_s, q)
+        ciphertext, _ = encrypt(420420, pk, small_g, p_0, q)
+        c2, seed, c1, h_k = ciphertext
+
+        shareholders = {0,3,4}
+        for name in available_backends():
+            set_backend(name)
+            session = DecryptionSession(shareholders, p_i, q, p_0)
+            partial_decryptions = {i: session.partial_decrypt(i, shares[i], c1) for i in shareholders}
+            k_constructed = session.reconstruct(partial_decryptions, c1, h_k)
+            self.assertEqual(decrypt(c2, k_constructed, seed), 420420)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+import asyncio
+import unittest
+from crt_secret_sharing.el_gamal_encryption import keygen, encrypt, decrypt
+from crt_secret_sharing.weighted_crt_ss import weighted_setup
+from crt_secret_sharing.combiner import ShareholderServer, Combiner, _Connection, OP_PARTIAL, OP_PARTIAL_HINT
+
+class TestWithCombiner(unittest.IsolatedAsyncioTestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        p_lambda = 256
+        cls.weights = [3,7,9,10,12]
+        cls.T = 25
+        cls.p_0, cls.q, cls.small_g, small_s, cls.pk = keygen(p_lambda)
+        _, cls.shares, cls.q, cls.p_i, _ = weighted_setup(p_lambda, 5, cls.T, 15, cls.weights, small_s, cls.q)
+
+    async def asyncSetUp(self):
+        self.servers = {}
+        self.endpoints = {}
+
+    async def asyncTearDown(self):
+        for server in self.servers.values():
+            await server.stop()
+
+    async def serve(self, delays, allow_hints=False):
+        for i, delay in enumerate(delays):
+            server = ShareholderServer(i, self.shares[i], self.weights, self.T, self.p_i, self.q, self.p_0, delay,
+                                       allow_hints=allow_hints)
+            self.servers[i] = server
+            self.endpoints[i] = await server.start()
+
+    def combiner(self, timeout=1.0, hints=False):
+        return Combiner(self.endpoints, self.weights, self.T, self.p_i, self.q, self.p_0, timeout=timeout, hints=hints)
+
+    async def test_reconstruct(self):
+        # The combiner is trusted with the hints here
+        await self.serve([0.0] * 5, allow_hints=True)
+        ciphertexts = [encrypt(420420 + k, self.pk, self.small_g, self.p_0, self.q)[0] for k in range(20)]
+        for hints in (False, True):
+            async with self.combiner(hints=hints) as combiner:
+                reconstructions = await combiner.reconstruct_many([(c[2], c[3], c.version) for c in ciphertexts])
+            for k, (ciphertext, reconstruction) in enumerate(zip(ciphertexts, reconstructions)):
+                self.assertEqual(decrypt(ciphertext[0], reconstruction, ciphertext[1]), 420420 + k)
+
+    async def test_stragglers(self):
+        # Shareholder 1 never answers in time, shareholder 0 is down
+        await self.serve([0.0, 10.0, 0.0, 0.0, 0.0])
+        await self.servers[0].stop()
+        ciphertext, _ = encrypt(420420, self.pk, self.small_g, self.p_0, self.q)
+        c2, seed, c1, h_k = ciphertext
+        async with self.combiner(timeout=0.3) as combiner:
+            reconstruction = await combiner.reconstruct(c1, h_k)
+        self.assertEqual(decrypt(c2, reconstruction, seed), 420420)
+
+    async def test_not_authorized(self):
+        # Only shareholders 3 and 4 with weight 22 answer
+        await self.serve([10.0, 10.0, 10.0, 0.0, 0.0])
+        ciphertext, _ = encrypt(420420, self.pk, self.small_g, self.p_0, self.q)
+        async with self.combiner(timeout=0.2) as combiner:
+            with self.assertRaises(TimeoutError):
+                await combiner.reconstruct(ciphertext[2], ciphertext[3])
+
+    async def test_rejected_requests(self):
+        await self.serve([0.0] * 5)
+        ciphertext, _ = encrypt(420420, self.pk, self.small_g, self.p_0, self.q)
+        c1 = ciphertext[2]
+        connection = _Connection(self.endpoints[1])
+        try:
+            # Only authorized sets with the shareholder get an answer, hints are not handed out by default
+            mu_i, hint = await asyncio.wait_for(connection.request(0, OP_PARTIAL, c1, {1, 3, 4}), 1.0)
+            self.assertEqual(hint, 0)
+            with self.assertRaises(ValueError):
+                await asyncio.wait_for(connection.request(1, OP_PARTIAL_HINT, c1, {1, 3, 4}), 1.0)
+            # Rejections are answered right away instead of running into the timeout
+            for request_id, c1_request, shareholders in ((2, c1, {0, 1}), (3, c1, {0, 3, 4}),
+                                                         (4, self.p_0 - 1, {1, 3, 4}), (5, c1, {1, 3, 7})):
+                with self.assertRaises(ValueError):
+                    await asyncio.wait_for(connection.request(request_id, OP_PARTIAL, c1_request, shareholders), 1.0)
+            # The connection is still usable afterwards
+            self.assertEqual(await connection.request(6, OP_PARTIAL, c1, {1, 3, 4}), (mu_i, 0))
+        finally:
+            await connection.close()
+
+    async def test_allowed_hints(self):
+        await self.serve([0.0] * 5, allow_hints=True)
+        ciphertext, _ = encrypt(420420, self.pk, self.small_g, self.p_0, self.q)
+        connection = _Connection(self.endpoints[1])
+        try:
+            _, hint = await asyncio.wait_for(connection.request(0, OP_PARTIAL_HINT, ciphertext[2], {1, 3, 4}), 1.0)
+            self.assertGreater(hint, 0)
+        finally:
+            await connection.close()
+
+if __name__ == "__main__":
+    unittest.main()
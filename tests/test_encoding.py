@@ -0,0 +1,92 @@
+import pickle
+import unittest
+from crt_secret_sharing.encoding import encode_int, encode_ints, decode_int
+from crt_secret_sharing.el_gamal_encryption import (keygen, encrypt, decrypt, reconstruct, partial_decrypt, universal_hashing,
+                                                    ciphertext_version, decrypt_batch, DecryptionSession,
+                                                    Ciphertext, CIPHERTEXT_VERSION, LEGACY_VERSION)
+from crt_secret_sharing.weighted_crt_ss import weighted_setup
+
+class TestWithEncoding(unittest.TestCase):
+
+    def test_encode_int(self):
+        self.assertEqual(encode_int(0), b'\x00')
+        self.assertEqual(encode_int(258), b'\x01\x02')
+        self.assertEqual(encode_int(258, 4), b'\x00\x00\x01\x02')
+        x = (1 << 4095) + 12345
+        self.assertEqual(decode_int(encode_int(x)), x)
+        with self.assertRaises(ValueError):
+            encode_int(-1)
+        # The length prefix keeps concatenations apart
+        self.assertNotEqual(encode_ints(1, 258), encode_ints(257, 2))
+
+    def test_ciphertext_versions(self):
+        n = 5
+        T = 25
+        t = 15
+        weights = [3,7,9,10,12]
+        p_lambda = 256
+
+        p_0, q, small_g, small_s, pk = keygen(p_lambda)
+        _, shares, q, p_i, _ = weighted_setup(p_lambda, n, T, t, weights, small_s, q)
+
+        shareholders = {0,3,4}
+        for version in (LEGACY_VERSION, CIPHERTEXT_VERSION):
+            ciphertext, _ = encrypt(420420, pk, small_g, p_0, q, version)
+            self.assertEqual(ciphertext.version, version)
+            self.assertEqual(pickle.loads(pickle.dumps(ciphertext)).version, version)
+            c2, seed, c1, h_k = ciphertext
+
+            partial_decryptions = {i: partial_decrypt(i, shares[i], c1, p_0, shareholders, p_i, q) for i in shareholders}
+            k_constructed = reconstruct(partial_decryptions, c1, h_k, p_0, shareholders, p_i, q, ciphertext.version)
+            self.assertEqual(decrypt(c2, k_constructed, seed, ciphertext.version), 420420)
+            # The hash of the other version does not match
+            other = LEGACY_VERSION if version == CIPHERTEXT_VERSION else CIPHERTEXT_VERSION
+            self.assertNotEqual(universal_hashing(k_constructed, other), h_k)
+
+        self.assertIsInstance(ciphertext, Ciphertext)
+        self.assertEqual(len(ciphertext), 4)
+        with self.assertRaises(ValueError):
+            universal_hashing(1, 3)
+
+    def test_plain_legacy_tuple(self):
+        n = 5
+        T = 25
+        t = 15
+        weights = [3,7,9,10,12]
+        p_lambda = 256
+
+        p_0, q, small_g, small_s, pk = keygen(p_lambda)
+        _, shares, q, p_i, _ = weighted_setup(p_lambda, n, T, t, weights, small_s, q)
+
+        # A v1 ciphertext stored as a plain tuple, without its version
+        shareholders = {0,3,4}
+        ciphertext = tuple(encrypt(420420, pk, small_g, p_0, q, LEGACY_VERSION)[0])
+        c2, seed, c1, h_k = ciphertext
+        partial_decryptions = {i: partial_decrypt(i, shares[i], c1, p_0, shareholders, p_i, q) for i in shareholders}
+        k_constructed = reconstruct(partial_decryptions, c1, h_k, p_0, shareholders, p_i, q)
+        self.assertEqual(ciphertext_version(k_constructed, h_k), LEGACY_VERSION)
+        self.assertEqual(decrypt(c2, k_constructed, seed, ciphertext_version(k_constructed, h_k)), 420420)
+        # The reconstruction carries the version, a plain decrypt call needs nothing else
+        self.assertEqual(k_constructed.version, LEGACY_VERSION)
+        self.assertEqual(decrypt(c2, k_constructed, seed), 420420)
+        self.assertEqual(decrypt(c2, int(k_constructed), seed, h_k=h_k), 420420)
+        self.assertEqual(pickle.loads(pickle.dumps(k_constructed)).version, LEGACY_VERSION)
+        # A conflicting version is an error instead of a wrong plaintext
+        with self.assertRaises(ValueError):
+            decrypt(c2, k_constructed, seed, CIPHERTEXT_VERSION)
+        with self.assertRaises(ValueError):
+            decrypt(c2, int(k_constructed), seed, CIPHERTEXT_VERSION, h_k)
+
+        session = DecryptionSession(shareholders, p_i, q, p_0)
+        hints = {i: session.overflow_hint(i, shares[i]) for i in shareholders}
+        self.assertEqual(session.reconstruct(partial_decryptions, c1, h_k, hints), k_constructed)
+        self.assertEqual(session.version, LEGACY_VERSION)
+        partial_vectors = {i: [partial_decryptions[i]] for i in shareholders}
+        reconstructions = session.reconstruct_batch(partial_vectors, [ciphertext], hints)
+        self.assertEqual(decrypt_batch([ciphertext], reconstructions), [420420])
+
+        with self.assertRaises(ValueError):
+            ciphertext_version(k_constructed, h_k + 1)
+
+if __name__ == "__main__":
+    unittest.main()
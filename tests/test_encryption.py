@@ -1,5 +1,5 @@
 import unittest
-from crt_secret_sharing.el_gamal_encryption import keygen, encrypt, partial_decrypt, decrypt, reconstruct
+from crt_secret_sharing.el_gamal_encryption import keygen, encrypt, partial_decrypt, decrypt, reconstruct, PublicKey, encrypt_batch, DecryptionSession, decrypt_batch, encrypt_offline
 from crt_secret_sharing.weighted_crt_ss import weighted_setup
 
 class TestWithEncryption(unittest.TestCase):
@@ -77,5 +77,150 @@ class TestWithEncryption(unittest.TestCase):
         with self.assertRaises(ValueError):
             reconstruct(partial_decryptions, c1, h_k, p_0, shareholders, p_i, q)
 
+    def test_public_key_tables(self):
+        n = 5
+        T = 25
+        t = 15
+        weights = [3,7,9,10,12]
+        p_lambda = 256
+
+        p_0, q, small_g, small_s, pk = keygen(p_lambda)
+        public_key = PublicKey(pk, small_g, p_0, q)
+
+        _, shares, q, p_i, _ = weighted_setup(p_lambda, n, T, t, weights, small_s, q)
+
+        shareholders = {0,3,4}
+        for plaintext in (420420, 1337):
+            ciphertext, r = encrypt(plaintext, public_key, small_g, p_0, q)
+            c2, seed, c1, h_k = ciphertext
+            self.assertEqual(c1, pow(small_g, r, p_0))
+
+            partial_decryptions = {}
+            for i in shareholders:
+                partial_decryptions[i] = partial_decrypt(i, shares[i], c1, p_0, shareholders, p_i, q)
+
+            k_constructed = reconstruct(partial_decryptions, c1, h_k, p_0, shareholders, p_i, q)
+            self.assertEqual(decrypt(c2, k_constructed, seed), plaintext)
+        self.assertGreater(public_key.size(), 0)
+
+        # The group given along with a PublicKey has to be the key's
+        for group in ((small_g, p_0, q + 2), (small_g + 1, p_0, q), (small_g, p_0 + 2, q)):
+            with self.assertRaises(ValueError):
+                encrypt(420420, public_key, *group)
+            with self.assertRaises(ValueError):
+                encrypt_offline(public_key, *group)
+            with self.assertRaises(ValueError):
+                list(encrypt_batch([420420], public_key, *group, workers=2))
+
+    def test_encrypt_batch(self):
+        n = 5
+        T = 25
+        t = 15
+        weights = [3,7,9,10,12]
+        p_lambda = 256
+
+        p_0, q, small_g, small_s, pk = keygen(p_lambda)
+        _, shares, q, p_i, _ = weighted_setup(p_lambda, n, T, t, weights, small_s, q)
+
+        shareholders = {0,3,4}
+        plaintexts = list(range(420400, 420430))
+        for key, workers in ((pk, 1), (pk, 2), (PublicKey(pk, small_g, p_0, q), 2)):
+            results = list(encrypt_batch(iter(plaintexts), key, small_g, p_0, q, workers, chunksize=4))
+            self.assertEqual(len(results), len(plaintexts))
+            for plaintext, (ciphertext, r) in zip(plaintexts, results):
+                c2, seed, c1, h_k = ciphertext
+                self.assertEqual(c1, pow(small_g, r, p_0))
+                partial_decryptions = {}
+                for i in shareholders:
+                    partial_decryptions[i] = partial_decrypt(i, shares[i], c1, p_0, shareholders, p_i, q)
+                k_constructed = reconstruct(partial_decryptions, c1, h_k, p_0, shareholders, p_i, q)
+                self.assertEqual(decrypt(c2, k_constructed, seed), plaintext)
+
+    def test_decryption_session(self):
+        n = 5
+        T = 25
+        t = 15
+        weights = [3,7,9,10,12]
+        p_lambda = 256
+
+        p_0, q, small_g, small_s, pk = keygen(p_lambda)
+        _, shares, q, p_i, _ = weighted_setup(p_lambda, n, T, t, weights, small_s, q)
+
+        shareholders = {0,3,4}
+        session = DecryptionSession(shareholders, p_i, q, p_0)
+        for plaintext in (420420, 1337):
+            ciphertext, _ = encrypt(plaintext, pk, small_g, p_0, q)
+            c2, seed, c1, h_k = ciphertext
+
+            partial_decryptions = {}
+            for i in shareholders:
+                partial_decryptions[i] = session.partial_decrypt(i, shares[i], c1)
+                self.assertEqual(partial_decryptions[i], partial_decrypt(i, shares[i], c1, p_0, shareholders, p_i, q))
+
+            k_constructed = session.reconstruct(partial_decryptions, c1, h_k)
+            self.assertEqual(k_constructed, reconstruct(partial_decryptions, c1, h_k, p_0, shareholders, p_i, q))
+            self.assertEqual(decrypt(c2, k_constructed, seed), plaintext)
+
+        with self.assertRaises(ValueError):
+            session.partial_decrypt(1, shares[1], c1)
+        session = DecryptionSession({0,3}, p_i, q, p_0)
+        partial_decryptions = {i: session.partial_decrypt(i, shares[i], c1) for i in (0,3)}
+        with self.assertRaises(ValueError):
+            session.reconstruct(partial_decryptions, c1, h_k)
+
+    def test_overflow_hints(self):
+        n = 12
+        T = 60
+        t = 30
+        weights = [11 + i for i in range(n)]
+        p_lambda = 256
+
+        p_0, q, small_g, small_s, pk = keygen(p_lambda)
+        _, shares, q, p_i, _ = weighted_setup(p_lambda, n, T, t, weights, small_s, q)
+
+        for shareholders in ({0, 1, 2, 3, 4}, set(range(n))):
+            session = DecryptionSession(shareholders, p_i, q, p_0)
+            hints = {i: session.overflow_hint(i, shares[i]) for i in shareholders}
+            # The overflow from the exact sum lies in the candidates of the hints
+            total = sum((shares[i] * session.coeffs[i]) % session.P_S for i in shareholders)
+            self.assertIn(total // session.P_S, session.overflow(hints))
+
+            ciphertext, _ = encrypt(420420, pk, small_g, p_0, q)
+            c2, seed, c1, h_k = ciphertext
+            partial_decryptions = {i: session.partial_decrypt(i, shares[i], c1) for i in shareholders}
+            k_constructed = session.reconstruct(partial_decryptions, c1, h_k, hints)
+            self.assertLessEqual(session.checks, 2)
+            self.assertEqual(k_constructed, session.reconstruct(partial_decryptions, c1, h_k))
+            self.assertEqual(decrypt(c2, k_constructed, seed), 420420)
+
+    def test_decrypt_batch(self):
+        n = 5
+        T = 25
+        t = 15
+        weights = [3,7,9,10,12]
+        p_lambda = 256
+
+        p_0, q, small_g, small_s, pk = keygen(p_lambda)
+        _, shares, q, p_i, _ = weighted_setup(p_lambda, n, T, t, weights, small_s, q)
+
+        shareholders = {0,3,4}
+        session = DecryptionSession(shareholders, p_i, q, p_0)
+        plaintexts = list(range(420400, 420420))
+        ciphertexts = [encrypt(m, pk, small_g, p_0, q)[0] for m in plaintexts]
+        c1s = [ciphertext[2] for ciphertext in ciphertexts]
+        partial_decryptions = {i: session.partial_decrypt_batch(i, shares[i], c1s) for i in shareholders}
+        self.assertEqual(partial_decryptions[0][5], session.partial_decrypt(0, shares[0], c1s[5]))
+
+        hints = {i: session.overflow_hint(i, shares[i]) for i in shareholders}
+        for batch_hints in (None, hints):
+            reconstructions = session.reconstruct_batch(partial_decryptions, ciphertexts, batch_hints)
+            self.assertEqual(decrypt_batch(ciphertexts, reconstructions), plaintexts)
+            # Only the first ciphertext can take more than one check
+            self.assertLessEqual(session.checks, len(ciphertexts) + len(shareholders))
+
+        partial_decryptions[3] = partial_decryptions[3][:-1]
+        with self.assertRaises(ValueError):
+            session.reconstruct_batch(partial_decryptions, ciphertexts, hints)
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,57 @@
+import unittest
+from time import time, sleep
+from crt_secret_sharing.el_gamal_encryption import keygen, encrypt_offline, encrypt_online, partial_decrypt, decrypt, reconstruct
+from crt_secret_sharing.encryption_pool import EncryptionPool
+from crt_secret_sharing.weighted_crt_ss import weighted_setup
+
+class TestWithEncryptionPool(unittest.TestCase):
+
+    def setUp(self):
+        self.p_0, self.q, self.small_g, self.small_s, self.pk = keygen(256)
+
+    def test_single_use(self):
+        pre = encrypt_offline(self.pk, self.small_g, self.p_0, self.q)
+        encrypt_online(420420, pre)
+        with self.assertRaises(ValueError):
+            encrypt_online(420420, pre)
+
+    def test_background_refill(self):
+        pool = EncryptionPool(self.pk, self.small_g, self.p_0, self.q, size=8, low_water=2)
+        with pool:
+            deadline = time() + 30
+            while time() < deadline and len(pool) < 8:
+                sleep(0.01)
+            self.assertEqual(len(pool), 8)
+            seen = {pool.encrypt(1)[1] for _ in range(6)}
+            self.assertEqual(len(seen), 6)
+            self.assertEqual(pool.hits, 6)
+            # Below the low-water mark the worker fills up to the size again
+            deadline = time() + 30
+            while time() < deadline and len(pool) < 8:
+                sleep(0.01)
+            self.assertEqual(len(pool), 8)
+
+    def test_decrypt_from_pool(self):
+        n = 5
+        T = 25
+        t = 15
+        weights = [3,7,9,10,12]
+
+        _, shares, q, p_i, _ = weighted_setup(256, n, T, t, weights, self.small_s, self.q)
+        pool = EncryptionPool(self.pk, self.small_g, self.p_0, q, size=4)
+        pool.fill(2)
+
+        shareholders = {0,3,4}
+        for _ in range(3):
+            ciphertext, _ = pool.encrypt(420420)
+            c2, seed, c1, h_k = ciphertext
+            partial_decryptions = {}
+            for i in shareholders:
+                partial_decryptions[i] = partial_decrypt(i, shares[i], c1, self.p_0, shareholders, p_i, q)
+            k_constructed = reconstruct(partial_decryptions, c1, h_k, self.p_0, shareholders, p_i, q)
+            self.assertEqual(decrypt(c2, k_constructed, seed), 420420)
+        # The third encryption ran with an empty pool
+        self.assertEqual((pool.hits, pool.misses), (2, 1))
+
+if __name__ == "__main__":
+    unittest.main()
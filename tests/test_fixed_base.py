@@ -0,0 +1,41 @@
+import unittest
+import secrets
+from crt_secret_sharing.fixed_base import FixedBaseTable, window_for_budget, table_size
+
+class TestWithFixedBaseTable(unittest.TestCase):
+
+    def test_matches_pow(self):
+        # Safe prime 2q + 1 with q = 1019
+        p_0, q = 2039, 1019
+        table = FixedBaseTable(4, p_0, q.bit_length())
+        for r in range(q):
+            self.assertEqual(table.pow(r), pow(4, r, p_0))
+
+    def test_large_modulus(self):
+        p_0 = (1 << 521) - 1
+        table = FixedBaseTable(3, p_0, 520, budget=256 * 1024)
+        self.assertIsNotNone(table.window)
+        self.assertLessEqual(table.size(), 256 * 1024)
+        for _ in range(50):
+            r = secrets.randbits(520)
+            self.assertEqual(table.pow(r), pow(3, r, p_0))
+
+    def test_fallback(self):
+        p_0 = (1 << 127) - 1
+        table = FixedBaseTable(5, p_0, 64, budget=0)
+        self.assertIsNone(table.window)
+        self.assertEqual(table.size(), 0)
+        r = secrets.randbits(64)
+        self.assertEqual(table.pow(r), pow(5, r, p_0))
+        # Exponents wider than the table
+        table = FixedBaseTable(5, p_0, 64)
+        self.assertEqual(table.pow(1 << 100), pow(5, 1 << 100, p_0))
+
+    def test_window_for_budget(self):
+        p_0 = (1 << 127) - 1
+        window = window_for_budget(p_0, 128, 1 << 16)
+        self.assertLessEqual(table_size(p_0, 128, window), 1 << 16)
+        self.assertGreater(table_size(p_0, 128, window + 1), 1 << 16)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,40 @@
+import os
+import unittest
+import tempfile
+from crt_secret_sharing.el_gamal_encryption import keygen, sample_group
+from crt_secret_sharing.groups import Group, get_group, register_group, list_groups
+
+class TestWithGroupRegistry(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "groups.json")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_builtin_group(self):
+        p_0, q, small_g, s, pk = keygen("modp2048")
+        self.assertEqual(p_0.bit_length(), 2048)
+        self.assertEqual(p_0, 2 * q + 1)
+        self.assertEqual(pk, pow(small_g, s, p_0))
+        self.assertEqual(pow(pk, q, p_0), 1)
+
+    def test_user_group(self):
+        p_0, q, small_g = sample_group(128)
+        register_group("test128", p_0, small_g, self.path)
+        self.assertIn("test128", list_groups(self.path))
+        group = get_group("test128", self.path)
+        self.assertEqual(group, Group("test128", p_0, q, small_g))
+        p_0_key, q_key, _, s, pk = keygen(group)
+        self.assertEqual((p_0_key, q_key), (p_0, q))
+        self.assertEqual(pk, pow(small_g, s, p_0))
+
+    def test_invalid_group(self):
+        with self.assertRaises(ValueError):
+            register_group("broken", 2 * 1009 + 1, 2, self.path)
+        with self.assertRaises(ValueError):
+            get_group("missing", self.path)
+
+if __name__ == "__main__":
+    unittest.main()
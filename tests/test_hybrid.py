@@ -0,0 +1,69 @@
+import io
+import os
+import unittest
+from crt_secret_sharing.el_gamal_encryption import keygen, DecryptionSession
+from crt_secret_sharing.weighted_crt_ss import weighted_setup
+from crt_secret_sharing.hybrid import (encrypt_stream, decrypt_stream, read_header,
+                                       CIPHER_AES_GCM, CIPHER_CHACHA20_POLY1305, TAG_SIZE)
+
+class TestWithHybridEncryption(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        p_lambda = 256
+        cls.p_0, cls.q, cls.small_g, small_s, cls.pk = keygen(p_lambda)
+        _, cls.shares, cls.q, cls.p_i, _ = weighted_setup(p_lambda, 5, 25, 15, [3,7,9,10,12], small_s, cls.q)
+
+    def encrypt(self, payload, **kwargs):
+        sink = io.BytesIO()
+        encrypt_stream(io.BytesIO(payload), sink, self.pk, self.small_g, self.p_0, self.q, **kwargs)
+        return sink.getvalue()
+
+    def decrypt(self, data):
+        source = io.BytesIO(data)
+        header = read_header(source)
+
+        # Threshold decryption of the encapsulated key only
+        shareholders = {0,3,4}
+        session = DecryptionSession(shareholders, self.p_i, self.q, self.p_0)
+        partial_decryptions = {i: session.partial_decrypt(i, self.shares[i], header.c1) for i in shareholders}
+        reconstruction = session.reconstruct(partial_decryptions, header.c1, header.h_k, version=header.version)
+
+        sink = io.BytesIO()
+        length = decrypt_stream(source, sink, header, reconstruction)
+        self.assertEqual(length, len(sink.getvalue()))
+        return sink.getvalue()
+
+    def test_roundtrip(self):
+        payload = os.urandom(10000)
+        for cipher in (CIPHER_AES_GCM, CIPHER_CHACHA20_POLY1305):
+            data = self.encrypt(payload, cipher=cipher, chunksize=1000)
+            # Ten full chunks and an empty last one
+            self.assertEqual(self.decrypt(data), payload)
+            self.assertEqual(self.decrypt(self.encrypt(payload[:-1], cipher=cipher, chunksize=1000)), payload[:-1])
+        self.assertEqual(self.decrypt(self.encrypt(b"")), b"")
+
+    def test_tampering(self):
+        data = bytearray(self.encrypt(os.urandom(3000), chunksize=1000))
+        header_size = len(data) - 3000 - 4 * TAG_SIZE
+
+        forged = bytearray(data)
+        forged[header_size + 1500] ^= 1
+        with self.assertRaises(ValueError):
+            self.decrypt(bytes(forged))
+
+        # Dropping the last chunk or cutting into a chunk is detected
+        with self.assertRaises(ValueError):
+            self.decrypt(bytes(data[:-TAG_SIZE]))
+        with self.assertRaises(ValueError):
+            self.decrypt(bytes(data[:-100]))
+
+        # Swapping two chunks is detected
+        chunk = 1000 + TAG_SIZE
+        swapped = data[:header_size] + data[header_size + chunk:header_size + 2 * chunk] \
+            + data[header_size:header_size + chunk] + data[header_size + 2 * chunk:]
+        with self.assertRaises(ValueError):
+            self.decrypt(bytes(swapped))
+
+if __name__ == "__main__":
+    unittest.main()
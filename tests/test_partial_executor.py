@@ -0,0 +1,40 @@
+import unittest
+from crt_secret_sharing.el_gamal_encryption import keygen, encrypt, decrypt, DecryptionSession
+from crt_secret_sharing.partial_executor import PartialDecryptionExecutor
+from crt_secret_sharing.weighted_crt_ss import weighted_setup
+
+class TestWithPartialExecutor(unittest.TestCase):
+
+    def setUp(self):
+        self.p_0, self.q, self.small_g, self.small_s, self.pk = keygen(256)
+        weights = [3,7,9,10,12]
+        _, self.shares, self.q, self.p_i, _ = weighted_setup(256, 5, 25, 15, weights, self.small_s, self.q)
+        self.shareholders = {0,2,3,4}
+
+    def check(self, workers):
+        shares = {i: self.shares[i] for i in self.shareholders}
+        session = DecryptionSession(self.shareholders, self.p_i, self.q, self.p_0)
+        with PartialDecryptionExecutor(shares, self.p_i, self.q, self.p_0, workers=workers) as executor:
+            for m in [420420, 7]:
+                ciphertext, _ = encrypt(m, self.pk, self.small_g, self.p_0, self.q)
+                c2, seed, c1, h_k = ciphertext
+                partial_decryptions = executor.partial_decrypt(c1)
+                self.assertEqual(partial_decryptions, {i: session.partial_decrypt(i, shares[i], c1) for i in shares})
+                reconstruction = executor.reconstruct(c1, h_k, ciphertext.version)
+                self.assertEqual(reconstruction, session.reconstruct(partial_decryptions, c1, h_k))
+                self.assertEqual(decrypt(c2, reconstruction, seed), m)
+                # The hints leave at most two candidates
+                self.assertLessEqual(executor.session.checks, 2)
+
+    def test_inline(self):
+        self.check(1)
+
+    def test_process_pool(self):
+        self.check(3)
+
+    def test_invalid_workers(self):
+        with self.assertRaises(ValueError):
+            PartialDecryptionExecutor({0: self.shares[0]}, self.p_i, self.q, self.p_0, workers=0)
+
+if __name__ == "__main__":
+    unittest.main()
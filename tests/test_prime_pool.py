@@ -0,0 +1,62 @@
+import os
+import unittest
+import tempfile
+from time import time, sleep
+from Crypto.Util.number import getPrime
+from crt_secret_sharing.prime_pool import PrimePool
+from crt_secret_sharing.util_primes import bits_bucket, generate_party_primes
+from crt_secret_sharing.weighted_crt_ss import weighted_setup, weighted_buckets, share_reconstruction
+
+class TestWithPrimePool(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.pool = PrimePool(os.path.join(self.directory.name, "primes.db"))
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_consume_once(self):
+        primes = [getPrime(64) for _ in range(3)]
+        self.assertEqual(self.pool.add(bits_bucket(64), primes), 3)
+        taken = self.pool.take(bits_bucket(64), 5)
+        self.assertEqual(sorted(taken), sorted(primes))
+        self.assertEqual(self.pool.size(bits_bucket(64)), 0)
+        # Consumed primes are never stored again
+        self.assertEqual(self.pool.add(bits_bucket(64), primes), 0)
+
+    def test_party_primes_from_pool(self):
+        self.pool.refill(bits_bucket(128), 2)
+        p_0 = getPrime(128)
+        p_i = generate_party_primes(3, p_0, 128, self.pool)
+        self.assertEqual(len(set(p_i)), 3)
+        self.assertEqual(self.pool.size(bits_bucket(128)), 0)
+
+    def test_weighted_setup_from_pool(self):
+        n = 5
+        T = 25
+        t = 10 
+        weights = [2, 7, 9, 10, 12]
+        p_lambda = 128
+        secret = 420420
+
+        buckets = weighted_buckets(T, t, weights, p_lambda)
+        worker = self.pool.start_refill(buckets, interval=0.05)
+        deadline = time() + 60
+        while time() < deadline and any(self.pool.size(b) < c for b, c in buckets.items()):
+            sleep(0.05)
+        worker.stop()
+        for bucket, count in buckets.items():
+            self.assertEqual(self.pool.size(bucket), count)
+
+        _, shares, p_0, p_i, _ = weighted_setup(p_lambda, n, T, t, weights, secret, None, pool=self.pool)
+        for bucket in buckets:
+            self.assertEqual(self.pool.size(bucket), 0)
+
+        shareholders = {1, 3, 4}
+        shares_subset = [shares[i] for i in shareholders]
+        primes_subset = [p_i[i] for i in shareholders]
+        self.assertEqual(share_reconstruction(p_0, primes_subset, shares_subset), secret)
+
+if __name__ == "__main__":
+    unittest.main()
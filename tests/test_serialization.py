@@ -0,0 +1,73 @@
+import os
+import unittest
+import tempfile
+from crt_secret_sharing.serialization import (SchemeParameters, PublicParameters, Share, SCHEME_WEIGHTED,
+                                              dumps_parameters, loads_parameters, dumps_public, loads_public,
+                                              dumps_share, loads_share, dumps_shares, loads_shares,
+                                              write_shares, read_shares, Writer, Reader)
+from crt_secret_sharing.encoding import encode_int
+from crt_secret_sharing.el_gamal_encryption import keygen
+from crt_secret_sharing.weighted_crt_ss import weighted_setup_batch, share_reconstruction
+
+class TestWithSerialization(unittest.TestCase):
+
+    def test_weighted_roundtrip(self):
+        n = 5
+        T = 25
+        t = 10
+        weights = [2, 7, 9, 10, 12]
+        p_lambda = 128
+        secrets = [420420, 1337, 0]
+
+        columns, p_0, p_i, c = weighted_setup_batch(p_lambda, n, T, t, weights, secrets, None)
+        params = SchemeParameters(SCHEME_WEIGHTED, p_lambda, p_0, p_i, t, T, weights, c)
+        self.assertEqual(loads_parameters(dumps_parameters(params)), params)
+
+        share = Share(3, p_i[3], columns[3][0])
+        self.assertEqual(loads_share(memoryview(dumps_share(share))), share)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "shares.bin")
+            write_shares(path, columns, p_i)
+            loaded_columns, loaded_p_i = read_shares(path)
+        self.assertEqual((loaded_columns, loaded_p_i), (columns, p_i))
+
+        shareholders = [1, 3, 4]
+        for k, secret in enumerate(secrets):
+            shares_subset = [loaded_columns[i][k] for i in shareholders]
+            primes_subset = [loaded_p_i[i] for i in shareholders]
+            self.assertEqual(share_reconstruction(p_0, primes_subset, shares_subset), secret)
+
+    def test_public_parameters(self):
+        p_0, q, small_g, _, pk = keygen("modp2048")
+        params = PublicParameters(p_0, q, small_g, pk)
+        data = dumps_public(params)
+        self.assertLess(len(data), 4 * 260)
+        self.assertEqual(loads_public(data), params)
+
+    def test_invalid_records(self):
+        data = dumps_shares([[1, 2]], [7])
+        with self.assertRaises(ValueError):
+            loads_parameters(data)
+        with self.assertRaises(ValueError):
+            loads_shares(data[:-1])
+        with self.assertRaises(ValueError):
+            loads_shares(b"JSON" + data[4:])
+        with self.assertRaises(ValueError):
+            dumps_shares([[1], [2]], [7])
+
+    def test_canonical_integers(self):
+        # Integers use the encoding of encode_int, zero is a single byte
+        writer = Writer()
+        writer.int(0)
+        writer.ints([0, 258])
+        self.assertEqual(bytes(writer.buffer), b"\x00\x00\x00\x01" + encode_int(0) + b"\x00\x00\x00\x02"
+                         + b"\x00\x00\x00\x01" + encode_int(0) + b"\x00\x00\x00\x02" + encode_int(258))
+        reader = Reader(writer.buffer)
+        self.assertEqual((reader.int(), reader.ints()), (0, [0, 258]))
+        reader.end()
+        with self.assertRaises(ValueError):
+            writer.int(-1)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,42 @@
+import os
+import unittest
+import tempfile
+from crt_secret_sharing.share_store import ShareStore, share_to_store
+from crt_secret_sharing.crt_ss import share_distribution_batch
+
+class TestWithShareStore(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "shares.store")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_reconstruct_from_store(self):
+        secrets = [420420 + k for k in range(100)]
+        with share_to_store(self.path, 128, 5, 3, secrets, None, None, None, False, chunksize=32) as store:
+            p_i = store.p_i
+
+        with ShareStore.open(self.path) as store:
+            self.assertEqual(len(store), len(secrets))
+            self.assertEqual(store.p_i, p_i)
+            for secret_id in (0, 31, 32, 99):
+                self.assertEqual(store.reconstruct(secret_id, [0, 2, 4]), secrets[secret_id])
+                self.assertEqual(store.reconstruct(secret_id, [1, 3, 4]), secrets[secret_id])
+            with self.assertRaises(IndexError):
+                store.share(100, 0)
+
+    def test_write_shares(self):
+        secrets = [1, 2, 3]
+        columns, p_0, p_i = share_distribution_batch(128, 4, 2, secrets, None, None, None, False)
+        with ShareStore.create(self.path, p_0, p_i, len(secrets)) as store:
+            for secret_id in range(len(secrets)):
+                store.write(secret_id, [column[secret_id] for column in columns])
+        with ShareStore.open(self.path) as store:
+            for secret_id, secret in enumerate(secrets):
+                self.assertEqual([store.share(secret_id, i) for i in range(4)], [column[secret_id] for column in columns])
+                self.assertEqual(store.reconstruct(secret_id, [3, 1]), secret)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,46 @@
+import io
+import os
+import unittest
+from crt_secret_sharing.streaming import share_stream, reconstruct_stream, element_size
+
+class TestWithStreaming(unittest.TestCase):
+
+    def share(self, payload, n=5, t=3, weighted=False, chunksize=16):
+        sinks = [io.BytesIO() for _ in range(n)]
+        p_0, p_i = share_stream(io.BytesIO(payload), sinks, 128, n, t, None, None, None, weighted, chunksize)
+        return [io.BytesIO(sink.getvalue()) for sink in sinks], p_0
+
+    def reconstruct(self, sources, chunksize=16):
+        sink = io.BytesIO()
+        length = reconstruct_stream(sources, sink, chunksize=chunksize)
+        self.assertEqual(length, len(sink.getvalue()))
+        return sink.getvalue()
+
+    def test_roundtrip(self):
+        payload = os.urandom(5000)
+        streams, p_0 = self.share(payload)
+        self.assertEqual(self.reconstruct([streams[0], streams[2], streams[4]]), payload)
+
+        # Chunk sizes of sharing and reconstruction are independent
+        streams, p_0 = self.share(payload, chunksize=7)
+        self.assertEqual(self.reconstruct(streams[1:4], chunksize=5), payload)
+
+    def test_padding(self):
+        streams, p_0 = self.share(b"")
+        self.assertEqual(self.reconstruct(streams[:3]), b"")
+
+        size = element_size(p_0)
+        for payload in (b"\x00" * size, b"\x80" * (size - 1), b"\x00" * (16 * size)):
+            streams, _ = self.share(payload, chunksize=16)
+            self.assertEqual(self.reconstruct(streams[2:]), payload)
+
+    def test_truncated(self):
+        streams, _ = self.share(os.urandom(1000))
+        truncated = io.BytesIO(streams[0].getvalue()[:-1])
+        with self.assertRaises(ValueError):
+            self.reconstruct([truncated, streams[1], streams[2]])
+        with self.assertRaises(ValueError):
+            self.reconstruct([io.BytesIO(b""), streams[1], streams[2]])
+
+if __name__ == "__main__":
+    unittest.main()
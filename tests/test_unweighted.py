@@ -1,5 +1,6 @@
 import unittest
-from crt_secret_sharing.crt_ss import share_distribution, share_reconstruction
+from crt_secret_sharing.crt_ss import share_distribution, share_distribution_batch, share_reconstruction, ShareAccumulator
+from crt_secret_sharing.util_crt import PlanCache
 
 class TestWithUnweightedSecretSharing(unittest.TestCase):
 
@@ -19,6 +20,27 @@ class TestWithUnweightedSecretSharing(unittest.TestCase):
         secret = share_reconstruction(p_0, primes_subset, shares_subset)
         self.assertIsNot(secret, 420420)
 
+    def test_plain_log_records(self):
+        with self.assertLogs("crt_secret_sharing", level="INFO") as logs:
+            _, shares, p_0, p_i = share_distribution(128, 3, 2, 420420, None, None, None, False)
+            share_reconstruction(p_0, p_i[:2], shares[:2])
+        self.assertTrue(logs.output)
+        self.assertFalse(any("\033[" in line for line in logs.output))
+
+    def test_accumulator(self):
+        _, shares, p_0, p_i = share_distribution(128, 5, 3, 420420, None, None, None, False)
+        accumulator = ShareAccumulator(p_0, 3)
+        for k, i in enumerate([4, 1, 2]):
+            self.assertFalse(accumulator.ready)
+            with self.assertRaises(ValueError):
+                accumulator.finalize()
+            self.assertEqual(accumulator.add(p_i[i], shares[i]), k == 2)
+        self.assertEqual(accumulator.weight, 3)
+        self.assertEqual(accumulator.finalize(), 420420)
+        self.assertEqual(accumulator.finalize(), share_reconstruction(p_0, [p_i[4], p_i[1], p_i[2]], [shares[4], shares[1], shares[2]]))
+        with self.assertRaises(ValueError):
+            accumulator.add(p_i[1], shares[1])
+
     def test_l_validation_failed(self):
         with self.assertRaises(ValueError):
             _, shares, p_0, p_i = share_distribution(16, 3, 2, 420420, 3, [43451, 43607, 59513], 
@@ -40,5 +62,36 @@ class TestWithUnweightedSecretSharing(unittest.TestCase):
         with self.assertRaises(ValueError):
             _, shares, p_0, p_i = share_distribution(256, 3, 2, 420420, None, [5501, 5167, 5197, 5009], None, False)
 
+    def test_plan_cache_hits(self):
+        _, shares, p_0, p_i = share_distribution(128, 3, 2, 420420, None, None, None, False)
+        cache = PlanCache(maxsize=2)
+        for _ in range(3):
+            secret = share_reconstruction(p_0, p_i[:2], shares[:2], cache)
+            self.assertEqual(secret, 420420)
+        # Same subset in another order uses the same plan
+        secret = share_reconstruction(p_0, p_i[1::-1], shares[1::-1], cache)
+        self.assertEqual(secret, 420420)
+        self.assertEqual(cache.misses, 1)
+        self.assertEqual(cache.hits, 3)
+
+    def test_plan_cache_eviction(self):
+        _, shares, p_0, p_i = share_distribution(128, 3, 2, 420420, None, None, None, False)
+        cache = PlanCache(maxsize=2)
+        share_reconstruction(p_0, [p_i[0], p_i[1]], [shares[0], shares[1]], cache)
+        share_reconstruction(p_0, [p_i[0], p_i[2]], [shares[0], shares[2]], cache)
+        share_reconstruction(p_0, [p_i[0], p_i[1]], [shares[0], shares[1]], cache)
+        share_reconstruction(p_0, [p_i[1], p_i[2]], [shares[1], shares[2]], cache)
+        self.assertEqual(len(cache), 2)
+        self.assertIn([p_i[0], p_i[1]], cache)
+        self.assertNotIn([p_i[0], p_i[2]], cache)
+
+    def test_batch_success(self):
+        secrets = [420420, 0, 1, 123456789]
+        columns, p_0, p_i = share_distribution_batch(128, 3, 2, secrets, None, None, None, False)
+        self.assertEqual(len(columns), 3)
+        for k, secret in enumerate(secrets):
+            shares_subset = [columns[1][k], columns[2][k]]
+            self.assertEqual(share_reconstruction(p_0, p_i[1:], shares_subset), secret)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,54 @@
+import unittest
+import random
+from math import prod
+from Crypto.Util.number import getPrime
+from crt_secret_sharing.util_crt import (CRT_METHODS, ReconstructionPlan, crt, product_tree, remainder_tree,
+                                         batch_inverse, batch_modinv)
+from crt_secret_sharing.crt_ss import share_distribution, share_reconstruction
+
+class TestWithFastCRT(unittest.TestCase):
+
+    def test_methods_agree(self):
+        moduli = sorted({getPrime(64) for _ in range(37)})
+        x = random.randrange(prod(moduli))
+        residues = [x % m for m in moduli]
+        for method in CRT_METHODS:
+            self.assertEqual(crt(residues, moduli, method), x)
+
+    def test_remainder_tree(self):
+        moduli = [getPrime(64) for _ in range(11)]
+        x = random.getrandbits(2000)
+        self.assertEqual(remainder_tree(x, product_tree(moduli)), [x % m for m in moduli])
+
+    def test_coefficients_agree(self):
+        moduli = sorted({getPrime(64) for _ in range(9)})
+        naive = ReconstructionPlan(moduli, "naive")
+        for method in CRT_METHODS:
+            plan = ReconstructionPlan(moduli, method)
+            for m in moduli:
+                self.assertEqual(plan.coefficient(m), naive.coefficient(m))
+
+    def test_large_reconstruction(self):
+        _, shares, p_0, p_i = share_distribution(128, 40, 2, 420420, None, None, None, False)
+        self.assertEqual(share_reconstruction(p_0, p_i[::-1], shares[::-1]), 420420)
+
+    def test_batch_inversion(self):
+        m = getPrime(128)
+        values = [random.randrange(1, m) for _ in range(50)]
+        self.assertEqual(batch_inverse(values, m), [pow(a, -1, m) for a in values])
+        self.assertEqual(batch_inverse([], m), [])
+        with self.assertRaises(ValueError):
+            batch_inverse([3, 2 * m, 5], m)
+
+        moduli = [getPrime(64) for _ in range(20)]
+        values = [random.getrandbits(200) | 1 for _ in moduli]
+        self.assertEqual(batch_modinv(values, moduli), [pow(a, -1, m) for a, m in zip(values, moduli)])
+        with self.assertRaises(ValueError):
+            batch_modinv([6], [9])
+
+    def test_unknown_method(self):
+        with self.assertRaises(ValueError):
+            ReconstructionPlan([3, 5, 7], "fft")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,35 @@
+import unittest
+import random
+from Crypto.Util.number import isPrime
+from crt_secret_sharing.util_primes import prev_prime, generate_safe_prime, SIEVE_BOUND
+
+def brute_prev_prime(x, lower_bound=2):
+    for candidate in range(x - 1, lower_bound - 1, -1):
+        if isPrime(candidate):
+            return candidate
+    return None
+
+class TestWithPrimeSearch(unittest.TestCase):
+
+    def test_prev_prime_small(self):
+        for x in [3, 4, 10, 100, SIEVE_BOUND, SIEVE_BOUND + 1, SIEVE_BOUND + 100]:
+            self.assertEqual(prev_prime(x), brute_prev_prime(x))
+
+    def test_prev_prime_sieved(self):
+        for _ in range(20):
+            x = random.getrandbits(48)
+            self.assertEqual(prev_prime(x), brute_prev_prime(x))
+
+    def test_prev_prime_lower_bound(self):
+        self.assertIsNone(prev_prime(100, 98))
+        self.assertIsNone(prev_prime(2 ** 61 - 1, 2 ** 61 - 2))
+
+    def test_safe_prime(self):
+        for workers in (1, 2):
+            q, attempts = generate_safe_prime(128, workers)
+            self.assertEqual(q.bit_length(), 128)
+            self.assertTrue(isPrime(q) and isPrime(2 * q + 1))
+            self.assertGreaterEqual(attempts, 1)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,5 @@
 import unittest
-from crt_secret_sharing.weighted_crt_ss import weighted_setup, share_reconstruction
+from crt_secret_sharing.weighted_crt_ss import weighted_setup, weighted_setup_batch, share_reconstruction, ShareAccumulator
 
 class TestWithWeightedSecretSharing(unittest.TestCase):
 
@@ -22,6 +22,24 @@ class TestWithWeightedSecretSharing(unittest.TestCase):
         reconstruct_secret = share_reconstruction(p_0, primes_subset, shares_subset)
         self.assertEqual(reconstruct_secret, secret)
 
+    def test_accumulator_succes(self):
+        n = 5
+        T = 25
+        t = 10
+        weights = [2, 7, 9, 10, 12]
+        p_lambda = 128
+        secret = 420420
+
+        _, shares, p_0, p_i, _ = weighted_setup(p_lambda, n, T, t, weights, secret, None)
+        accumulator = ShareAccumulator(p_0, T)
+        # Shares arrive in any order, the threshold is met after the third
+        for i in [4, 0, 3]:
+            accumulator.add(p_i[i], shares[i], weights[i])
+        self.assertEqual(accumulator.weight, 24)
+        self.assertFalse(accumulator.ready)
+        self.assertTrue(accumulator.add(p_i[1], shares[1], weights[1]))
+        self.assertEqual(accumulator.finalize(), secret)
+
     def test_simple_fail(self):
         n = 5
         T = 25
@@ -82,5 +100,54 @@ class TestWithWeightedSecretSharing(unittest.TestCase):
         reconstruct_secret = share_reconstruction(p_0, primes_subset, shares_subset)
         self.assertEqual(reconstruct_secret, secret)
 
+    def test_batch_succes(self):
+        n = 5
+        T = 25
+        t = 10 
+        weights = [2, 7, 9, 10, 12]
+        p_lambda = 128
+        secrets = [420420, 1, 2, 3]
+
+        columns, p_0, p_i, _ = weighted_setup_batch(p_lambda, n, T, t, weights, secrets, None)
+        shareholders = {1, 3, 4}
+        primes_subset = [p_i[i] for i in shareholders]
+        for k, secret in enumerate(secrets):
+            shares_subset = [columns[i][k] for i in shareholders]
+            reconstruct_secret = share_reconstruction(p_0, primes_subset, shares_subset)
+            self.assertEqual(reconstruct_secret, secret)
+
+    def test_tree_reduction_succes(self):
+        n = 5
+        T = 25
+        t = 10 
+        weights = [2, 7, 9, 10, 12]
+        p_lambda = 128
+        secret = 420420
+
+        _, shares, p_0, p_i, _ = weighted_setup(p_lambda, n, T, t, weights, secret, None, "tree")
+        shareholders = {1, 3, 4}
+        shares_subset = [shares[i] for i in shareholders]
+        primes_subset = [p_i[i] for i in shareholders]
+
+        reconstruct_secret = share_reconstruction(p_0, primes_subset, shares_subset)
+        self.assertEqual(reconstruct_secret, secret)
+
+    def test_process_pool_succes(self):
+        n = 5
+        T = 25
+        t = 10 
+        weights = [10, 10, 10, 10, 12]
+        p_lambda = 128
+        secret = 420420
+
+        _, shares, p_0, p_i, _ = weighted_setup(p_lambda, n, T, t, weights, secret, None, workers=2)
+        self.assertEqual(len(set(p_i)), n)
+        shareholders = {0, 1, 4}
+        shares_subset = [shares[i] for i in shareholders]
+        primes_subset = [p_i[i] for i in shareholders]
+
+        reconstruct_secret = share_reconstruction(p_0, primes_subset, shares_subset)
+        self.assertEqual(reconstruct_secret, secret)
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file